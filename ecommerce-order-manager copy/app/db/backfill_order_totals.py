@@ -0,0 +1,82 @@
+# backfill_order_totals.py
+"""Fill orders.OrderTotal and orders.ItemCount for existing orders.
+
+Run once after migration 0005; the triggers keep both columns current from
+then on. Orders are updated in primary-key chunks, each in its own short
+transaction, so the tables stay usable while it runs. A finished run is
+recorded as migration 0007 (the same backfill in one statement), which
+switches order filters over to the stored totals. An interrupted run can be
+resumed from the last key it printed:
+
+    python -m app.db.backfill_order_totals
+    python -m app.db.backfill_order_totals --chunk-size 5000 --after O000123456
+"""
+import argparse
+import time
+from app.db.connection import get_connection
+from app.db.migrate import CREATE_MIGRATIONS_TABLE
+
+BACKFILL_VERSION = ("0007", "backfill_order_totals")
+
+NEXT_CHUNK_END = """
+    SELECT MAX(OrderID) FROM (
+        SELECT OrderID FROM orders WHERE OrderID > %s ORDER BY OrderID LIMIT %s
+    ) AS chunk
+"""
+
+# Totals of the orders in (after, last] recomputed from their lines
+BACKFILL_CHUNK = """
+    UPDATE orders o
+    LEFT JOIN (
+        SELECT q.OrderID, SUM(q.Quantity * p.Price) AS Total, SUM(q.Quantity) AS Items
+        FROM quantities q
+        JOIN products p ON q.ProductID = p.ProductID
+        WHERE q.OrderID > %s AND q.OrderID <= %s
+        GROUP BY q.OrderID
+    ) t ON t.OrderID = o.OrderID
+    SET o.OrderTotal = COALESCE(t.Total, 0), o.ItemCount = COALESCE(t.Items, 0)
+    WHERE o.OrderID > %s AND o.OrderID <= %s
+"""
+
+
+def backfill(chunk_size=10000, after=""):
+    """Recompute the totals of every order after ``after``; returns the number of orders updated"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    done = 0
+    started = time.perf_counter()
+    try:
+        while True:
+            cursor.execute(NEXT_CHUNK_END, (after, chunk_size))
+            last = cursor.fetchone()[0]
+            if last is None:
+                break
+            cursor.execute(BACKFILL_CHUNK, (after, last, after, last))
+            conn.commit()
+            done += cursor.rowcount
+            after = last
+            print(f"  up to {last}: {done} orders changed ({time.perf_counter() - started:.0f} s)")
+        cursor.execute(CREATE_MIGRATIONS_TABLE)
+        cursor.execute("INSERT IGNORE INTO schema_migrations (Version, Name) VALUES (%s, %s)", BACKFILL_VERSION)
+        conn.commit()
+        return done
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    parser.add_argument("--after", default="", help="resume after this OrderID")
+    args = parser.parse_args()
+
+    done = backfill(args.chunk_size, args.after)
+    print(f"Order totals backfilled: {done} orders changed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# bulk.py
+from app.db.connection import get_connection
+from app.db.events import notify_write
+from mysql.connector import Error
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _existing_keys(cursor, table, key_columns, keys, batch_size):
+    """Return the subset of ``keys`` (tuples) already present in ``table``"""
+    found = set()
+    keys = list(set(keys))
+    if len(key_columns) == 1:
+        template = "%s"
+    else:
+        template = "(" + ", ".join(["%s"] * len(key_columns)) + ")"
+    column_list = key_columns[0] if len(key_columns) == 1 else "(" + ", ".join(key_columns) + ")"
+
+    for chunk in _chunks(keys, batch_size):
+        placeholders = ", ".join([template] * len(chunk))
+        params = [value for key in chunk for value in key]
+        cursor.execute(
+            f"SELECT {', '.join(key_columns)} FROM {table} WHERE {column_list} IN ({placeholders})",
+            params
+        )
+        found.update(tuple(row) for row in cursor.fetchall())
+    return found
+
+
+def bulk_create(table, columns, rows, errors, key_size=1, duplicate_message=None,
+                references=(), batch_size=1000):
+    """Insert already-validated rows into ``table`` in a single transaction.
+
+    ``rows`` is a list of ``(index, values)`` pairs where ``values`` follows
+    ``columns`` and its first ``key_size`` items are the primary key.
+    Keys that already exist and foreign keys listed in ``references`` as
+    ``(position, table, column, message)`` are checked with one query per
+    batch instead of one per row; offending rows are added to ``errors`` as
+    ``(index, message)`` and skipped. The remaining rows are written with
+    multi-row INSERT statements of ``batch_size`` rows.
+
+    Returns ``{'inserted': count, 'errors': [(index, message), ...]}``.
+    If the database rejects the insert, the whole batch is rolled back and
+    the error is reported with index None.
+    """
+    if not rows:
+        return {'inserted': 0, 'errors': sorted(errors, key=lambda e: e[0])}
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        existing = _existing_keys(cursor, table, columns[:key_size],
+                                  [tuple(values[:key_size]) for _, values in rows], batch_size)
+        missing = []
+        for position, ref_table, ref_column, message in references:
+            wanted = [(values[position],) for _, values in rows]
+            present = _existing_keys(cursor, ref_table, [ref_column], wanted, batch_size)
+            missing.append((position, {key[0] for key in present}, message))
+
+        valid = []
+        for index, values in rows:
+            if tuple(values[:key_size]) in existing:
+                errors.append((index, duplicate_message or f"{columns[0]} already exists"))
+                continue
+            problem = next((message for position, present, message in missing
+                            if values[position] not in present), None)
+            if problem:
+                errors.append((index, problem))
+                continue
+            valid.append(tuple(values))
+
+        placeholders = ", ".join(["%s"] * len(columns))
+        query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+        # autocommit is off, so everything up to commit() is one transaction
+        for chunk in _chunks(valid, batch_size):
+            # executemany folds an INSERT ... VALUES into one multi-row statement
+            cursor.executemany(query, chunk)
+        conn.commit()
+        if valid:
+            notify_write(table, "create", [values[0] if key_size == 1 else tuple(values[:key_size])
+                                           for values in valid])
+        return {'inserted': len(valid), 'errors': sorted(errors, key=lambda e: e[0])}
+    except Error as err:
+        conn.rollback()
+        errors.append((None, f"Error: {err.msg}"))
+        return {'inserted': 0, 'errors': errors}
+    finally:
+        cursor.close()
+        conn.close()
@@ -1,22 +1,352 @@
 # connection.py
 import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
 from dotenv import load_dotenv
 import mysql.connector
 from mysql.connector import Error
 
 load_dotenv()
 
-def get_connection():
+
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes free within the checkout timeout"""
+
+
+class PooledConnection:
+    """Connection handed out by the pool; close() returns it to the pool"""
+
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw = raw
+
+    def __getattr__(self, name):
+        raw = self.__dict__.get('_raw')
+        if raw is None:
+            raise Exception("Connection has already been returned to the pool")
+        return getattr(raw, name)
+
+    def close(self):
+        if self._raw is not None:
+            raw, self._raw = self._raw, None
+            self._pool.release(raw)
+
+    def discard(self):
+        """Close the underlying connection instead of returning it to the pool"""
+        if self._raw is not None:
+            raw, self._raw = self._raw, None
+            self._pool.discard(raw)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class ConnectionPool:
+    """Thread-safe pool of MySQL connections.
+
+    Idle connections are reused most-recently-used first, trimmed back to
+    ``min_size`` once they sit unused for ``idle_timeout`` seconds, and
+    pinged before checkout when they have been idle for ``ping_interval``
+    seconds or more.
+    """
+
+    def __init__(self, min_size=1, max_size=10, idle_timeout=300, checkout_timeout=10,
+                 pre_ping=True, ping_interval=5, **connect_args):
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1")
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self.pre_ping = pre_ping
+        self.ping_interval = ping_interval
+        self.connect_args = connect_args
+
+        self._cond = threading.Condition()
+        self._idle = deque()  # (raw connection, last returned at)
+        self._size = 0
+        self._checked_out = 0
+        self._waiters = 0
+        self._created = 0
+        self._discarded = 0
+        self._timeouts = 0
+        self._closed = False
+
+    def _connect(self):
+        try:
+            return mysql.connector.connect(**self.connect_args)
+        except Error as e:
+            raise Exception("Error while connecting:", e)
+
+    def _close_quietly(self, raw):
+        try:
+            raw.close()
+        except Error:
+            pass
+
+    def _prune_idle(self):
+        """Drop connections idle for too long, keeping at least min_size open (lock held)"""
+        now = time.monotonic()
+        expired = []
+        # Oldest connections sit at the left end of the deque
+        while self._idle and self._size > self.min_size and now - self._idle[0][1] > self.idle_timeout:
+            raw, _ = self._idle.popleft()
+            self._size -= 1
+            self._discarded += 1
+            expired.append(raw)
+        return expired
+
+    def _healthy(self, raw, idle_since):
+        if not self.pre_ping or time.monotonic() - idle_since < self.ping_interval:
+            return True
+        try:
+            raw.ping(reconnect=False)
+            return True
+        except Error:
+            return False
+
+    def acquire(self, timeout=None):
+        """Check out a connection, waiting up to ``timeout`` seconds for a free slot"""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise Exception("Connection pool is closed")
+                expired = self._prune_idle()
+                raw = idle_since = None
+                create = False
+                if self._idle:
+                    raw, idle_since = self._idle.pop()
+                    self._checked_out += 1
+                elif self._size < self.max_size:
+                    self._size += 1
+                    self._checked_out += 1
+                    create = True
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeoutError(
+                            f"No database connection available within {timeout}s "
+                            f"(pool size {self.max_size})")
+                    self._waiters += 1
+                    try:
+                        self._cond.wait(remaining)
+                    finally:
+                        self._waiters -= 1
+
+            for old in expired:
+                self._close_quietly(old)
+
+            if create:
+                try:
+                    raw = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._checked_out -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._created += 1
+                return PooledConnection(self, raw)
+
+            if raw is not None:
+                if self._healthy(raw, idle_since):
+                    return PooledConnection(self, raw)
+                # Stale connection: throw it away and try again
+                with self._cond:
+                    self._checked_out -= 1
+                    self._size -= 1
+                    self._discarded += 1
+                    self._cond.notify()
+                self._close_quietly(raw)
+
+    def release(self, raw):
+        """Return a checked-out connection to the pool"""
+        try:
+            if raw.unread_result:
+                # A half-read result set cannot be reused safely
+                self.discard(raw)
+                return
+            if raw.in_transaction:
+                raw.rollback()
+        except Error:
+            self.discard(raw)
+            return
+
+        with self._cond:
+            self._checked_out -= 1
+            if self._closed:
+                self._size -= 1
+                self._discarded += 1
+            else:
+                self._idle.append((raw, time.monotonic()))
+                raw = None
+            self._cond.notify()
+        if raw is not None:
+            self._close_quietly(raw)
+
+    def discard(self, raw):
+        """Close a checked-out connection and free its slot"""
+        with self._cond:
+            self._checked_out -= 1
+            self._size -= 1
+            self._discarded += 1
+            self._cond.notify()
+        self._close_quietly(raw)
+
+    def fill(self, on_connect=None):
+        """Open connections until the pool holds at least min_size.
+
+        ``on_connect(opened, target)`` is called after each new connection.
+        """
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                raw = self._connect()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._created += 1
+                self._idle.append((raw, time.monotonic()))
+                opened = self._size
+                self._cond.notify()
+            if on_connect:
+                on_connect(opened, self.min_size)
+
+    def close(self):
+        """Close idle connections; checked-out ones are closed when released"""
+        with self._cond:
+            self._closed = True
+            idle = [raw for raw, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._discarded += len(idle)
+            self._cond.notify_all()
+        for raw in idle:
+            self._close_quietly(raw)
+
+    def stats(self):
+        with self._cond:
+            return {
+                'size': self._size,
+                'idle': len(self._idle),
+                'checked_out': self._checked_out,
+                'waiters': self._waiters,
+                'created': self._created,
+                'discarded': self._discarded,
+                'timeouts': self._timeouts,
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the process-wide pool, creating it from the environment on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(
+                min_size=int(os.getenv("DB_POOL_MIN_SIZE", 1)),
+                max_size=int(os.getenv("DB_POOL_MAX_SIZE", 10)),
+                idle_timeout=float(os.getenv("DB_POOL_IDLE_TIMEOUT", 300)),
+                checkout_timeout=float(os.getenv("DB_POOL_TIMEOUT", 10)),
+                pre_ping=os.getenv("DB_POOL_PRE_PING", "1") not in ("0", "false", "False"),
+                host=os.getenv("DB_HOST"),
+                user=os.getenv("DB_USER"),
+                password=os.getenv("DB_PASS"),
+                database=os.getenv("DB_NAME")
+            )
+        return _pool
+
+
+def get_connection(timeout=None):
+    """Check out a pooled connection; call close() (or use ``with``) to return it"""
+    return get_pool().acquire(timeout)
+
+
+@contextmanager
+def connection(timeout=None):
+    """Context manager yielding a pooled connection"""
+    conn = get_connection(timeout)
     try:
-        conn = mysql.connector.connect(
-            host=os.getenv("DB_HOST"),
-            user=os.getenv("DB_USER"),
-            password=os.getenv("DB_PASS"),
-            database=os.getenv("DB_NAME")
-        )
-        return conn
-    except Error as e:
-        raise Exception("Error while connecting:", e)
-        # return None
-
-get_connection()
\ No newline at end of file
+        yield conn
+    finally:
+        conn.close()
+
+
+def get_pool_stats():
+    """Pool counters for monitoring (checked out, waiters, connections created, ...)"""
+    return get_pool().stats()
+
+
+def close_pool():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
+
+
+def init_database(progress=None):
+    """Create and warm up the pool, then verify the database answers.
+
+    Nothing connects at import time; call this (usually via
+    init_database_async) before the first query to move the handshake cost
+    off the critical path. ``progress(fraction, message)`` receives real
+    progress as each step completes.
+    """
+    def report(fraction, message):
+        if progress:
+            progress(fraction, message)
+
+    report(0.0, "Connecting to database...")
+    pool = get_pool()
+    pool.fill(lambda opened, target: report(0.8 * opened / (target + 1),
+                                            f"Opened connection {opened} of {target}"))
+
+    report(0.8, "Checking database...")
+    with connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT 1")
+            cursor.fetchall()
+        finally:
+            cursor.close()
+    report(1.0, "Database ready")
+
+
+def init_database_async(progress=None, done=None):
+    """Run init_database on a daemon thread; ``done(error)`` gets None on success"""
+    def run():
+        try:
+            init_database(progress)
+        except Exception as e:
+            if done:
+                done(e)
+            return
+        if done:
+            done(None)
+
+    thread = threading.Thread(target=run, name="db-init", daemon=True)
+    thread.start()
+    return thread
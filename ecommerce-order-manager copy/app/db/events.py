@@ -0,0 +1,38 @@
+# events.py
+"""Write notifications for caches and indexes.
+
+The model write functions call notify_write(table, action, keys) after a
+successful commit. Listeners registered with subscribe() receive the table
+name, the action ('create', 'update' or 'delete') and the list of primary
+keys written (None when unknown). Deletes that cascade in the database are
+reported only for the table that was written to.
+"""
+import threading
+
+_subscribers = []
+_lock = threading.Lock()
+
+
+def subscribe(callback):
+    """Register callback(table, action, keys); returns it so it can be used as a decorator"""
+    with _lock:
+        if callback not in _subscribers:
+            _subscribers.append(callback)
+    return callback
+
+
+def unsubscribe(callback):
+    with _lock:
+        if callback in _subscribers:
+            _subscribers.remove(callback)
+
+
+def notify_write(table, action, keys=None):
+    with _lock:
+        subscribers = list(_subscribers)
+    for callback in subscribers:
+        try:
+            callback(table, action, keys)
+        except Exception as e:
+            # A failing listener must not turn a committed write into an error
+            print(f"Write listener {callback!r} failed: {e}")
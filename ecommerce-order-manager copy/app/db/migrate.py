@@ -0,0 +1,139 @@
+# migrate.py
+"""Versioned schema migrations.
+
+Migrations are the files app/db/migrations/NNNN_description.sql, applied in
+version order. Applied versions are recorded in the schema_migrations table,
+so running the tool again only applies new files. Files may change the
+statement delimiter with DELIMITER lines, like the procedure scripts.
+
+    python -m app.db.migrate            # apply pending migrations
+    python -m app.db.migrate --list     # show applied/pending migrations
+"""
+import argparse
+import os
+import re
+from app.db.connection import get_connection
+from mysql.connector import Error
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), "migrations")
+MIGRATION_FILE = re.compile(r'^(\d{4})_(\w+)\.sql$')
+
+CREATE_MIGRATIONS_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        Version CHAR(4) NOT NULL,
+        Name VARCHAR(255) NOT NULL,
+        AppliedAt DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (Version)
+    )
+"""
+
+
+def discover_migrations(directory=MIGRATIONS_DIR):
+    """Return [(version, name, path)] sorted by version"""
+    migrations = []
+    for filename in os.listdir(directory):
+        match = MIGRATION_FILE.match(filename)
+        if match:
+            migrations.append((match.group(1), match.group(2), os.path.join(directory, filename)))
+    migrations.sort()
+    versions = [version for version, _, _ in migrations]
+    if len(versions) != len(set(versions)):
+        raise Exception("Two migration files share the same version number")
+    return migrations
+
+
+def split_statements(sql):
+    """Split a SQL script into statements, honouring DELIMITER lines"""
+    statements, buffer, delimiter = [], [], ";"
+    for line in sql.splitlines():
+        stripped = line.strip()
+        if stripped.upper().startswith("DELIMITER "):
+            delimiter = stripped.split(None, 1)[1]
+            continue
+        buffer.append(line)
+        if stripped.startswith("--"):
+            continue
+        if stripped.endswith(delimiter):
+            statement = "\n".join(buffer).rstrip()[:-len(delimiter)].strip()
+            buffer = []
+            if _has_code(statement):
+                statements.append(statement)
+    rest = "\n".join(buffer).strip()
+    if _has_code(rest):
+        statements.append(rest)
+    return statements
+
+
+def _has_code(statement):
+    return any(line.strip() and not line.strip().startswith("--") for line in statement.splitlines())
+
+
+def applied_versions(cursor):
+    cursor.execute(CREATE_MIGRATIONS_TABLE)
+    cursor.execute("SELECT Version FROM schema_migrations")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def migrate(target=None, log=print):
+    """Apply pending migrations up to ``target`` (inclusive); returns the versions applied"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    applied = []
+    try:
+        done = applied_versions(cursor)
+        for version, name, path in discover_migrations():
+            if version in done:
+                continue
+            if target is not None and version > target:
+                break
+            log(f"Applying {version}_{name}...")
+            with open(path, encoding='utf-8') as f:
+                statements = split_statements(f.read())
+            try:
+                for statement in statements:
+                    cursor.execute(statement)
+                    if cursor.with_rows:
+                        cursor.fetchall()
+                cursor.execute("INSERT INTO schema_migrations (Version, Name) VALUES (%s, %s)", (version, name))
+                conn.commit()
+            except Error as err:
+                conn.rollback()
+                # MySQL commits DDL implicitly, so earlier statements of this file may have run
+                raise Exception(f"Migration {version}_{name} failed: {err.msg}")
+            applied.append(version)
+        return applied
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def list_migrations():
+    """Return [(version, name, applied)] for every migration file"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        done = applied_versions(cursor)
+        conn.commit()
+        return [(version, name, version in done) for version, name, _ in discover_migrations()]
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply database schema migrations")
+    parser.add_argument("--list", action="store_true", help="show applied and pending migrations")
+    parser.add_argument("--target", help="stop after this version (e.g. 0001)")
+    args = parser.parse_args()
+
+    if args.list:
+        for version, name, applied in list_migrations():
+            print(f"{version}_{name:<40} {'applied' if applied else 'pending'}")
+        return
+
+    applied = migrate(args.target)
+    print(f"Applied {len(applied)} migration(s)" if applied else "Database is up to date")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+-- Indexes for the dashboard and search query shapes in app/queries/dashboard_queries.py
+
+-- Revenue queries filter on OrderStatus = 'Delivered' and group/sort by date;
+-- the primary key (OrderID) is appended to every secondary index, so the
+-- join back to quantities is covered as well
+CREATE INDEX idx_orders_status_date ON orders (OrderStatus, OrderDate);
+
+-- Per-customer order history, newest first. Also serves the CustomerID
+-- foreign key, replacing its implicit index
+CREATE INDEX idx_orders_customer_date ON orders (CustomerID, OrderDate);
+
+-- Top products and product revenue join quantities by ProductID and only need
+-- OrderID and Quantity; covering index, also serves the ProductID foreign key
+CREATE INDEX idx_quantities_product ON quantities (ProductID, OrderID, Quantity);
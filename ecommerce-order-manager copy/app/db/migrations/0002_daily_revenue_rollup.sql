@@ -0,0 +1,144 @@
+-- Daily revenue rollup kept current by triggers, so dashboard revenue
+-- queries read a few rows per day instead of re-joining the whole history
+
+CREATE TABLE daily_revenue (
+    RevenueDate DATE NOT NULL,
+    OrderStatus ENUM('Pending', 'Shipped', 'Delivered', 'Cancelled') NOT NULL,
+    Revenue DECIMAL(20 , 2 ) NOT NULL DEFAULT 0,
+    Units BIGINT NOT NULL DEFAULT 0,
+    OrderCount INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (OrderStatus , RevenueDate)
+);
+
+INSERT INTO daily_revenue (RevenueDate, OrderStatus, Revenue, Units, OrderCount)
+SELECT o.OrderDate, o.OrderStatus, COALESCE(SUM(l.Revenue), 0), COALESCE(SUM(l.Units), 0), COUNT(*)
+FROM orders o
+LEFT JOIN (
+    SELECT q.OrderID, SUM(q.Quantity * p.Price) AS Revenue, SUM(q.Quantity) AS Units
+    FROM quantities q
+    JOIN products p ON q.ProductID = p.ProductID
+    GROUP BY q.OrderID
+) l ON l.OrderID = o.OrderID
+GROUP BY o.OrderDate, o.OrderStatus;
+
+DELIMITER $$
+
+CREATE PROCEDURE AdjustDailyRevenue (
+    IN p_Date DATE,
+    IN p_Status ENUM('Pending', 'Shipped', 'Delivered', 'Cancelled'),
+    IN p_Revenue DECIMAL(20,2),
+    IN p_Units BIGINT,
+    IN p_Orders INT
+)
+BEGIN
+    IF p_Date IS NOT NULL THEN
+        INSERT INTO daily_revenue (RevenueDate, OrderStatus, Revenue, Units, OrderCount)
+        VALUES (p_Date, p_Status, p_Revenue, p_Units, p_Orders)
+        ON DUPLICATE KEY UPDATE
+            Revenue = Revenue + p_Revenue,
+            Units = Units + p_Units,
+            OrderCount = OrderCount + p_Orders;
+    END IF;
+END$$
+
+-- Order lines
+CREATE TRIGGER trg_quantities_rollup_insert AFTER INSERT ON quantities
+FOR EACH ROW
+BEGIN
+    DECLARE v_Date DATE;
+    DECLARE v_Status VARCHAR(16);
+    DECLARE v_Price DECIMAL(12,2);
+
+    SELECT OrderDate, OrderStatus INTO v_Date, v_Status FROM orders WHERE OrderID = NEW.OrderID;
+    SELECT Price INTO v_Price FROM products WHERE ProductID = NEW.ProductID;
+    CALL AdjustDailyRevenue(v_Date, v_Status, NEW.Quantity * v_Price, NEW.Quantity, 0);
+END$$
+
+CREATE TRIGGER trg_quantities_rollup_update AFTER UPDATE ON quantities
+FOR EACH ROW
+BEGIN
+    DECLARE v_Date DATE;
+    DECLARE v_Status VARCHAR(16);
+    DECLARE v_Price DECIMAL(12,2);
+
+    SELECT OrderDate, OrderStatus INTO v_Date, v_Status FROM orders WHERE OrderID = OLD.OrderID;
+    SELECT Price INTO v_Price FROM products WHERE ProductID = OLD.ProductID;
+    CALL AdjustDailyRevenue(v_Date, v_Status, -OLD.Quantity * v_Price, -OLD.Quantity, 0);
+
+    SELECT OrderDate, OrderStatus INTO v_Date, v_Status FROM orders WHERE OrderID = NEW.OrderID;
+    SELECT Price INTO v_Price FROM products WHERE ProductID = NEW.ProductID;
+    CALL AdjustDailyRevenue(v_Date, v_Status, NEW.Quantity * v_Price, NEW.Quantity, 0);
+END$$
+
+CREATE TRIGGER trg_quantities_rollup_delete AFTER DELETE ON quantities
+FOR EACH ROW
+BEGIN
+    DECLARE v_Date DATE;
+    DECLARE v_Status VARCHAR(16);
+    DECLARE v_Price DECIMAL(12,2);
+
+    SELECT OrderDate, OrderStatus INTO v_Date, v_Status FROM orders WHERE OrderID = OLD.OrderID;
+    SELECT Price INTO v_Price FROM products WHERE ProductID = OLD.ProductID;
+    CALL AdjustDailyRevenue(v_Date, v_Status, -OLD.Quantity * v_Price, -OLD.Quantity, 0);
+END$$
+
+-- Orders
+CREATE TRIGGER trg_orders_rollup_insert AFTER INSERT ON orders
+FOR EACH ROW
+BEGIN
+    CALL AdjustDailyRevenue(NEW.OrderDate, NEW.OrderStatus, 0, 0, 1);
+END$$
+
+CREATE TRIGGER trg_orders_rollup_update AFTER UPDATE ON orders
+FOR EACH ROW
+BEGIN
+    DECLARE v_Revenue DECIMAL(20,2);
+    DECLARE v_Units BIGINT;
+
+    IF NEW.OrderDate <> OLD.OrderDate OR NEW.OrderStatus <> OLD.OrderStatus THEN
+        SELECT COALESCE(SUM(q.Quantity * p.Price), 0), COALESCE(SUM(q.Quantity), 0)
+        INTO v_Revenue, v_Units
+        FROM quantities q
+        JOIN products p ON q.ProductID = p.ProductID
+        WHERE q.OrderID = NEW.OrderID;
+
+        CALL AdjustDailyRevenue(OLD.OrderDate, OLD.OrderStatus, -v_Revenue, -v_Units, -1);
+        CALL AdjustDailyRevenue(NEW.OrderDate, NEW.OrderStatus, v_Revenue, v_Units, 1);
+    END IF;
+END$$
+
+-- BEFORE DELETE: lines removed by ON DELETE CASCADE do not fire their own
+-- triggers, so whatever lines are still attached are subtracted here
+CREATE TRIGGER trg_orders_rollup_delete BEFORE DELETE ON orders
+FOR EACH ROW
+BEGIN
+    DECLARE v_Revenue DECIMAL(20,2);
+    DECLARE v_Units BIGINT;
+
+    SELECT COALESCE(SUM(q.Quantity * p.Price), 0), COALESCE(SUM(q.Quantity), 0)
+    INTO v_Revenue, v_Units
+    FROM quantities q
+    JOIN products p ON q.ProductID = p.ProductID
+    WHERE q.OrderID = OLD.OrderID;
+
+    CALL AdjustDailyRevenue(OLD.OrderDate, OLD.OrderStatus, -v_Revenue, -v_Units, -1);
+END$$
+
+-- Product price changes re-price every line that uses the product
+CREATE TRIGGER trg_products_rollup_update AFTER UPDATE ON products
+FOR EACH ROW
+BEGIN
+    IF NEW.Price <> OLD.Price THEN
+        UPDATE daily_revenue d
+        JOIN (
+            SELECT o.OrderDate, o.OrderStatus, SUM(q.Quantity) AS Units
+            FROM quantities q
+            JOIN orders o ON q.OrderID = o.OrderID
+            WHERE q.ProductID = NEW.ProductID
+            GROUP BY o.OrderDate, o.OrderStatus
+        ) t ON d.RevenueDate = t.OrderDate AND d.OrderStatus = t.OrderStatus
+        SET d.Revenue = d.Revenue + (NEW.Price - OLD.Price) * t.Units;
+    END IF;
+END$$
+
+DELIMITER ;
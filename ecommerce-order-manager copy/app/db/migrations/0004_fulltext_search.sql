@@ -0,0 +1,8 @@
+-- FULLTEXT indexes for the fulltext modes of global search
+-- (SearchService.global_search(mode='fulltext' / 'prefix')). MATCH ... AGAINST
+-- looks words up in these instead of scanning every name like LIKE '%term%'.
+-- InnoDB only indexes words of at least innodb_ft_min_token_size (default 3)
+-- characters that are not stopwords.
+
+ALTER TABLE customers ADD FULLTEXT INDEX ft_customers_name (CustomerName);
+ALTER TABLE products ADD FULLTEXT INDEX ft_products_name (ProductName);
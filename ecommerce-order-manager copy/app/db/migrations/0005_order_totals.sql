@@ -0,0 +1,103 @@
+-- Order total and item count stored on each order and kept current by
+-- triggers, so filtering orders by price reads an indexed column instead of
+-- joining and grouping every order line. Existing orders start at 0; fill
+-- them in afterwards with python -m app.db.backfill_order_totals.
+
+ALTER TABLE orders
+    ADD COLUMN OrderTotal DECIMAL(20 , 2 ) NOT NULL DEFAULT 0,
+    ADD COLUMN ItemCount INT NOT NULL DEFAULT 0;
+
+-- Status/date filters narrow first, then the total is checked from the index;
+-- price-only filters range-scan idx_orders_total
+CREATE INDEX idx_orders_status_date_total ON orders (OrderStatus, OrderDate, OrderTotal);
+CREATE INDEX idx_orders_date_total ON orders (OrderDate, OrderTotal);
+CREATE INDEX idx_orders_total ON orders (OrderTotal);
+
+DELIMITER $$
+
+CREATE PROCEDURE AdjustOrderTotal (
+    IN p_OrderID VARCHAR(11),
+    IN p_Total DECIMAL(20,2),
+    IN p_Items INT
+)
+BEGIN
+    UPDATE orders
+    SET OrderTotal = OrderTotal + p_Total, ItemCount = ItemCount + p_Items
+    WHERE OrderID = p_OrderID;
+END$$
+
+-- Order lines
+CREATE TRIGGER trg_quantities_total_insert AFTER INSERT ON quantities
+FOR EACH ROW
+BEGIN
+    DECLARE v_Price DECIMAL(12,2);
+
+    SELECT Price INTO v_Price FROM products WHERE ProductID = NEW.ProductID;
+    CALL AdjustOrderTotal(NEW.OrderID, NEW.Quantity * v_Price, NEW.Quantity);
+END$$
+
+CREATE TRIGGER trg_quantities_total_update AFTER UPDATE ON quantities
+FOR EACH ROW
+BEGIN
+    DECLARE v_Price DECIMAL(12,2);
+
+    SELECT Price INTO v_Price FROM products WHERE ProductID = OLD.ProductID;
+    CALL AdjustOrderTotal(OLD.OrderID, -OLD.Quantity * v_Price, -OLD.Quantity);
+
+    SELECT Price INTO v_Price FROM products WHERE ProductID = NEW.ProductID;
+    CALL AdjustOrderTotal(NEW.OrderID, NEW.Quantity * v_Price, NEW.Quantity);
+END$$
+
+CREATE TRIGGER trg_quantities_total_delete AFTER DELETE ON quantities
+FOR EACH ROW
+BEGIN
+    DECLARE v_Price DECIMAL(12,2);
+
+    SELECT Price INTO v_Price FROM products WHERE ProductID = OLD.ProductID;
+    CALL AdjustOrderTotal(OLD.OrderID, -OLD.Quantity * v_Price, -OLD.Quantity);
+END$$
+
+-- Product price changes re-price every order that contains the product
+CREATE TRIGGER trg_products_total_update AFTER UPDATE ON products
+FOR EACH ROW
+BEGIN
+    IF NEW.Price <> OLD.Price THEN
+        UPDATE orders o
+        JOIN quantities q ON q.OrderID = o.OrderID
+        SET o.OrderTotal = o.OrderTotal + (NEW.Price - OLD.Price) * q.Quantity
+        WHERE q.ProductID = NEW.ProductID;
+    END IF;
+END$$
+
+-- Deleting a customer's lines through a join on orders would now fail (a
+-- trigger may not update a table its statement reads), so the procedure
+-- deletes the orders and lets ON DELETE CASCADE remove their lines
+DROP PROCEDURE IF EXISTS CascadeDeleteCustomer$$
+
+CREATE PROCEDURE CascadeDeleteCustomer (
+    IN p_CustomerID VARCHAR(11)
+)
+BEGIN
+    DECLARE exit handler FOR SQLEXCEPTION 
+    BEGIN
+        ROLLBACK;
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'CascadeDeleteCustomer failed, rolled back';
+    END;
+
+    START TRANSACTION;
+
+    -- Validate existence
+    IF NOT EXISTS (SELECT 1 FROM customers WHERE CustomerID = p_CustomerID) THEN
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'CustomerID does not exist';
+    END IF;
+
+    -- Delete orders; their quantities go with them (ON DELETE CASCADE)
+    DELETE FROM orders WHERE CustomerID = p_CustomerID;
+
+    -- Delete customer
+    DELETE FROM customers WHERE CustomerID = p_CustomerID;
+
+    COMMIT;
+END$$
+
+DELIMITER ;
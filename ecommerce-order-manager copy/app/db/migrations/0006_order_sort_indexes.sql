@@ -0,0 +1,10 @@
+-- Indexes for sorted, paginated order filters (SearchService.filter_orders).
+-- InnoDB appends the primary key to every secondary index, so each of these is
+-- ordered by OrderID after its own columns, as the sort keys are; MySQL reads
+-- a page from the cursor on instead of sorting every match. idx_orders_date
+-- overlaps idx_orders_date_total but sorts OrderID straight after the date.
+
+-- sort='date' without a status filter
+CREATE INDEX idx_orders_date ON orders (OrderDate);
+-- sort='total' with a status filter
+CREATE INDEX idx_orders_status_total ON orders (OrderStatus, OrderTotal);
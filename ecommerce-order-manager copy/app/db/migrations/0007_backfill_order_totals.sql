@@ -0,0 +1,14 @@
+-- Fill orders.OrderTotal and orders.ItemCount (migration 0005) for the orders
+-- that existed before its triggers. Filters keep grouping the order lines
+-- until this version is recorded. On large tables run
+-- python -m app.db.backfill_order_totals first instead: it works in short
+-- chunks and records this version when it finishes, so this file is skipped.
+
+UPDATE orders o
+LEFT JOIN (
+    SELECT q.OrderID, SUM(q.Quantity * p.Price) AS Total, SUM(q.Quantity) AS Items
+    FROM quantities q
+    JOIN products p ON q.ProductID = p.ProductID
+    GROUP BY q.OrderID
+) t ON t.OrderID = o.OrderID
+SET o.OrderTotal = COALESCE(t.Total, 0), o.ItemCount = COALESCE(t.Items, 0);
@@ -0,0 +1,117 @@
+# pagination.py
+from app.db.connection import get_connection
+
+
+def _as_key(key):
+    return tuple(key) if isinstance(key, (tuple, list)) else (key,)
+
+
+def keyset_condition(key_columns, key, op, enums=None):
+    """Expand (a, b) > (x, y) into a = x-chained OR so MySQL uses a range scan on the key.
+
+    ``enums`` maps ENUM columns to their values in definition order. MySQL
+    sorts an ENUM by that order but compares it with a string alphabetically,
+    so the values past the cursor are listed (``a IN (...)``) instead.
+    """
+    enums = enums or {}
+    clauses, params = [], []
+    for i, column in enumerate(key_columns):
+        parts = [f"{prev} = %s" for prev in key_columns[:i]]
+        values = list(key[:i])
+        if column in enums:
+            order = enums[column]
+            position = order.index(key[i])
+            later = order[position + 1:] if op == '>' else order[:position]
+            if not later:
+                continue
+            parts.append(f"{column} IN ({', '.join(['%s'] * len(later))})")
+            values.extend(later)
+        else:
+            parts.append(f"{column} {op} %s")
+            values.append(key[i])
+        clauses.append("(" + " AND ".join(parts) + ")")
+        params.extend(values)
+    if not clauses:
+        return "(1 = 0)", params
+    return "(" + " OR ".join(clauses) + ")", params
+
+
+def empty_page():
+    return {'rows': [], 'first_key': None, 'last_key': None,
+            'has_prev': False, 'has_next': False, 'total': None}
+
+
+def fetch_page(table, key_columns, page_size=50, after=None, before=None,
+               conditions=(), with_total=False, row_type=None):
+    """Fetch one page of ``table`` ordered by its primary key (keyset pagination).
+
+    after/before: key of the last/first row of the neighbouring page (a value,
+    or a tuple for composite keys). ``conditions`` is a list of
+    ``(sql, params)`` filters ANDed together. Only page_size + 1 rows are ever
+    read, however deep the page.
+
+    Returns a dict with 'rows', 'first_key', 'last_key', 'has_prev',
+    'has_next' and 'total' (None unless with_total). Rows are dicts, or
+    ``row_type`` instances (see app.models.rows) when one is given.
+    """
+    if after is not None and before is not None:
+        raise ValueError("Pass either after or before, not both")
+
+    where, params = [], []
+    for sql, values in conditions:
+        where.append(sql)
+        params.extend(values)
+
+    filter_where, filter_params = list(where), list(params)
+
+    backwards = before is not None
+    if after is not None:
+        sql, values = keyset_condition(key_columns, _as_key(after), '>')
+        where.append(sql)
+        params.extend(values)
+    elif backwards:
+        sql, values = keyset_condition(key_columns, _as_key(before), '<')
+        where.append(sql)
+        params.extend(values)
+
+    direction = "DESC" if backwards else "ASC"
+    columns = row_type.COLUMNS if row_type is not None else "*"
+    query = f"SELECT {columns} FROM {table}"
+    if where:
+        query += " WHERE " + " AND ".join(where)
+    query += " ORDER BY " + ", ".join(f"{column} {direction}" for column in key_columns)
+    query += " LIMIT %s"
+    params.append(page_size + 1)
+
+    conn = get_connection()
+    cursor = conn.cursor(dictionary=row_type is None)
+    try:
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+        if row_type is not None:
+            rows = [row_type._make(row) for row in rows]
+        more = len(rows) > page_size
+        rows = rows[:page_size]
+        if backwards:
+            rows.reverse()
+
+        total = None
+        if with_total:
+            count_query = f"SELECT COUNT(*) AS total FROM {table}"
+            if filter_where:
+                count_query += " WHERE " + " AND ".join(filter_where)
+            cursor.execute(count_query, filter_params)
+            total = cursor.fetchone()[0 if row_type is not None else 'total']
+
+        key_of = lambda row: tuple(row[column] for column in key_columns)
+        return {
+            'rows': rows,
+            'first_key': key_of(rows[0]) if rows else None,
+            'last_key': key_of(rows[-1]) if rows else None,
+            'has_prev': more if backwards else after is not None,
+            'has_next': True if backwards else more,
+            'total': total,
+        }
+    finally:
+        cursor.close()
+        conn.close()
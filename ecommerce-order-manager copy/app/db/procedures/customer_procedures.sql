@@ -92,12 +92,9 @@ BEGIN
         SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'CustomerID does not exist';
     END IF;
 
-    -- Delete quantities of all orders belonging to the customer
-    DELETE q FROM quantities q
-    JOIN orders o ON q.OrderID = o.OrderID
-    WHERE o.CustomerID = p_CustomerID;
-
-    -- Delete orders
+    -- Delete orders; their quantities go with them (ON DELETE CASCADE). A
+    -- DELETE of quantities joined to orders would fail once the order-total
+    -- triggers (migration 0005) update orders for every deleted line.
     DELETE FROM orders WHERE CustomerID = p_CustomerID;
 
     -- Delete customer
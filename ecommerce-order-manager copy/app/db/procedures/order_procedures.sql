@@ -115,4 +115,103 @@ BEGIN
     COMMIT;
 END$$
 
-DELIMITER ;
\ No newline at end of file
+DELIMITER ;
+
+-- 5. Create with items
+DELIMITER $$
+
+CREATE PROCEDURE CreateOrderWithItems (
+    IN p_OrderID VARCHAR(11),
+    IN p_CustomerID VARCHAR(11),
+    IN p_OrderDate DATE,
+    IN p_OrderStatus ENUM('Pending', 'Shipped', 'Delivered', 'Cancelled'),
+    IN p_Items JSON  -- [{"product_id": "P#########", "quantity": n}, ...]
+)
+BEGIN
+    DECLARE v_MissingProduct VARCHAR(11) DEFAULT NULL;
+    DECLARE v_Message VARCHAR(128);
+
+    -- Undo everything and report the original error
+    DECLARE exit handler FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        RESIGNAL;
+    END;
+
+    START TRANSACTION;
+
+    IF p_OrderID NOT REGEXP '^O[0-9]{9}$' THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'Invalid OrderID format. Expected O#########';
+    END IF;
+
+    IF NOT EXISTS (SELECT 1 FROM customers WHERE CustomerID = p_CustomerID) THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'CustomerID does not exist';
+    END IF;
+
+    IF p_OrderDate IS NULL THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'OrderDate cannot be NULL';
+    END IF;
+
+    IF EXISTS (SELECT 1 FROM orders WHERE OrderID = p_OrderID) THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'OrderID already exists';
+    END IF;
+
+    IF p_Items IS NULL OR JSON_LENGTH(p_Items) = 0 THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'An order needs at least one item';
+    END IF;
+
+    -- Validate all lines at once instead of once per CreateQuantity call
+    IF EXISTS (
+        SELECT 1
+        FROM JSON_TABLE(p_Items, '$[*]' COLUMNS (Quantity INT PATH '$.quantity')) AS items
+        WHERE items.Quantity IS NULL OR items.Quantity <= 0 OR items.Quantity > 65535
+    ) THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'Quantity must be between 1 and 65535';
+    END IF;
+
+    IF EXISTS (
+        SELECT items.ProductID
+        FROM JSON_TABLE(p_Items, '$[*]' COLUMNS (ProductID VARCHAR(11) PATH '$.product_id')) AS items
+        GROUP BY items.ProductID
+        HAVING COUNT(*) > 1
+    ) THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'This Order/Product combination already exists';
+    END IF;
+
+    SELECT items.ProductID INTO v_MissingProduct
+    FROM JSON_TABLE(p_Items, '$[*]' COLUMNS (ProductID VARCHAR(11) PATH '$.product_id')) AS items
+    LEFT JOIN products p ON p.ProductID = items.ProductID
+    WHERE p.ProductID IS NULL
+    LIMIT 1;
+
+    IF v_MissingProduct IS NOT NULL OR EXISTS (
+        SELECT 1
+        FROM JSON_TABLE(p_Items, '$[*]' COLUMNS (ProductID VARCHAR(11) PATH '$.product_id')) AS items
+        WHERE items.ProductID IS NULL
+    ) THEN
+        SET v_Message = CONCAT('ProductID does not exist: ', IFNULL(v_MissingProduct, 'NULL'));
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = v_Message;
+    END IF;
+
+    INSERT INTO orders (OrderID, CustomerID, OrderDate, OrderStatus)
+    VALUES (p_OrderID, p_CustomerID, p_OrderDate, p_OrderStatus);
+
+    INSERT INTO quantities (OrderID, ProductID, Quantity)
+    SELECT p_OrderID, items.ProductID, items.Quantity
+    FROM JSON_TABLE(p_Items, '$[*]' COLUMNS (
+        ProductID VARCHAR(11) PATH '$.product_id',
+        Quantity INT PATH '$.quantity'
+    )) AS items;
+
+    COMMIT;
+END$$
+
+DELIMITER ;
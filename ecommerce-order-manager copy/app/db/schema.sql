@@ -2,10 +2,15 @@ CREATE DATABASE IF NOT EXISTS eCommerce;
 USE eCommerce;
 
 -- Recreate table if exist
+-- (tables from app/db/migrations go too, so migrations are re-applied afterwards)
+DROP TABLE IF EXISTS daily_revenue;
+DROP TABLE IF EXISTS schema_migrations;
 DROP TABLE IF EXISTS quantities;
 DROP TABLE IF EXISTS orders;
 DROP TABLE IF EXISTS products;
 DROP TABLE IF EXISTS customers;
+DROP PROCEDURE IF EXISTS AdjustDailyRevenue;
+DROP PROCEDURE IF EXISTS AdjustOrderTotal;
 
 -- Create table
 CREATE TABLE customers (
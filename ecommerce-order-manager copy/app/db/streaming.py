@@ -0,0 +1,36 @@
+# streaming.py
+from app.db.connection import get_connection
+
+
+def stream_rows(query, params=(), chunk_size=1000, dictionary=True, row_type=None, conn=None):
+    """Yield the rows of ``query`` lazily, ``chunk_size`` at a time.
+
+    Uses an unbuffered cursor, so rows are read from the server as the
+    caller consumes them and memory stays constant whatever the result size.
+    The pooled connection is held until the generator is exhausted or closed;
+    if it is abandoned half-way the connection is discarded instead of
+    draining the rest of the result. With ``row_type`` (see app.models.rows)
+    rows are built from plain tuples with ``row_type._make``. With ``conn``
+    the query runs on that connection (e.g. inside the caller's transaction),
+    which the caller closes.
+    """
+    own = conn is None
+    if own:
+        conn = get_connection()
+    cursor = conn.cursor(dictionary=dictionary and row_type is None, buffered=False)
+    finished = False
+    try:
+        cursor.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield from (rows if row_type is None else map(row_type._make, rows))
+        finished = True
+    finally:
+        if finished:
+            cursor.close()
+            if own:
+                conn.close()
+        elif own:
+            conn.discard()
@@ -1,10 +1,13 @@
+import time
+STARTED_AT = time.perf_counter()
+
 from tkinter import Tk
 from app.ui.main_app import eCommerce
 
 def main():
     """Main entry point for the eCommerce Order Manager application"""
     root = Tk()
-    app = eCommerce(root)
+    app = eCommerce(root, started_at=STARTED_AT)
     root.mainloop()
 
 if __name__ == "__main__":
@@ -1,6 +1,14 @@
+import re
 from app.db.connection import get_connection
+from app.db.bulk import bulk_create
+from app.db.events import notify_write
+from app.db.pagination import fetch_page, empty_page
+from app.db.streaming import stream_rows
+from app.models.rows import Customer, resolve_row_type
 from mysql.connector import Error
 
+CUSTOMER_ID_PATTERN = re.compile(r'^C[0-9]{9}$')
+
 # ==================== CUSTOMER ====================
 
 def create_customer(cid, cname):
@@ -9,6 +17,7 @@ def create_customer(cid, cname):
     try:
         cursor.callproc("CreateCustomer", [cid.upper(), cname])
         conn.commit()
+        notify_write("customers", "create", [cid.upper()])
         return "Customer created successfully."
     except Error as err:
         return f"Error: {err.msg}"
@@ -35,6 +44,7 @@ def update_customer(cid, new_name):
     try:
         cursor.callproc("UpdateCustomer", [cid.upper(), new_name])
         conn.commit()
+        notify_write("customers", "update", [cid.upper()])
         return "Customer updated successfully."
     except Error as err:
         return f"Error: {err.msg}"
@@ -48,6 +58,7 @@ def delete_customer(cid):
     try:
         cursor.callproc("CascadeDeleteCustomer", [cid.upper()])
         conn.commit()
+        notify_write("customers", "delete", [cid.upper()])
         return "Customer deleted successfully."
     except Error as err:
         return f"Error: {err.msg}"
@@ -55,14 +66,63 @@ def delete_customer(cid):
         cursor.close()
         conn.close()
 
-def get_all_customers():
+def get_all_customers(row_format='dict'):
+    row_type = resolve_row_type(row_format, Customer)
     conn = get_connection()
-    cursor = conn.cursor(dictionary=True)
+    cursor = conn.cursor(dictionary=row_type is None)
     try:
-        cursor.execute("SELECT * FROM customers ORDER BY CustomerID")
-        return cursor.fetchall()
+        columns = row_type.COLUMNS if row_type is not None else "*"
+        cursor.execute(f"SELECT {columns} FROM customers ORDER BY CustomerID")
+        rows = cursor.fetchall()
+        return rows if row_type is None else [row_type._make(row) for row in rows]
     except Error:
         return []
     finally:
         cursor.close()
-        conn.close()
\ No newline at end of file
+        conn.close()
+
+def get_customers_page(page_size=50, after=None, before=None, name=None, with_total=False, row_format='dict'):
+    """One page of customers ordered by CustomerID (keyset pagination).
+
+    after/before: CustomerID of the last/first row of the neighbouring page.
+    name: optional substring filter on CustomerName.
+    """
+    conditions = []
+    if name:
+        conditions.append(("CustomerName LIKE %s", [f"%{name}%"]))
+    try:
+        return fetch_page("customers", ["CustomerID"], page_size, after, before, conditions, with_total,
+                          resolve_row_type(row_format, Customer))
+    except Error:
+        return empty_page()
+
+def iter_customers(chunk_size=1000, row_format='dict'):
+    """Yield all customers ordered by CustomerID without loading them into memory"""
+    row_type = resolve_row_type(row_format, Customer)
+    columns = row_type.COLUMNS if row_type is not None else "*"
+    return stream_rows(f"SELECT {columns} FROM customers ORDER BY CustomerID", chunk_size=chunk_size,
+                       row_type=row_type)
+
+def create_customers_bulk(rows, batch_size=1000):
+    """Create many customers in one transaction.
+
+    rows: iterable of (cid, cname). Rows are validated like CreateCustomer;
+    invalid ones are skipped and reported as (row index, message).
+    Returns {'inserted': count, 'errors': [...]}.
+    """
+    errors, valid, seen = [], [], set()
+    for index, (cid, cname) in enumerate(rows):
+        cid = (cid or '').strip().upper()
+        cname = (cname or '').strip()
+        if not CUSTOMER_ID_PATTERN.match(cid):
+            errors.append((index, "Invalid CustomerID format. Expected C#########"))
+        elif not cname:
+            errors.append((index, "CustomerName cannot be empty"))
+        elif cid in seen:
+            errors.append((index, "Duplicate CustomerID in batch"))
+        else:
+            seen.add(cid)
+            valid.append((index, (cid, cname)))
+
+    return bulk_create("customers", ["CustomerID", "CustomerName"], valid, errors,
+                       duplicate_message="CustomerID already exists", batch_size=batch_size)
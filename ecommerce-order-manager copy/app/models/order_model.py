@@ -1,6 +1,26 @@
+import json
+import re
+from datetime import date, datetime
 from app.db.connection import get_connection
+from app.db.bulk import bulk_create
+from app.db.events import notify_write
+from app.db.pagination import fetch_page, empty_page
+from app.db.streaming import stream_rows
+from app.models.rows import Order, resolve_row_type
 from mysql.connector import Error
 
+ORDER_ID_PATTERN = re.compile(r'^O[0-9]{9}$')
+ORDER_STATUSES = ('Pending', 'Shipped', 'Delivered', 'Cancelled')
+
+
+def _parse_order_date(odate):
+    if isinstance(odate, date):
+        return odate
+    try:
+        return datetime.strptime(str(odate).strip(), "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
 # ==================== ORDER ====================
 
 def create_order(oid, cid, odate, ostatus):
@@ -9,6 +29,7 @@ def create_order(oid, cid, odate, ostatus):
     try:
         cursor.callproc("CreateOrder", [oid.upper(), cid.upper(), odate, ostatus])
         conn.commit()
+        notify_write("orders", "create", [oid.upper()])
         return "Order created successfully."
     except Error as err:
         return f"Error: {err.msg}"
@@ -16,6 +37,39 @@ def create_order(oid, cid, odate, ostatus):
         cursor.close()
         conn.close()
 
+def create_order_with_items(oid, cid, odate, ostatus, items):
+    """Create an order together with all of its lines atomically.
+
+    items: iterable of (pid, quantity). Everything is validated and inserted
+    by the CreateOrderWithItems procedure in one CALL, i.e. one round trip
+    however many lines the order has; if any line is invalid nothing is
+    written.
+    """
+    lines = [{"product_id": (pid or '').strip().upper(), "quantity": quantity} for pid, quantity in items]
+    for line in lines:
+        try:
+            line["quantity"] = int(line["quantity"])
+        except (TypeError, ValueError):
+            return "Error: Quantity must be a whole number"
+    if isinstance(odate, date):
+        odate = odate.isoformat()
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        # A plain CALL is one statement; callproc would add SET/SELECT round trips.
+        # The procedure commits (or rolls back) its own transaction.
+        cursor.execute("CALL CreateOrderWithItems(%s, %s, %s, %s, %s)",
+                       (oid.upper(), cid.upper(), odate, ostatus, json.dumps(lines)))
+        notify_write("orders", "create", [oid.upper()])
+        notify_write("quantities", "create", [(oid.upper(), line["product_id"]) for line in lines])
+        return f"Order created successfully with {len(lines)} item(s)."
+    except Error as err:
+        return f"Error: {err.msg}"
+    finally:
+        cursor.close()
+        conn.close()
+
 def get_order(oid):
     conn = get_connection()
     cursor = conn.cursor(dictionary=True)
@@ -35,6 +89,7 @@ def update_order(oid, new_cid, new_date, new_status):
     try:
         cursor.callproc("UpdateOrder", [oid.upper(), new_cid.upper(), new_date, new_status])
         conn.commit()
+        notify_write("orders", "update", [oid.upper()])
         return "Order updated successfully."
     except Error as err:
         return f"Error: {err.msg}"
@@ -48,6 +103,7 @@ def delete_order(oid):
     try:
         cursor.callproc("CascadeDeleteOrder", [oid.upper()])
         conn.commit()
+        notify_write("orders", "delete", [oid.upper()])
         return "Order deleted successfully."
     except Error as err:
         return f"Error: {err.msg}"
@@ -55,14 +111,72 @@ def delete_order(oid):
         cursor.close()
         conn.close()
 
-def get_all_orders():
+def get_all_orders(row_format='dict'):
+    row_type = resolve_row_type(row_format, Order)
     conn = get_connection()
-    cursor = conn.cursor(dictionary=True)
+    cursor = conn.cursor(dictionary=row_type is None)
     try:
-        cursor.execute("SELECT * FROM orders ORDER BY OrderID")
-        return cursor.fetchall()
+        columns = row_type.COLUMNS if row_type is not None else "*"
+        cursor.execute(f"SELECT {columns} FROM orders ORDER BY OrderID")
+        rows = cursor.fetchall()
+        return rows if row_type is None else [row_type._make(row) for row in rows]
     except Error:
         return []
     finally:
         cursor.close()
-        conn.close()
\ No newline at end of file
+        conn.close()
+
+def get_orders_page(page_size=50, after=None, before=None, customer_id=None,
+                    status=None, with_total=False, row_format='dict'):
+    """One page of orders ordered by OrderID (keyset pagination).
+
+    after/before: OrderID of the last/first row of the neighbouring page.
+    customer_id, status: optional filters.
+    """
+    conditions = []
+    if customer_id:
+        conditions.append(("CustomerID = %s", [customer_id.upper()]))
+    if status:
+        conditions.append(("OrderStatus = %s", [status]))
+    try:
+        return fetch_page("orders", ["OrderID"], page_size, after, before, conditions, with_total,
+                          resolve_row_type(row_format, Order))
+    except Error:
+        return empty_page()
+
+def iter_orders(chunk_size=1000, row_format='dict', conn=None):
+    """Yield all orders ordered by OrderID without loading them into memory (on ``conn`` if given)"""
+    row_type = resolve_row_type(row_format, Order)
+    columns = row_type.COLUMNS if row_type is not None else "*"
+    return stream_rows(f"SELECT {columns} FROM orders ORDER BY OrderID", chunk_size=chunk_size,
+                       row_type=row_type, conn=conn)
+
+def create_orders_bulk(rows, batch_size=1000):
+    """Create many orders in one transaction.
+
+    rows: iterable of (oid, cid, odate, ostatus). Rows are validated like
+    CreateOrder, with customer existence checked for the whole batch at
+    once; invalid ones are skipped and reported as (row index, message).
+    Returns {'inserted': count, 'errors': [...]}.
+    """
+    errors, valid, seen = [], [], set()
+    for index, (oid, cid, odate, ostatus) in enumerate(rows):
+        oid = (oid or '').strip().upper()
+        cid = (cid or '').strip().upper()
+        odate = _parse_order_date(odate)
+        if not ORDER_ID_PATTERN.match(oid):
+            errors.append((index, "Invalid OrderID format. Expected O#########"))
+        elif odate is None:
+            errors.append((index, "OrderDate must be a valid date (YYYY-MM-DD)"))
+        elif ostatus not in ORDER_STATUSES:
+            errors.append((index, f"OrderStatus must be one of {', '.join(ORDER_STATUSES)}"))
+        elif oid in seen:
+            errors.append((index, "Duplicate OrderID in batch"))
+        else:
+            seen.add(oid)
+            valid.append((index, (oid, cid, odate, ostatus)))
+
+    return bulk_create("orders", ["OrderID", "CustomerID", "OrderDate", "OrderStatus"], valid, errors,
+                       duplicate_message="OrderID already exists",
+                       references=[(1, "customers", "CustomerID", "CustomerID does not exist")],
+                       batch_size=batch_size)
@@ -1,6 +1,16 @@
+import re
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
 from app.db.connection import get_connection
+from app.db.bulk import bulk_create
+from app.db.events import notify_write
+from app.db.pagination import fetch_page, empty_page
+from app.db.streaming import stream_rows
+from app.models.rows import Product, resolve_row_type
 from mysql.connector import Error
 
+PRODUCT_ID_PATTERN = re.compile(r'^P[0-9]{9}$')
+MAX_PRICE = Decimal('9999999999.99')  # DECIMAL(12, 2)
+
 # ==================== PRODUCT ====================
 
 def create_product(pid, pname, price):
@@ -9,6 +19,7 @@ def create_product(pid, pname, price):
     try:
         cursor.callproc("CreateProduct", [pid.upper(), pname, price])
         conn.commit()
+        notify_write("products", "create", [pid.upper()])
         return "Product created successfully."
     except Error as err:
         return f"Error: {err.msg}"
@@ -35,6 +46,7 @@ def update_product(pid, new_name, new_price):
     try:
         cursor.callproc("UpdateProduct", [pid.upper(), new_name, new_price])
         conn.commit()
+        notify_write("products", "update", [pid.upper()])
         return "Product updated successfully."
     except Error as err:
         return f"Error: {err.msg}"
@@ -48,6 +60,7 @@ def delete_product(pid):
     try:
         cursor.callproc("DeleteProduct", [pid.upper()])
         conn.commit()
+        notify_write("products", "delete", [pid.upper()])
         return "Product deleted successfully."
     except Error as err:
         return f"Error: {err.msg}"
@@ -55,14 +68,76 @@ def delete_product(pid):
         cursor.close()
         conn.close()
 
-def get_all_products():
+def get_all_products(row_format='dict'):
+    row_type = resolve_row_type(row_format, Product)
     conn = get_connection()
-    cursor = conn.cursor(dictionary=True)
+    cursor = conn.cursor(dictionary=row_type is None)
     try:
-        cursor.execute("SELECT * FROM products ORDER BY ProductID")
-        return cursor.fetchall()
+        columns = row_type.COLUMNS if row_type is not None else "*"
+        cursor.execute(f"SELECT {columns} FROM products ORDER BY ProductID")
+        rows = cursor.fetchall()
+        return rows if row_type is None else [row_type._make(row) for row in rows]
     except Error:
         return []
     finally:
         cursor.close()
-        conn.close()
\ No newline at end of file
+        conn.close()
+
+def get_products_page(page_size=50, after=None, before=None, name=None,
+                      min_price=None, max_price=None, with_total=False, row_format='dict'):
+    """One page of products ordered by ProductID (keyset pagination).
+
+    after/before: ProductID of the last/first row of the neighbouring page.
+    name, min_price, max_price: optional filters.
+    """
+    conditions = []
+    if name:
+        conditions.append(("ProductName LIKE %s", [f"%{name}%"]))
+    if min_price is not None:
+        conditions.append(("Price >= %s", [min_price]))
+    if max_price is not None:
+        conditions.append(("Price <= %s", [max_price]))
+    try:
+        return fetch_page("products", ["ProductID"], page_size, after, before, conditions, with_total,
+                          resolve_row_type(row_format, Product))
+    except Error:
+        return empty_page()
+
+def iter_products(chunk_size=1000, row_format='dict', conn=None):
+    """Yield all products ordered by ProductID without loading them into memory (on ``conn`` if given)"""
+    row_type = resolve_row_type(row_format, Product)
+    columns = row_type.COLUMNS if row_type is not None else "*"
+    return stream_rows(f"SELECT {columns} FROM products ORDER BY ProductID", chunk_size=chunk_size,
+                       row_type=row_type, conn=conn)
+
+def create_products_bulk(rows, batch_size=1000):
+    """Create many products in one transaction.
+
+    rows: iterable of (pid, pname, price). Rows are validated like
+    CreateProduct; invalid ones are skipped and reported as
+    (row index, message). Returns {'inserted': count, 'errors': [...]}.
+    """
+    errors, valid, seen = [], [], set()
+    for index, (pid, pname, price) in enumerate(rows):
+        pid = (pid or '').strip().upper()
+        pname = (pname or '').strip()
+        try:
+            price = Decimal(str(price)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+        except (InvalidOperation, ValueError):
+            price = None
+        if not PRODUCT_ID_PATTERN.match(pid):
+            errors.append((index, "Invalid ProductID format. Expected P#########"))
+        elif not pname:
+            errors.append((index, "ProductName cannot be empty"))
+        elif price is None or price <= 0:
+            errors.append((index, "Price must be greater than 0"))
+        elif price > MAX_PRICE:
+            errors.append((index, "Price is too large"))
+        elif pid in seen:
+            errors.append((index, "Duplicate ProductID in batch"))
+        else:
+            seen.add(pid)
+            valid.append((index, (pid, pname, price)))
+
+    return bulk_create("products", ["ProductID", "ProductName", "Price"], valid, errors,
+                       duplicate_message="ProductID already exists", batch_size=batch_size)
@@ -1,6 +1,13 @@
 from app.db.connection import get_connection
+from app.db.bulk import bulk_create
+from app.db.events import notify_write
+from app.db.pagination import fetch_page, empty_page
+from app.db.streaming import stream_rows
+from app.models.rows import OrderLine, resolve_row_type
 from mysql.connector import Error
 
+MAX_QUANTITY = 65535  # SMALLINT UNSIGNED
+
 # ==================== QUANTITY ====================
 
 def create_quantity(oid, pid, quantity):
@@ -9,6 +16,7 @@ def create_quantity(oid, pid, quantity):
     try:
         cursor.callproc("CreateQuantity", [oid.upper(), pid.upper(), quantity])
         conn.commit()
+        notify_write("quantities", "create", [(oid.upper(), pid.upper())])
         return "Quantity created successfully."
     except Error as err:
         return f"Error: {err.msg}"
@@ -35,6 +43,7 @@ def update_quantity(oid, pid, new_quantity):
     try:
         cursor.callproc("UpdateQuantity", [oid.upper(), pid.upper(), new_quantity])
         conn.commit()
+        notify_write("quantities", "update", [(oid.upper(), pid.upper())])
         return "Quantity updated successfully."
     except Error as err:
         return f"Error: {err.msg}"
@@ -48,6 +57,7 @@ def delete_quantity(oid, pid):
     try:
         cursor.callproc("DeleteQuantity", [oid.upper(), pid.upper()])
         conn.commit()
+        notify_write("quantities", "delete", [(oid.upper(), pid.upper())])
         return "Quantity deleted successfully."
     except Error as err:
         return f"Error: {err.msg}"
@@ -55,14 +65,75 @@ def delete_quantity(oid, pid):
         cursor.close()
         conn.close()
 
-def get_all_quantities():
+def get_all_quantities(row_format='dict'):
+    row_type = resolve_row_type(row_format, OrderLine)
     conn = get_connection()
-    cursor = conn.cursor(dictionary=True)
+    cursor = conn.cursor(dictionary=row_type is None)
     try:
-        cursor.execute("SELECT * FROM quantities ORDER BY OrderID")
-        return cursor.fetchall()
+        columns = row_type.COLUMNS if row_type is not None else "*"
+        cursor.execute(f"SELECT {columns} FROM quantities ORDER BY OrderID")
+        rows = cursor.fetchall()
+        return rows if row_type is None else [row_type._make(row) for row in rows]
     except Error:
         return []
     finally:
         cursor.close()
-        conn.close()
\ No newline at end of file
+        conn.close()
+
+def get_quantities_page(page_size=50, after=None, before=None, order_id=None,
+                        product_id=None, with_total=False, row_format='dict'):
+    """One page of order lines ordered by (OrderID, ProductID) (keyset pagination).
+
+    after/before: (OrderID, ProductID) of the last/first row of the
+    neighbouring page. order_id, product_id: optional filters.
+    """
+    conditions = []
+    if order_id:
+        conditions.append(("OrderID = %s", [order_id.upper()]))
+    if product_id:
+        conditions.append(("ProductID = %s", [product_id.upper()]))
+    try:
+        return fetch_page("quantities", ["OrderID", "ProductID"], page_size, after, before,
+                          conditions, with_total,
+                          resolve_row_type(row_format, OrderLine))
+    except Error:
+        return empty_page()
+
+def iter_quantities(chunk_size=1000, row_format='dict', conn=None):
+    """Yield all order lines ordered by OrderID, ProductID without loading them into memory (on ``conn`` if given)"""
+    row_type = resolve_row_type(row_format, OrderLine)
+    columns = row_type.COLUMNS if row_type is not None else "*"
+    return stream_rows(f"SELECT {columns} FROM quantities ORDER BY OrderID, ProductID", chunk_size=chunk_size,
+                       row_type=row_type, conn=conn)
+
+def create_quantities_bulk(rows, batch_size=1000):
+    """Create many order lines in one transaction.
+
+    rows: iterable of (oid, pid, quantity). Rows are validated like
+    CreateQuantity, with order and product existence checked for the whole
+    batch at once; invalid ones are skipped and reported as
+    (row index, message). Returns {'inserted': count, 'errors': [...]}.
+    """
+    errors, valid, seen = [], [], set()
+    for index, (oid, pid, quantity) in enumerate(rows):
+        oid = (oid or '').strip().upper()
+        pid = (pid or '').strip().upper()
+        try:
+            quantity = int(quantity)
+        except (TypeError, ValueError):
+            quantity = 0
+        if quantity <= 0:
+            errors.append((index, "Quantity must be greater than 0"))
+        elif quantity > MAX_QUANTITY:
+            errors.append((index, f"Quantity cannot exceed {MAX_QUANTITY}"))
+        elif (oid, pid) in seen:
+            errors.append((index, "Duplicate Order/Product combination in batch"))
+        else:
+            seen.add((oid, pid))
+            valid.append((index, (oid, pid, quantity)))
+
+    return bulk_create("quantities", ["OrderID", "ProductID", "Quantity"], valid, errors, key_size=2,
+                       duplicate_message="This Order/Product combination already exists",
+                       references=[(0, "orders", "OrderID", "OrderID does not exist"),
+                                   (1, "products", "ProductID", "ProductID does not exist")],
+                       batch_size=batch_size)
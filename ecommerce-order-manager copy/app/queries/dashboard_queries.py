@@ -14,19 +14,61 @@ GET_REVENUE_TO_DATE = """
     WHERE o.OrderStatus = 'Delivered'
 """
 
+# Every KPI in one statement: one round trip, and InnoDB evaluates all
+# subqueries against the same read view, so the numbers agree with each other
+GET_KPI_SNAPSHOT = """
+    SELECT
+        (SELECT COUNT(*) FROM customers) as total_customers,
+        (SELECT COUNT(*) FROM products) as total_products,
+        (SELECT JSON_ARRAYAGG(JSON_OBJECT('OrderStatus', s.OrderStatus, 'count', s.count))
+         FROM (SELECT OrderStatus, COUNT(*) as count FROM orders GROUP BY OrderStatus) s
+        ) as orders_by_status,
+        (SELECT SUM(q.Quantity * p.Price)
+         FROM quantities q
+         JOIN products p ON q.ProductID = p.ProductID
+         JOIN orders o ON q.OrderID = o.OrderID
+         WHERE o.OrderStatus = 'Delivered'
+        ) as revenue_to_date
+"""
+
 # Chart Queries
+# OrderDate is a DATE and OrderWeek/OrderMonth are indexed generated columns
+# (migration 0003), so every period groups on an index of (OrderStatus, bucket)
 GET_REVENUE_BY_DAY = """
-    SELECT DATE(o.OrderDate) as date, SUM(q.Quantity * p.Price) as revenue
+    SELECT o.OrderDate as date, SUM(q.Quantity * p.Price) as revenue
     FROM quantities q
     JOIN products p ON q.ProductID = p.ProductID
     JOIN orders o ON q.OrderID = o.OrderID
     WHERE o.OrderStatus = 'Delivered'
-    GROUP BY DATE(o.OrderDate)
+    GROUP BY o.OrderDate
     ORDER BY date DESC
     LIMIT 30
 """
 
 GET_REVENUE_BY_WEEK = """
+    SELECT o.OrderWeek as week, SUM(q.Quantity * p.Price) as revenue
+    FROM quantities q
+    JOIN products p ON q.ProductID = p.ProductID
+    JOIN orders o ON q.OrderID = o.OrderID
+    WHERE o.OrderStatus = 'Delivered'
+    GROUP BY o.OrderWeek
+    ORDER BY week DESC
+    LIMIT 12
+"""
+
+GET_REVENUE_BY_MONTH = """
+    SELECT o.OrderMonth as month, SUM(q.Quantity * p.Price) as revenue
+    FROM quantities q
+    JOIN products p ON q.ProductID = p.ProductID
+    JOIN orders o ON q.OrderID = o.OrderID
+    WHERE o.OrderStatus = 'Delivered'
+    GROUP BY o.OrderMonth
+    ORDER BY month DESC
+    LIMIT 12
+"""
+
+# Before migration 0003: week and month computed for every row
+GET_REVENUE_BY_WEEK_COMPUTED = """
     SELECT YEARWEEK(o.OrderDate) as week, SUM(q.Quantity * p.Price) as revenue
     FROM quantities q
     JOIN products p ON q.ProductID = p.ProductID
@@ -37,7 +79,7 @@ GET_REVENUE_BY_WEEK = """
     LIMIT 12
 """
 
-GET_REVENUE_BY_MONTH = """
+GET_REVENUE_BY_MONTH_COMPUTED = """
     SELECT DATE_FORMAT(o.OrderDate, '%Y-%m') as month, SUM(q.Quantity * p.Price) as revenue
     FROM quantities q
     JOIN products p ON q.ProductID = p.ProductID
@@ -59,17 +101,92 @@ GET_TOP_PRODUCTS_BY_REVENUE = """
     LIMIT %s
 """
 
+# Rollup Queries (daily_revenue, see app/db/migrations/0002_daily_revenue_rollup.sql)
+# Units > 0 matches the inner joins above: days whose orders have no lines are skipped
+GET_ROLLUP_ORDERS_BY_STATUS = """
+    SELECT OrderStatus, SUM(OrderCount) as count
+    FROM daily_revenue
+    GROUP BY OrderStatus
+    HAVING count > 0
+"""
+GET_ROLLUP_REVENUE_TO_DATE = """
+    SELECT SUM(Revenue) as revenue
+    FROM daily_revenue
+    WHERE OrderStatus = 'Delivered'
+"""
+
+GET_ROLLUP_REVENUE_BY_DAY = """
+    SELECT RevenueDate as date, Revenue as revenue
+    FROM daily_revenue
+    WHERE OrderStatus = 'Delivered' AND Units > 0
+    ORDER BY date DESC
+    LIMIT 30
+"""
+
+GET_ROLLUP_REVENUE_BY_WEEK = """
+    SELECT YEARWEEK(RevenueDate) as week, SUM(Revenue) as revenue
+    FROM daily_revenue
+    WHERE OrderStatus = 'Delivered' AND Units > 0
+    GROUP BY YEARWEEK(RevenueDate)
+    ORDER BY week DESC
+    LIMIT 12
+"""
+
+GET_ROLLUP_REVENUE_BY_MONTH = """
+    SELECT DATE_FORMAT(RevenueDate, '%Y-%m') as month, SUM(Revenue) as revenue
+    FROM daily_revenue
+    WHERE OrderStatus = 'Delivered' AND Units > 0
+    GROUP BY DATE_FORMAT(RevenueDate, '%Y-%m')
+    ORDER BY month DESC
+    LIMIT 12
+"""
+
+GET_ROLLUP_KPI_SNAPSHOT = """
+    SELECT
+        (SELECT COUNT(*) FROM customers) as total_customers,
+        (SELECT COUNT(*) FROM products) as total_products,
+        (SELECT JSON_ARRAYAGG(JSON_OBJECT('OrderStatus', s.OrderStatus, 'count', s.count))
+         FROM (SELECT OrderStatus, SUM(OrderCount) as count
+               FROM daily_revenue
+               GROUP BY OrderStatus
+               HAVING count > 0) s
+        ) as orders_by_status,
+        (SELECT SUM(Revenue) FROM daily_revenue WHERE OrderStatus = 'Delivered') as revenue_to_date
+"""
+
+REBUILD_DAILY_REVENUE = [
+    "DELETE FROM daily_revenue",
+    """
+    INSERT INTO daily_revenue (RevenueDate, OrderStatus, Revenue, Units, OrderCount)
+    SELECT o.OrderDate, o.OrderStatus, COALESCE(SUM(l.Revenue), 0), COALESCE(SUM(l.Units), 0), COUNT(*)
+    FROM orders o
+    LEFT JOIN (
+        SELECT q.OrderID, SUM(q.Quantity * p.Price) AS Revenue, SUM(q.Quantity) AS Units
+        FROM quantities q
+        JOIN products p ON q.ProductID = p.ProductID
+        GROUP BY q.OrderID
+    ) l ON l.OrderID = o.OrderID
+    GROUP BY o.OrderDate, o.OrderStatus
+    """,
+]
+
 # Search Queries
+# Pages of matches in primary-key order (LIMIT %s OFFSET %s); walking the key
+# stops as soon as a page is full instead of collecting every match
 SEARCH_CUSTOMERS = """
     SELECT CustomerID, CustomerName 
     FROM customers 
     WHERE CustomerName LIKE %s
+    ORDER BY CustomerID
+    LIMIT %s OFFSET %s
 """
 
 SEARCH_PRODUCTS = """
     SELECT ProductID, ProductName, Price 
     FROM products 
     WHERE ProductName LIKE %s
+    ORDER BY ProductID
+    LIMIT %s OFFSET %s
 """
 
 SEARCH_ORDERS = """
@@ -77,8 +194,194 @@ SEARCH_ORDERS = """
     FROM orders o
     JOIN customers c ON o.CustomerID = c.CustomerID
     WHERE o.OrderID LIKE %s OR c.CustomerName LIKE %s
+    ORDER BY o.OrderID
+    LIMIT %s OFFSET %s
+"""
+
+# Match counts, capped: the last parameter is one more than the largest count reported
+COUNT_SEARCH_CUSTOMERS = """
+    SELECT COUNT(*) AS Total
+    FROM (SELECT 1 FROM customers WHERE CustomerName LIKE %s LIMIT %s) AS matches
+"""
+
+COUNT_SEARCH_PRODUCTS = """
+    SELECT COUNT(*) AS Total
+    FROM (SELECT 1 FROM products WHERE ProductName LIKE %s LIMIT %s) AS matches
+"""
+
+COUNT_SEARCH_ORDERS = """
+    SELECT COUNT(*) AS Total
+    FROM (
+        SELECT 1
+        FROM orders o
+        JOIN customers c ON o.CustomerID = c.CustomerID
+        WHERE o.OrderID LIKE %s OR c.CustomerName LIKE %s
+        LIMIT %s
+    ) AS matches
+"""
+
+# Fulltext search (migration 0004); {match} is MATCH(...) AGAINST (%s IN <mode>),
+# repeated in ORDER BY so rows come back by relevance. Every paged query ends
+# its ORDER BY with the primary key: equal scores or dates would otherwise come
+# back in any order, and separately queried pages could repeat or skip rows
+SEARCH_CUSTOMERS_FULLTEXT = """
+    SELECT CustomerID, CustomerName
+    FROM customers
+    WHERE {match}
+    ORDER BY {match} DESC, CustomerID
+    LIMIT %s OFFSET %s
+"""
+
+SEARCH_PRODUCTS_FULLTEXT = """
+    SELECT ProductID, ProductName, Price
+    FROM products
+    WHERE {match}
+    ORDER BY {match} DESC, ProductID
+    LIMIT %s OFFSET %s
+"""
+
+# Orders of the best-matching customers, newest first
+SEARCH_ORDERS_FULLTEXT = """
+    SELECT o.OrderID, c.CustomerName, o.OrderDate, o.OrderStatus
+    FROM customers c
+    JOIN orders o ON o.CustomerID = c.CustomerID
+    WHERE {match}
+    ORDER BY {match} DESC, o.OrderDate DESC, o.OrderID DESC
+    LIMIT %s
+"""
+
+COUNT_CUSTOMERS_FULLTEXT = """
+    SELECT COUNT(*) AS Total
+    FROM (SELECT 1 FROM customers WHERE {match} LIMIT %s) AS matches
 """
 
+COUNT_PRODUCTS_FULLTEXT = """
+    SELECT COUNT(*) AS Total
+    FROM (SELECT 1 FROM products WHERE {match} LIMIT %s) AS matches
+"""
+
+COUNT_ORDERS_FULLTEXT = """
+    SELECT COUNT(*) AS Total
+    FROM (
+        SELECT 1
+        FROM customers c
+        JOIN orders o ON o.CustomerID = c.CustomerID
+        WHERE {match}
+        LIMIT %s
+    ) AS matches
+"""
+
+# Rows whose ID starts with the term (a range scan of the primary key)
+SEARCH_CUSTOMERS_BY_ID_PREFIX = """
+    SELECT CustomerID, CustomerName
+    FROM customers
+    WHERE CustomerID LIKE %s
+    ORDER BY CustomerID
+    LIMIT %s OFFSET %s
+"""
+
+SEARCH_PRODUCTS_BY_ID_PREFIX = """
+    SELECT ProductID, ProductName, Price
+    FROM products
+    WHERE ProductID LIKE %s
+    ORDER BY ProductID
+    LIMIT %s OFFSET %s
+"""
+
+SEARCH_ORDERS_BY_ID_PREFIX = """
+    SELECT o.OrderID, c.CustomerName, o.OrderDate, o.OrderStatus
+    FROM orders o
+    JOIN customers c ON o.CustomerID = c.CustomerID
+    WHERE o.OrderID LIKE %s
+    ORDER BY o.OrderID
+    LIMIT %s OFFSET %s
+"""
+
+COUNT_CUSTOMERS_BY_ID_PREFIX = """
+    SELECT COUNT(*) AS Total
+    FROM (SELECT 1 FROM customers WHERE CustomerID LIKE %s LIMIT %s) AS matches
+"""
+
+COUNT_PRODUCTS_BY_ID_PREFIX = """
+    SELECT COUNT(*) AS Total
+    FROM (SELECT 1 FROM products WHERE ProductID LIKE %s LIMIT %s) AS matches
+"""
+
+COUNT_ORDERS_BY_ID_PREFIX = """
+    SELECT COUNT(*) AS Total
+    FROM (SELECT 1 FROM orders WHERE OrderID LIKE %s LIMIT %s) AS matches
+"""
+
+# Exact order ID: the order with its customer (if any) and its lines, all by primary key
+GET_ORDER_WITH_CUSTOMER = """
+    SELECT o.OrderID, o.CustomerID, c.CustomerName, o.OrderDate, o.OrderStatus
+    FROM orders o
+    LEFT JOIN customers c ON o.CustomerID = c.CustomerID
+    WHERE o.OrderID = %s
+"""
+
+GET_ORDER_LINES = """
+    SELECT q.ProductID, p.ProductName, q.Quantity, p.Price, q.Quantity * p.Price AS LineTotal
+    FROM quantities q
+    JOIN products p ON q.ProductID = p.ProductID
+    WHERE q.OrderID = %s
+    ORDER BY q.ProductID
+"""
+
+# Rows for keys found by the search index ({keys} is a list of placeholders)
+SEARCH_CUSTOMERS_BY_ID = """
+    SELECT CustomerID, CustomerName
+    FROM customers
+    WHERE CustomerID IN ({keys})
+"""
+
+SEARCH_PRODUCTS_BY_ID = """
+    SELECT ProductID, ProductName, Price
+    FROM products
+    WHERE ProductID IN ({keys})
+"""
+
+SEARCH_ORDERS_BY_ID = """
+    SELECT o.OrderID, c.CustomerName, o.OrderDate, o.OrderStatus
+    FROM orders o
+    JOIN customers c ON o.CustomerID = c.CustomerID
+    WHERE o.OrderID IN ({keys})
+"""
+
+# Newest orders of the matched customers (idx_orders_customer_date)
+SEARCH_ORDERS_BY_CUSTOMER = """
+    SELECT o.OrderID, c.CustomerName, o.OrderDate, o.OrderStatus
+    FROM orders o
+    JOIN customers c ON o.CustomerID = c.CustomerID
+    WHERE o.CustomerID IN ({keys})
+    ORDER BY o.OrderDate DESC, o.OrderID DESC
+    LIMIT %s
+"""
+
+COUNT_ORDERS_BY_CUSTOMER = """
+    SELECT COUNT(*) AS Total
+    FROM (SELECT 1 FROM orders WHERE CustomerID IN ({keys}) LIMIT %s) AS matches
+"""
+
+# Orders with their stored total and item count (migration 0005); filters on
+# status, date and total are appended as WHERE conditions
+FILTER_ORDERS = """
+    SELECT 
+        o.OrderID,
+        c.CustomerName,
+        o.OrderDate,
+        o.OrderStatus,
+        o.OrderTotal as TotalAmount,
+        o.ItemCount
+    FROM orders o
+    JOIN customers c ON o.CustomerID = c.CustomerID
+    WHERE o.ItemCount > 0
+"""
+
+# Whether a migration is recorded; 0007 (or backfill_order_totals) fills in the stored totals
+GET_MIGRATION_APPLIED = "SELECT 1 FROM schema_migrations WHERE Version = %s"
+
+# Before migration 0005: totals aggregated from the order lines
 FILTER_ORDERS_BASE = """
     SELECT 
         o.OrderID,
@@ -90,4 +393,10 @@ FILTER_ORDERS_BASE = """
     JOIN customers c ON o.CustomerID = c.CustomerID
     JOIN quantities q ON o.OrderID = q.OrderID
     JOIN products p ON q.ProductID = p.ProductID
+"""
+
+# Matches of a filter ({query} is its FILTER_ORDERS or grouped FILTER_ORDERS_BASE query)
+COUNT_FILTERED_ORDERS = """
+    SELECT COUNT(*) AS Total
+    FROM ({query} LIMIT %s) AS matches
 """
\ No newline at end of file
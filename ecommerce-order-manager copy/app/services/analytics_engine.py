@@ -0,0 +1,448 @@
+# analytics_engine.py
+"""In-process columnar copy of orders, order lines and prices.
+
+Orders, lines and product prices are loaded once into NumPy arrays with
+integer-coded IDs, dates as days since 1970-01-01 and prices as integer
+cents. Dashboard aggregates and the sales report are then vectorized
+group-bys over those arrays instead of three-way joins in MySQL. Writes
+reported through app.db.events are applied on the next query by
+re-reading only the affected rows. Other clients' writes raise no events,
+so everything is reloaded once the copy is FULL_RELOAD_SECONDS old.
+
+NumPy is optional; without it get_engine() returns None and callers keep
+using SQL.
+"""
+import threading
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from app.db.connection import get_connection
+from app.db.events import subscribe
+from app.models.order_model import iter_orders
+from app.models.product_model import iter_products
+from app.models.quantity_model import iter_quantities
+from app.models.rows import Order, OrderLine, Product
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+EPOCH = date(1970, 1, 1)
+STATUSES = ('Pending', 'Shipped', 'Delivered', 'Cancelled')
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+DELIVERED = STATUS_CODES['Delivered']
+MISSING = -1  # status of an order code whose order no longer exists
+
+# Above this many changed keys a table is reloaded instead of patched
+FULL_RELOAD_KEYS = 50000
+KEY_BATCH = 1000
+FULL_RELOAD_SECONDS = 600
+PERIOD_LIMITS = {'day': 30, 'week': 12, 'month': 12}
+
+
+def yearweek(day):
+    """Python equivalent of MySQL YEARWEEK(day): weeks start on Sunday, week 1 holds the first Sunday"""
+    year = day.year
+    while True:
+        jan1 = date(year, 1, 1)
+        first_sunday = jan1 + timedelta(days=(6 - jan1.weekday()) % 7)
+        if day >= first_sunday:
+            return year * 100 + (day - first_sunday).days // 7 + 1
+        year -= 1
+
+
+def _money(cents):
+    return Decimal(int(cents)).scaleb(-2)
+
+
+def _grown(array, size, fill=0):
+    """Return ``array`` extended to ``size`` entries, new ones set to ``fill``"""
+    if len(array) >= size:
+        return array
+    extra = np.full(size - len(array), fill, dtype=array.dtype)
+    return np.concatenate([array, extra])
+
+
+class _Codes:
+    """Dense integer codes for string IDs; a code never changes once assigned"""
+
+    def __init__(self):
+        self.ids = []
+        self.index = {}
+
+    def code(self, key):
+        code = self.index.get(key)
+        if code is None:
+            code = self.index[key] = len(self.ids)
+            self.ids.append(key)
+        return code
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class AnalyticsEngine:
+    """Columnar copy of the order history with vectorized dashboard aggregates"""
+
+    def __init__(self):
+        self._lock = threading.RLock()          # held while loading or computing
+        self._pending_lock = threading.Lock()   # guards _pending only, so writers never wait
+        self._pending = {}                      # table -> set of keys, or None for a full reload
+        self._loaded = False
+        self._loaded_at = 0.0
+        self.stats = {'full_loads': 0, 'refreshes': 0, 'load_seconds': 0.0, 'refresh_seconds': 0.0}
+        self._reset()
+
+    def _reset(self):
+        self.customer_count = 0
+        self.products = _Codes()
+        self.product_names = []
+        self.price_cents = np.zeros(0, dtype=np.int64)
+        self.product_exists = np.zeros(0, dtype=bool)
+        self.orders = _Codes()
+        self.order_day = np.zeros(0, dtype=np.int32)
+        self.order_status = np.zeros(0, dtype=np.int8)
+        self.line_order = np.zeros(0, dtype=np.int32)
+        self.line_product = np.zeros(0, dtype=np.int32)
+        self.line_qty = np.zeros(0, dtype=np.int64)
+
+    # --- keeping up with writes -------------------------------------------
+
+    def on_write(self, table, action, keys):
+        """Write listener: remember what changed; applied by the next refresh()"""
+        if table == 'customers':
+            self._mark('customers', None)
+            if action == 'delete':
+                # Deleting a customer deletes their orders and, by cascade, the lines
+                self._mark('orders', None)
+                self._mark('quantities', None)
+        elif table in ('products', 'orders', 'quantities') and keys is not None:
+            self._mark(table, keys)
+        else:
+            for name in ('customers', 'products', 'orders', 'quantities'):
+                self._mark(name, None)
+
+    def _mark(self, table, keys):
+        with self._pending_lock:
+            if keys is None or (table in self._pending and self._pending[table] is None):
+                self._pending[table] = None
+                return
+            changed = self._pending.setdefault(table, set())
+            changed.update(keys)
+            if len(changed) > FULL_RELOAD_KEYS:
+                self._pending[table] = None
+
+    def refresh(self):
+        """Load everything on first use, then apply the writes seen since the last call"""
+        with self._lock:
+            started = time.perf_counter()
+            with self._pending_lock:
+                pending, self._pending = self._pending, {}
+            if self._loaded and time.monotonic() - self._loaded_at > FULL_RELOAD_SECONDS:
+                self._loaded = False
+            if not self._loaded:
+                self._reset()
+                self._load_all()
+                self._loaded = True
+                self._loaded_at = time.monotonic()
+                self.stats['full_loads'] += 1
+                self.stats['load_seconds'] = time.perf_counter() - started
+                return
+            if not pending:
+                return
+            # Parents first, so new lines find their order and product
+            for table in ('customers', 'products', 'orders', 'quantities'):
+                if table in pending:
+                    keys = pending[table]
+                    getattr(self, f"_load_{table}")(None if keys is None else list(keys))
+            self.stats['refreshes'] += 1
+            self.stats['refresh_seconds'] = time.perf_counter() - started
+
+    def _load_all(self):
+        """Read every table from one consistent snapshot, so each line's order and product are read too"""
+        conn = get_connection()
+        try:
+            conn.start_transaction(consistent_snapshot=True, isolation_level='REPEATABLE READ', readonly=True)
+            for table in ('customers', 'products', 'orders', 'quantities'):
+                getattr(self, f"_load_{table}")(None, conn)
+            conn.commit()
+        except Exception:
+            conn.discard()
+            raise
+        conn.close()
+
+    def _fit(self):
+        """Size the per-order and per-product arrays to every code handed out, so no line indexes past them"""
+        self.order_day = _grown(self.order_day, len(self.orders))
+        self.order_status = _grown(self.order_status, len(self.orders), MISSING)
+        self.price_cents = _grown(self.price_cents, len(self.products))
+        self.product_exists = _grown(self.product_exists, len(self.products), False)
+        self.product_names.extend([None] * (len(self.products) - len(self.product_names)))
+
+    def _fetch(self, table, row_type, key_columns, keys):
+        """Read the rows of ``table`` whose key is in ``keys``"""
+        if len(key_columns) == 1:
+            template, column_list = "%s", key_columns[0]
+        else:
+            template = "(" + ", ".join(["%s"] * len(key_columns)) + ")"
+            column_list = "(" + ", ".join(key_columns) + ")"
+        rows = []
+        conn = get_connection()
+        cursor = conn.cursor()
+        try:
+            for start in range(0, len(keys), KEY_BATCH):
+                chunk = keys[start:start + KEY_BATCH]
+                params = list(chunk) if len(key_columns) == 1 else [value for key in chunk for value in key]
+                cursor.execute(
+                    f"SELECT {row_type.COLUMNS} FROM {table} "
+                    f"WHERE {column_list} IN ({', '.join([template] * len(chunk))})",
+                    params
+                )
+                rows.extend(row_type._make(row) for row in cursor.fetchall())
+            return rows
+        finally:
+            cursor.close()
+            conn.close()
+
+    def _load_customers(self, keys, conn=None):
+        own = conn is None
+        if own:
+            conn = get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT COUNT(*) FROM customers")
+            self.customer_count = cursor.fetchone()[0]
+        finally:
+            cursor.close()
+            if own:
+                conn.close()
+
+    def _load_products(self, keys, conn=None):
+        if keys is None:
+            rows = iter_products(row_format='object', conn=conn)
+        else:
+            rows = self._fetch("products", Product, ("ProductID",), keys)
+
+        codes, cents, names = [], [], []
+        for row in rows:
+            codes.append(self.products.code(row.ProductID))
+            cents.append(int(row.Price * 100))
+            names.append(row.ProductName)
+
+        size = len(self.products)
+        self.price_cents = _grown(self.price_cents, size)
+        self.product_exists = _grown(self.product_exists, size, False)
+        self.product_names.extend([None] * (size - len(self.product_names)))
+        if keys is None:
+            self.product_exists[:] = False
+        else:
+            # Keys that are no longer found were deleted
+            self.product_exists[[self.products.index[key] for key in keys if key in self.products.index]] = False
+
+        codes = np.array(codes, dtype=np.int64)
+        self.price_cents[codes] = cents
+        self.product_exists[codes] = True
+        for code, name in zip(codes.tolist(), names):
+            self.product_names[code] = name
+
+    def _load_orders(self, keys, conn=None):
+        if keys is None:
+            rows = iter_orders(row_format='object', conn=conn)
+        else:
+            rows = self._fetch("orders", Order, ("OrderID",), keys)
+
+        codes, days, statuses = [], [], []
+        for row in rows:
+            codes.append(self.orders.code(row.OrderID))
+            days.append((row.OrderDate - EPOCH).days)
+            statuses.append(STATUS_CODES[row.OrderStatus])
+
+        size = len(self.orders)
+        self.order_day = _grown(self.order_day, size)
+        self.order_status = _grown(self.order_status, size, MISSING)
+        if keys is None:
+            self.order_status[:] = MISSING
+            targets = None
+        else:
+            targets = np.array([self.orders.index[key] for key in keys if key in self.orders.index],
+                               dtype=np.int64)
+            self.order_status[targets] = MISSING
+
+        codes = np.array(codes, dtype=np.int64)
+        self.order_day[codes] = days
+        self.order_status[codes] = statuses
+
+        if targets is not None and len(targets):
+            # Lines of deleted orders were removed by ON DELETE CASCADE
+            deleted = targets[self.order_status[targets] == MISSING]
+            if len(deleted):
+                self._drop_lines(np.isin(self.line_order, deleted))
+
+    def _line_keys(self, orders, products):
+        return orders.astype(np.int64) << 32 | products.astype(np.int64)
+
+    def _drop_lines(self, mask):
+        keep = ~mask
+        self.line_order = self.line_order[keep]
+        self.line_product = self.line_product[keep]
+        self.line_qty = self.line_qty[keep]
+
+    def _load_quantities(self, keys, conn=None):
+        if keys is None:
+            rows = iter_quantities(row_format='object', conn=conn)
+        else:
+            rows = self._fetch("quantities", OrderLine, ("OrderID", "ProductID"), [tuple(key) for key in keys])
+            # Lines can arrive before their parents were seen (e.g. written in one transaction)
+            new_orders = list({row.OrderID for row in rows} - self.orders.index.keys())
+            new_products = list({row.ProductID for row in rows} - self.products.index.keys())
+            if new_products:
+                self._load_products(new_products)
+            if new_orders:
+                self._load_orders(new_orders)
+
+        orders, products, quantities = [], [], []
+        for row in rows:
+            orders.append(self.orders.code(row.OrderID))
+            products.append(self.products.code(row.ProductID))
+            quantities.append(row.Quantity)
+        orders = np.array(orders, dtype=np.int32)
+        products = np.array(products, dtype=np.int32)
+        quantities = np.array(quantities, dtype=np.int64)
+        # Parents deleted before they could be read keep MISSING status and price 0
+        self._fit()
+
+        if keys is None:
+            self.line_order, self.line_product, self.line_qty = orders, products, quantities
+            return
+
+        # Replace every changed line: drop the old copies, append what the database has now
+        changed = [(self.orders.index[oid], self.products.index[pid]) for oid, pid in keys
+                   if oid in self.orders.index and pid in self.products.index]
+        if changed:
+            changed = np.array(changed, dtype=np.int64)
+            wanted = self._line_keys(changed[:, 0], changed[:, 1])
+            self._drop_lines(np.isin(self._line_keys(self.line_order, self.line_product), wanted))
+        self.line_order = np.concatenate([self.line_order, orders])
+        self.line_product = np.concatenate([self.line_product, products])
+        self.line_qty = np.concatenate([self.line_qty, quantities])
+
+    # --- aggregates -------------------------------------------------------
+
+    def _line_revenue(self, mask=None):
+        """(order codes, product codes, revenue in cents) of all lines, or those selected by mask"""
+        orders, products, quantities = self.line_order, self.line_product, self.line_qty
+        if mask is not None:
+            orders, products, quantities = orders[mask], products[mask], quantities[mask]
+        return orders, products, quantities * self.price_cents[products]
+
+    def _delivered(self):
+        return self._line_revenue(self.order_status[self.line_order] == DELIVERED)
+
+    def kpis(self):
+        """Same shape as DashboardService.get_kpis()"""
+        self.refresh()
+        with self._lock:
+            _, _, revenue = self._delivered()
+            status = self.order_status[self.order_status != MISSING]
+            counts = np.bincount(status, minlength=len(STATUSES))
+            return {
+                'total_customers': self.customer_count,
+                'total_products': int(self.product_exists.sum()),
+                'orders_by_status': [{'OrderStatus': name, 'count': int(count)}
+                                     for name, count in zip(STATUSES, counts) if count],
+                'revenue_to_date': int(revenue.sum()) / 100,
+            }
+
+    def revenue_by_period(self, period='day'):
+        """Delivered revenue per day/week/month, newest first, like GET_REVENUE_BY_*"""
+        if period not in PERIOD_LIMITS:
+            period = 'month'
+        self.refresh()
+        with self._lock:
+            orders, _, revenue = self._delivered()
+            if not len(orders):
+                return []
+            days = self.order_day[orders]
+            first = int(days.min())
+            offsets = days - first
+            lines = np.bincount(offsets)
+            # float64 sums of integer cents are exact below 2**53 cents
+            totals = np.bincount(offsets, weights=revenue)
+
+        # Only days with lines are bucketed, so the Python part stays small
+        sums = {}
+        for offset in np.flatnonzero(lines).tolist():
+            day = EPOCH + timedelta(days=first + offset)
+            if period == 'day':
+                bucket = day
+            elif period == 'week':
+                bucket = yearweek(day)
+            else:
+                bucket = day.strftime('%Y-%m')
+            sums[bucket] = sums.get(bucket, 0) + int(round(totals[offset]))
+
+        column = {'day': 'date', 'week': 'week', 'month': 'month'}[period]
+        newest = sorted(sums, reverse=True)[:PERIOD_LIMITS[period]]
+        return [{column: bucket, 'revenue': _money(sums[bucket])} for bucket in newest]
+
+    def top_products(self, limit=10):
+        """Top products by delivered revenue, like GET_TOP_PRODUCTS_BY_REVENUE"""
+        self.refresh()
+        with self._lock:
+            _, products, revenue = self._delivered()
+            size = len(self.products)
+            totals = np.bincount(products, weights=revenue, minlength=size)
+            sold = np.flatnonzero(np.bincount(products, minlength=size))
+            best = sold[np.argsort(-totals[sold], kind='stable')][:limit]
+            return [{'ProductID': self.products.ids[code], 'ProductName': self.product_names[code],
+                     'revenue': _money(round(totals[code]))} for code in best.tolist()]
+
+    def sales_report(self):
+        """Rows of ExportService.export_sales_report, best-selling first.
+
+        Like the SQL report, lines of every order status are counted.
+        """
+        self.refresh()
+        with self._lock:
+            _, products, revenue = self._line_revenue()
+            size = len(self.products)
+            lines = np.bincount(products, minlength=size)
+            units = np.bincount(products, weights=self.line_qty, minlength=size)
+            totals = np.bincount(products, weights=revenue, minlength=size)
+            existing = np.flatnonzero(self.product_exists)
+            # Products without sales (NULL revenue) sort last, as in MySQL
+            order = np.lexsort((-totals[existing], lines[existing] == 0))
+            rows = []
+            for code in existing[order].tolist():
+                sold = lines[code] > 0
+                rows.append({
+                    'ProductID': self.products.ids[code],
+                    'ProductName': self.product_names[code],
+                    'Price': _money(self.price_cents[code]),
+                    'TotalSold': int(units[code]) if sold else None,
+                    'TotalRevenue': _money(round(totals[code])) if sold else None,
+                    'NumberOfOrders': int(lines[code]),
+                })
+            return rows
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def available():
+    """Whether NumPy is installed"""
+    return np is not None
+
+
+def get_engine():
+    """Return the shared engine, subscribed to model writes (None without NumPy)"""
+    global _engine
+    if np is None:
+        return None
+    with _engine_lock:
+        if _engine is None:
+            _engine = AnalyticsEngine()
+            subscribe(_engine.on_write)
+        return _engine
@@ -0,0 +1,126 @@
+# cache.py
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+def deep_sizeof(value, seen=None):
+    """Approximate bytes held by value and the containers/rows inside it"""
+    if seen is None:
+        seen = set()
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in value)
+    return size
+
+
+class TTLCache:
+    """Thread-safe, size-bounded LRU cache whose entries expire after a TTL.
+
+    Each entry can have its own TTL (seconds; None keeps it until evicted or
+    invalidated). Once max_entries is reached the least recently used entry
+    is evicted.
+    """
+
+    def __init__(self, max_entries=128, default_ttl=60):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._data = OrderedDict()  # key -> (value, stored_at, expires_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.generation = 0  # Bumped by every invalidate(); results computed across one are not stored
+
+    def get_entry(self, key):
+        """Return (value, stored_at) or None, counting a hit or miss"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and (entry[2] is None or entry[2] > time.monotonic()):
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[0], entry[1]
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return None
+
+    def get(self, key, default=None):
+        entry = self.get_entry(key)
+        return default if entry is None else entry[0]
+
+    def set(self, key, value, ttl=_MISSING, generation=None):
+        """Store value for key; with ``generation``, only if nothing was invalidated since"""
+        ttl = self.default_ttl if ttl is _MISSING else ttl
+        now = time.monotonic()
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return False
+            self._data[key] = (value, time.time(), None if ttl is None else now + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+            return True
+
+    def get_or_compute(self, key, compute, ttl=_MISSING):
+        """Return the cached value for key, computing and storing it on a miss.
+
+        compute() runs outside the lock; if an invalidation lands meanwhile the
+        value may predate the write behind it, so it is returned but not stored.
+        """
+        with self._lock:
+            generation = self.generation
+        entry = self.get_entry(key)
+        if entry is not None:
+            return entry[0]
+        value = compute()
+        self.set(key, value, ttl, generation)
+        return value
+
+    def stored_at(self, key):
+        """Wall-clock time the live entry for key was stored, or None (not counted as a hit)"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or (entry[2] is not None and entry[2] <= time.monotonic()):
+                return None
+            return entry[1]
+
+    def invalidate(self, predicate=None):
+        """Drop every entry, or those whose key satisfies predicate(key)"""
+        with self._lock:
+            self.generation += 1
+            keys = [key for key in self._data if predicate is None or predicate(key)]
+            for key in keys:
+                del self._data[key]
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def memory_bytes(self):
+        """Approximate memory held by the cached keys and values"""
+        with self._lock:
+            entries = [(key, entry[0]) for key, entry in self._data.items()]
+        seen = set()
+        return sum(deep_sizeof(key, seen) + deep_sizeof(value, seen) for key, value in entries)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._data),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
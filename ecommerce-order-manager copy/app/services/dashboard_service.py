@@ -1,35 +1,282 @@
+import json
+import os
+import re
+import time
+from datetime import date
+from decimal import Decimal
+from functools import partial
 from app.db.connection import get_connection
+from app.db.events import subscribe
+from app.db.pagination import keyset_condition
+from app.models.order_model import ORDER_STATUSES
 from app.queries.dashboard_queries import *
+from app.services.analytics_engine import get_engine
+from app.services.cache import TTLCache
+from app.services.search_index import get_index
+from mysql.connector import Error, errorcode
+
+# Queries per data source: 'rollup' reads the daily_revenue table kept current
+# by triggers (migration 0002), 'live' aggregates the full order history
+KPI_QUERIES = {
+    'live': {'total_customers': GET_TOTAL_CUSTOMERS, 'total_products': GET_TOTAL_PRODUCTS,
+             'orders_by_status': GET_ORDERS_BY_STATUS, 'revenue_to_date': GET_REVENUE_TO_DATE},
+    'rollup': {'total_customers': GET_TOTAL_CUSTOMERS, 'total_products': GET_TOTAL_PRODUCTS,
+               'orders_by_status': GET_ROLLUP_ORDERS_BY_STATUS, 'revenue_to_date': GET_ROLLUP_REVENUE_TO_DATE},
+}
+KPI_SNAPSHOT_QUERIES = {'live': GET_KPI_SNAPSHOT, 'rollup': GET_ROLLUP_KPI_SNAPSHOT}
+KPI_NAMES = ('total_customers', 'total_products', 'revenue_to_date', 'orders_by_status')
+REVENUE_QUERIES = {
+    'live': {'day': GET_REVENUE_BY_DAY, 'week': GET_REVENUE_BY_WEEK, 'month': GET_REVENUE_BY_MONTH},
+    # 'live' before migration 0003 added the OrderWeek/OrderMonth columns
+    'computed': {'day': GET_REVENUE_BY_DAY, 'week': GET_REVENUE_BY_WEEK_COMPUTED,
+                 'month': GET_REVENUE_BY_MONTH_COMPUTED},
+    'rollup': {'day': GET_ROLLUP_REVENUE_BY_DAY, 'week': GET_ROLLUP_REVENUE_BY_WEEK,
+               'month': GET_ROLLUP_REVENUE_BY_MONTH},
+}
+
+# Global search modes and their labels in the search screen: 'substring' finds
+# the term anywhere in a name (search index or LIKE), the fulltext modes use the
+# FULLTEXT indexes of migration 0004 and return the most relevant rows first,
+# 'fuzzy' ranks names by similarity to a possibly misspelled term (search index)
+SEARCH_MODES = {'substring': "Exact substring", 'fulltext': "Fulltext",
+                'prefix': "Fulltext, word prefixes", 'fuzzy': "Fuzzy (typos)"}
+SEARCH_FUZZY_CUSTOMERS = 50  # Best fuzzy customer matches whose orders are returned
+SEARCH_TABLES = ('customers', 'products', 'orders')
+SEARCH_COUNT_CAP = 1000        # Larger match counts are reported as "1000+"
+SEARCH_ORDER_CUSTOMERS = 1000  # Best-matching customers whose orders the index search returns
+# Substring (LIKE) queries per table: (page, capped count, times the pattern is used)
+LIKE_SEARCH = {
+    'customers': (SEARCH_CUSTOMERS, COUNT_SEARCH_CUSTOMERS, 1),
+    'products': (SEARCH_PRODUCTS, COUNT_SEARCH_PRODUCTS, 1),
+    'orders': (SEARCH_ORDERS, COUNT_SEARCH_ORDERS, 2),
+}
+FULLTEXT_SEARCH = {
+    'customers': (SEARCH_CUSTOMERS_FULLTEXT, COUNT_CUSTOMERS_FULLTEXT),
+    'products': (SEARCH_PRODUCTS_FULLTEXT, COUNT_PRODUCTS_FULLTEXT),
+    'orders': (SEARCH_ORDERS_FULLTEXT, COUNT_ORDERS_FULLTEXT),
+}
+FULLTEXT_MATCH = {
+    'customers': "MATCH(CustomerName) AGAINST (%s IN {mode})",
+    'products': "MATCH(ProductName) AGAINST (%s IN {mode})",
+    'orders': "MATCH(c.CustomerName) AGAINST (%s IN {mode})",
+}
+# filter_orders sort keys: the row columns orders are sorted by, ending in
+# OrderID so every order has its own position (the cursor of the next page is
+# the last row's values). All but 'customer' follow an orders index
+# (migrations 0001, 0005 and 0006), so a page reads little more than its rows.
+FILTER_SORTS = {
+    'date': ('OrderDate', 'OrderID'),
+    'total': ('TotalAmount', 'OrderID'),
+    'status': ('OrderStatus', 'OrderDate', 'OrderID'),
+    'customer': ('CustomerName', 'OrderID'),
+    'id': ('OrderID',),
+}
+# Row columns as FILTER_ORDERS and the grouped FILTER_ORDERS_BASE compute them
+FILTER_COLUMNS = {'OrderID': 'o.OrderID', 'OrderDate': 'o.OrderDate', 'OrderStatus': 'o.OrderStatus',
+                  'TotalAmount': 'o.OrderTotal', 'CustomerName': 'c.CustomerName'}
+FILTER_LINE_COLUMNS = dict(FILTER_COLUMNS, TotalAmount='SUM(q.Quantity * p.Price)')
+# ENUM sort columns and their values in the order MySQL sorts them (schema.sql)
+FILTER_ENUMS = {'o.OrderStatus': ORDER_STATUSES}
+ORDER_TOTALS_BACKFILL = '0007'  # Migration that fills in the stored totals of existing orders
+FILTER_COUNT_CAP = 10000  # Larger filter counts are reported as "10000+"
+# Search terms shaped like IDs (C/P/O and up to nine digits) are looked up by
+# primary key: a full ID is a point lookup, a shorter one a key range
+ID_SEARCH = re.compile(r'^([COP])([0-9]{1,9})$', re.IGNORECASE)
+ID_PREFIX_SEARCH = {
+    'C': ('customers', SEARCH_CUSTOMERS_BY_ID_PREFIX, COUNT_CUSTOMERS_BY_ID_PREFIX),
+    'P': ('products', SEARCH_PRODUCTS_BY_ID_PREFIX, COUNT_PRODUCTS_BY_ID_PREFIX),
+    'O': ('orders', SEARCH_ORDERS_BY_ID_PREFIX, COUNT_ORDERS_BY_ID_PREFIX),
+}
+# Characters with a meaning in boolean mode
+BOOLEAN_OPERATORS = re.compile(r'[+\-<>()~*"@]+')
+
+# Seconds each kind of dashboard result may be served from cache
+CACHE_TTLS = {'kpis': 30, 'revenue': 60, 'top_products': 120}
+
+# Cache groups affected by a write, by (table, action); anything not listed
+# (order and line writes, price changes, cascading deletes) clears every group
+WRITE_INVALIDATES = {
+    ('customers', 'create'): ('kpis',),
+    ('customers', 'update'): (),
+    ('products', 'create'): ('kpis',),
+    ('products', 'delete'): ('kpis',),
+}
+
+# Global search and order filter results (SearchService.cache): LRU, cleared
+# selectively by the model writes; the TTL only bounds how stale results can
+# get through writes made outside the application
+SEARCH_CACHE_SIZE = 256
+SEARCH_CACHE_TTL = 300
+# Search cache groups affected by a write, by (table, action); anything not
+# listed clears both. New customers and products have no orders yet; order
+# lines change order totals and the lines shown for a full order ID search.
+SEARCH_WRITE_INVALIDATES = {
+    ('customers', 'create'): ('search',),
+    ('products', 'create'): ('search',),
+}
+
+# Last complete dashboard, shown (marked stale) on the next start before the database is up
+SNAPSHOT_PATH = os.path.join("cache", "dashboard_snapshot.json")
+SNAPSHOT_KEYS = ('kpis', 'period', 'revenue', 'top_products', 'saved_at')
+
+def _snapshot_default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Cannot store {type(value).__name__} in the dashboard snapshot")
 
 class DashboardService:
+    # Read revenue from the daily_revenue rollup; switched off automatically
+    # if the rollup table has not been created yet
+    use_rollup = True
+    
+    # Group live revenue on the OrderWeek/OrderMonth columns; switched off
+    # automatically if migration 0003 has not added them yet
+    use_date_buckets = True
+    
+    # Fetch all KPIs with one statement (GET_KPI_SNAPSHOT) instead of one query each
+    kpi_snapshot = True
+    
+    # 'sql' aggregates in MySQL; 'columnar' uses the in-process analytics engine
+    # (app.services.analytics_engine), falling back to SQL if NumPy is missing
+    engine = os.getenv("DASHBOARD_ENGINE", "sql")
+    
+    # Results keyed by (group, *args); invalidated by the model write functions
+    cache = TTLCache(max_entries=32)
+    
+    @classmethod
+    def _cached(cls, key, compute):
+        return cls.cache.get_or_compute(key, compute, CACHE_TTLS[key[0]])
+    
+    @classmethod
+    def on_write(cls, table, action, keys):
+        """Write listener: drop the cached results the write can change"""
+        groups = WRITE_INVALIDATES.get((table, action))
+        if groups is None:
+            cls.cache.invalidate()
+        elif groups:
+            cls.cache.invalidate(lambda key: key[0] in groups)
+    
+    @classmethod
+    def invalidate(cls):
+        """Forget all cached dashboard data"""
+        cls.cache.invalidate()
+    
+    @classmethod
+    def data_age(cls, period='day', limit=10):
+        """Seconds since the oldest cached piece of the dashboard was queried (None if not cached)"""
+        if cls.kpi_snapshot:
+            keys = [('kpis', 'snapshot')]
+        else:
+            keys = [('kpis', name) for name in KPI_NAMES]
+        keys += [('revenue', period), ('top_products', limit)]
+        stamps = [cls.cache.stored_at(key) for key in keys]
+        if None in stamps:
+            return None
+        return time.time() - min(stamps)
+    
+    @classmethod
+    def cache_stats(cls):
+        """Hit/miss counters of the dashboard cache"""
+        return cls.cache.stats()
+    
+    @staticmethod
+    def save_snapshot(data):
+        """Persist dashboard data ({'kpis', 'period', 'revenue', 'top_products'}) for the next start"""
+        snapshot = dict(data, saved_at=time.time())
+        os.makedirs(os.path.dirname(SNAPSHOT_PATH), exist_ok=True)
+        # Write a temporary file first so a crash never leaves half a snapshot behind
+        temp_path = SNAPSHOT_PATH + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, default=_snapshot_default)
+        os.replace(temp_path, SNAPSHOT_PATH)
+    
+    @staticmethod
+    def load_snapshot():
+        """The last saved dashboard data, or None if there is no usable snapshot"""
+        try:
+            with open(SNAPSHOT_PATH, encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(snapshot, dict) or any(key not in snapshot for key in SNAPSHOT_KEYS):
+            return None
+        return snapshot
+    
+    @classmethod
+    def analytics(cls):
+        """The up-to-date analytics engine if the columnar engine is selected, else None"""
+        if cls.engine != 'columnar':
+            return None
+        analytics = get_engine()
+        if analytics is None:
+            print("Dashboard: NumPy is not installed, using SQL aggregates")
+            cls.engine = 'sql'
+            return None
+        return analytics
+    
+    @classmethod
+    def _with_source(cls, fetch):
+        """Run fetch(source) on the rollup, falling back to the live queries if it is missing"""
+        if cls.use_rollup:
+            try:
+                return fetch('rollup')
+            except Error as err:
+                if err.errno != errorcode.ER_NO_SUCH_TABLE:
+                    raise
+                cls.use_rollup = False
+        return fetch('live')
+    
     @staticmethod
     def get_kpis():
         """Get all KPIs for dashboard"""
+        # The engine is kept current by write events, so its results are not cached
+        analytics = DashboardService.analytics()
+        if analytics is not None:
+            return analytics.kpis()
+        if DashboardService.kpi_snapshot:
+            return DashboardService._cached(
+                ('kpis', 'snapshot'), lambda: DashboardService._with_source(DashboardService._get_kpi_snapshot))
+        return {name: DashboardService.get_kpi(name) for name in KPI_NAMES}
+    
+    @staticmethod
+    def get_kpi(name):
+        """Get a single KPI (one query), so dashboard cards can be loaded concurrently"""
+        if DashboardService.kpi_snapshot or DashboardService.engine == 'columnar':
+            return DashboardService.get_kpis()[name]
+        return DashboardService._cached(
+            ('kpis', name), lambda: DashboardService._with_source(lambda source: DashboardService._get_kpi(name, source)))
+    
+    @staticmethod
+    def _get_kpi(name, source):
         conn = get_connection()
         try:
             with conn.cursor(dictionary=True) as cursor:
-                # Total customers
-                cursor.execute(GET_TOTAL_CUSTOMERS)
-                total_customers = cursor.fetchone()['total_customers']
-                
-                # Total products
-                cursor.execute(GET_TOTAL_PRODUCTS)
-                total_products = cursor.fetchone()['total_products']
-                
-                # Orders by status
-                cursor.execute(GET_ORDERS_BY_STATUS)
-                orders_by_status = cursor.fetchall()
-                
-                # Revenue to date
-                cursor.execute(GET_REVENUE_TO_DATE)
-                revenue_result = cursor.fetchone()
-                revenue_to_date = revenue_result['revenue'] if revenue_result else 0
+                cursor.execute(KPI_QUERIES[source][name])
+                if name == 'orders_by_status':
+                    return cursor.fetchall()
                 
+                row = cursor.fetchone()
+                if name == 'revenue_to_date':
+                    # SUM() over no rows is NULL
+                    return float(row['revenue']) if row and row['revenue'] else 0
+                return row[name]
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def _get_kpi_snapshot(source):
+        conn = get_connection()
+        try:
+            with conn.cursor(dictionary=True) as cursor:
+                cursor.execute(KPI_SNAPSHOT_QUERIES[source])
+                row = cursor.fetchone()
                 return {
-                    'total_customers': total_customers,
-                    'total_products': total_products,
-                    'orders_by_status': orders_by_status,
-                    'revenue_to_date': float(revenue_to_date) if revenue_to_date else 0
+                    'total_customers': row['total_customers'],
+                    'total_products': row['total_products'],
+                    'orders_by_status': json.loads(row['orders_by_status'] or '[]'),
+                    'revenue_to_date': float(row['revenue_to_date']) if row['revenue_to_date'] else 0
                 }
         finally:
             conn.close()
@@ -37,77 +284,503 @@ class DashboardService:
     @staticmethod
     def get_revenue_by_period(period='day'):
         """Get revenue by day/week/month"""
+        analytics = DashboardService.analytics()
+        if analytics is not None:
+            return analytics.revenue_by_period(period)
+        
+        def fetch(source):
+            if source == 'live' and not DashboardService.use_date_buckets:
+                source = 'computed'
+            queries = REVENUE_QUERIES[source]
+            conn = get_connection()
+            try:
+                with conn.cursor(dictionary=True) as cursor:
+                    try:
+                        cursor.execute(queries.get(period, queries['month']))
+                    except Error as err:
+                        if source != 'live' or err.errno != errorcode.ER_BAD_FIELD_ERROR:
+                            raise
+                        DashboardService.use_date_buckets = False
+                        queries = REVENUE_QUERIES['computed']
+                        cursor.execute(queries.get(period, queries['month']))
+                    return cursor.fetchall()
+            finally:
+                conn.close()
+        
+        return DashboardService._cached(('revenue', period), lambda: DashboardService._with_source(fetch))
+    
+    @staticmethod
+    def rebuild_revenue_rollup():
+        """Recompute daily_revenue from scratch (repair job; triggers keep it current otherwise)"""
         conn = get_connection()
         try:
-            with conn.cursor(dictionary=True) as cursor:
-                if period == 'day':
-                    cursor.execute(GET_REVENUE_BY_DAY)
-                elif period == 'week':
-                    cursor.execute(GET_REVENUE_BY_WEEK)
-                else:  # month
-                    cursor.execute(GET_REVENUE_BY_MONTH)
-                
-                return cursor.fetchall()
+            with conn.cursor() as cursor:
+                for statement in REBUILD_DAILY_REVENUE:
+                    cursor.execute(statement)
+            conn.commit()
+            DashboardService.invalidate()
+        except Error:
+            conn.rollback()
+            raise
         finally:
             conn.close()
     
     @staticmethod
     def get_top_products_by_revenue(limit=10):
         """Get top N products by revenue"""
+        analytics = DashboardService.analytics()
+        if analytics is not None:
+            return analytics.top_products(limit)
+        
+        def fetch():
+            conn = get_connection()
+            try:
+                with conn.cursor(dictionary=True) as cursor:
+                    cursor.execute(GET_TOP_PRODUCTS_BY_REVENUE, (limit,))
+                    return cursor.fetchall()
+            finally:
+                conn.close()
+        
+        return DashboardService._cached(('top_products', limit), fetch)
+
+subscribe(DashboardService.on_write)
+
+class SearchService:
+    # Answer global search from the in-process trigram index (app.services.search_index);
+    # LIKE scans are used while the index is still being built
+    use_index = True
+    # Filter on the stored orders.OrderTotal (migration 0005) once the totals of
+    # existing orders are filled in (migration 0007); None until that is seen,
+    # False if the column has not been added yet
+    use_order_totals = None
+    
+    # Results keyed by ('search' | 'filter', *normalized arguments)
+    cache = TTLCache(max_entries=SEARCH_CACHE_SIZE, default_ttl=SEARCH_CACHE_TTL)
+    
+    @classmethod
+    def on_write(cls, table, action, keys):
+        """Write listener: drop the cached results the write can change"""
+        groups = SEARCH_WRITE_INVALIDATES.get((table, action))
+        if groups is None:
+            cls.cache.invalidate()
+        else:
+            cls.cache.invalidate(lambda key: key[0] in groups)
+    
+    @classmethod
+    def cache_stats(cls):
+        """Hit/miss counters and approximate memory ('bytes') of the result cache"""
+        stats = cls.cache.stats()
+        stats['bytes'] = cls.cache.memory_bytes()
+        return stats
+    
+    @staticmethod
+    def global_search(search_term, limit=100, mode='substring', offsets=None):
+        """Global search across customers, products, and orders.
+        
+        Returns a page of at most ``limit`` rows per table, starting at
+        ``offsets[table]`` (when given, only the tables in ``offsets`` are
+        searched), and under 'totals' the match count of every table searched
+        from offset 0 as (count, capped); capped counts mean "at least".
+        """
+        search_term = search_term.strip()
+        if offsets is None:
+            offsets = dict.fromkeys(SEARCH_TABLES, 0)
+        # Names compare case-insensitively in every mode, so the key ignores case
+        key = ('search', search_term.lower(), mode, limit, tuple(sorted(offsets.items())))
+        return SearchService.cache.get_or_compute(
+            key, lambda: SearchService._global_search(search_term, limit, mode, offsets))
+    
+    @staticmethod
+    def _global_search(search_term, limit, mode, offsets):
+        results = {table: [] for table in offsets}
+        results['totals'] = {}
+        
+        if ID_SEARCH.match(search_term):
+            search = SearchService._id_search
+        elif mode == 'fuzzy':
+            # Needs the index; waits for it on the first search after startup
+            search = partial(SearchService._fuzzy_search, get_index())
+        elif mode != 'substring':
+            search = SearchService._fulltext_search
+        else:
+            index = get_index(wait=False) if SearchService.use_index else None
+            if index is not None:
+                search = partial(SearchService._indexed_search, index)
+            else:
+                search = SearchService._like_search
+        
         conn = get_connection()
         try:
             with conn.cursor(dictionary=True) as cursor:
-                cursor.execute(GET_TOP_PRODUCTS_BY_REVENUE, (limit,))
-                return cursor.fetchall()
+                search(cursor, search_term, limit, mode, offsets, results)
+                return results
         finally:
             conn.close()
-
-class SearchService:
+    
+    @staticmethod
+    def _capped_count(cursor, query, params, cap=SEARCH_COUNT_CAP):
+        """(count, capped) from a COUNT query whose last parameter is its LIMIT"""
+        cursor.execute(query, tuple(params) + (cap + 1,))
+        total = cursor.fetchone()['Total']
+        return min(total, cap), total > cap
+    
     @staticmethod
-    def global_search(search_term):
-        """Global search across customers, products, and orders"""
+    def _total(cursor, rows, limit, query, params):
+        # A short first page already is the whole result
+        if len(rows) < limit:
+            return len(rows), False
+        return SearchService._capped_count(cursor, query, params)
+    
+    @staticmethod
+    def _merge_orders(by_id, by_customer, offset, limit):
+        """Page of order-ID matches followed by the other orders of matched customers"""
+        seen = {order['OrderID'] for order in by_id}
+        merged = by_id + [order for order in by_customer if order['OrderID'] not in seen]
+        return merged[offset:offset + limit]
+    
+    @staticmethod
+    def _like_search(cursor, search_term, limit, mode, offsets, results):
+        pattern = f"%{search_term}%"
+        for table, offset in offsets.items():
+            query, count_query, uses = LIKE_SEARCH[table]
+            params = (pattern,) * uses
+            cursor.execute(query, params + (limit, offset))
+            results[table] = cursor.fetchall()
+            if offset == 0:
+                results['totals'][table] = SearchService._total(cursor, results[table], limit, count_query, params)
+    
+    @staticmethod
+    def is_id_search(search_term):
+        """True for a term searched as a customer, product or order ID (or ID prefix)"""
+        return ID_SEARCH.match(search_term.strip()) is not None
+    
+    @staticmethod
+    def is_full_id(search_term):
+        """True for a complete customer, product or order ID such as O000000123"""
+        match = ID_SEARCH.match(search_term.strip())
+        return match is not None and len(match.group(2)) == 9
+    
+    @staticmethod
+    def _id_search(cursor, search_term, limit, mode, offsets, results):
+        """Primary-key lookups for ID-shaped terms, in every mode.
+        
+        A full order ID also returns the order's customer and its lines
+        (under 'lines'), a full customer ID the customer's newest orders.
+        """
+        search_term = search_term.upper()
+        table, query, count_query = ID_PREFIX_SEARCH[search_term[0]]
+        for other in offsets:
+            results['totals'][other] = (0, False)
+        
+        if not SearchService.is_full_id(search_term):
+            if table in offsets:
+                params = (search_term + "%",)
+                cursor.execute(query, params + (limit, offsets[table]))
+                results[table] = cursor.fetchall()
+                if offsets[table] == 0:
+                    results['totals'][table] = SearchService._total(cursor, results[table], limit, count_query, params)
+            return
+        
+        if table == 'orders':
+            cursor.execute(GET_ORDER_WITH_CUSTOMER, (search_term,))
+            order = cursor.fetchone()
+            if order is None:
+                return
+            customer_id = order.pop('CustomerID')
+            if offsets.get('orders') == 0:
+                results['orders'] = [order]
+                results['totals']['orders'] = (1, False)
+            if offsets.get('customers') == 0 and customer_id is not None:
+                results['customers'] = [{'CustomerID': customer_id, 'CustomerName': order['CustomerName']}]
+                results['totals']['customers'] = (1, False)
+            if offsets.get('orders') == 0:
+                cursor.execute(GET_ORDER_LINES, (search_term,))
+                results['lines'] = cursor.fetchall()
+            return
+        
+        if table == 'customers' and 'orders' in offsets:
+            # The customer's orders, newest first
+            offset = offsets['orders']
+            cursor.execute(SEARCH_ORDERS_BY_CUSTOMER.format(keys="%s"), (search_term, offset + limit))
+            results['orders'] = cursor.fetchall()[offset:]
+            if offset == 0:
+                results['totals']['orders'] = SearchService._total(
+                    cursor, results['orders'], limit, COUNT_ORDERS_BY_CUSTOMER.format(keys="%s"), (search_term,))
+        if offsets.get(table) == 0:
+            point_query = SEARCH_CUSTOMERS_BY_ID if table == 'customers' else SEARCH_PRODUCTS_BY_ID
+            cursor.execute(point_query.format(keys="%s"), (search_term,))
+            results[table] = cursor.fetchall()
+            results['totals'][table] = (len(results[table]), False)
+    
+    @staticmethod
+    def boolean_prefix_query(search_term):
+        """'anya mel' -> '+anya* +mel*': every word required, matched as a prefix"""
+        words = BOOLEAN_OPERATORS.sub(" ", search_term).split()
+        return " ".join(f"+{word}*" for word in words)
+    
+    @staticmethod
+    def _fulltext_search(cursor, search_term, limit, mode, offsets, results):
+        """Search with MATCH ... AGAINST in natural language ('fulltext') or boolean prefix ('prefix') mode"""
+        if mode == 'prefix':
+            against, match_mode = SearchService.boolean_prefix_query(search_term), "BOOLEAN MODE"
+        else:
+            against, match_mode = search_term, "NATURAL LANGUAGE MODE"
+        if not against.strip():
+            results['totals'] = {table: (0, False) for table in offsets}
+            return
+        
+        for table, offset in offsets.items():
+            query, count_query = FULLTEXT_SEARCH[table]
+            match = FULLTEXT_MATCH[table].format(mode=match_mode)
+            if table != 'orders':
+                cursor.execute(query.format(match=match), (against, against, limit, offset))
+                results[table] = cursor.fetchall()
+                if offset == 0:
+                    results['totals'][table] = SearchService._total(
+                        cursor, results[table], limit, count_query.format(match=match), (against,))
+                continue
+            
+            # Order IDs are not words; look them up by prefix, ahead of the customer matches
+            prefix = re.sub(r'([\\%_])', r'\\\1', search_term) + "%"
+            cursor.execute(SEARCH_ORDERS_BY_ID_PREFIX, (prefix, offset + limit, 0))
+            by_id = cursor.fetchall()
+            cursor.execute(query.format(match=match), (against, against, offset + limit))
+            results[table] = SearchService._merge_orders(by_id, cursor.fetchall(), offset, limit)
+            if offset == 0 and len(results[table]) == limit:
+                id_total, id_capped = SearchService._capped_count(cursor, COUNT_ORDERS_BY_ID_PREFIX, (prefix,))
+                name_total, name_capped = SearchService._capped_count(cursor, count_query.format(match=match),
+                                                                      (against,))
+                results['totals'][table] = (id_total + name_total, id_capped or name_capped)
+            elif offset == 0:
+                results['totals'][table] = (len(results[table]), False)
+    
+    @staticmethod
+    def _fetch_ranked(cursor, index, table, query, keys, key_column):
+        """Rows for ``keys`` in rank order; keys no longer in the database are dropped from the index"""
+        if not keys:
+            return []
+        cursor.execute(query.format(keys=", ".join(["%s"] * len(keys))), keys)
+        rows = {row[key_column]: row for row in cursor.fetchall()}
+        gone = [key for key in keys if key not in rows]
+        if gone:
+            index.forget(table, gone)
+        return [rows[key] for key in keys if key in rows]
+    
+    @staticmethod
+    def _indexed_search(index, cursor, search_term, limit, mode, offsets, results):
+        """Search the trigram index; counts come from the index and need no query"""
+        fetch = SearchService._fetch_ranked
+        for table, query, key_column in (('customers', SEARCH_CUSTOMERS_BY_ID, 'CustomerID'),
+                                         ('products', SEARCH_PRODUCTS_BY_ID, 'ProductID')):
+            if table in offsets:
+                offset = offsets[table]
+                keys, total = index.search(table, search_term, offset + limit)
+                results[table] = fetch(cursor, index, table, query, keys[offset:], key_column)
+                if offset == 0:
+                    results['totals'][table] = (total, False)
+        
+        if 'orders' not in offsets:
+            return
+        offset = offsets['orders']
+        order_ids, id_total = index.search('orders', search_term, offset + limit)
+        by_id = fetch(cursor, index, 'orders', SEARCH_ORDERS_BY_ID, order_ids, 'OrderID')
+        
+        # Orders also match on their customer's name
+        customer_ids, _ = index.search('customers', search_term, SEARCH_ORDER_CUSTOMERS)
+        keys = ", ".join(["%s"] * len(customer_ids))
+        by_customer = None
+        if customer_ids and len(by_id) < offset + limit:
+            cursor.execute(SEARCH_ORDERS_BY_CUSTOMER.format(keys=keys), customer_ids + [offset + limit])
+            by_customer = cursor.fetchall()
+        results['orders'] = SearchService._merge_orders(by_id, by_customer or [], offset, limit)
+        
+        if offset == 0:
+            if not customer_ids:
+                customer_total = (0, False)
+            elif by_customer is not None and len(by_customer) < limit:
+                customer_total = (len(by_customer), False)
+            else:
+                customer_total = SearchService._capped_count(
+                    cursor, COUNT_ORDERS_BY_CUSTOMER.format(keys=keys), customer_ids)
+            results['totals']['orders'] = (id_total + customer_total[0], customer_total[1])
+    
+    @staticmethod
+    def _fuzzy_search(index, cursor, search_term, limit, mode, offsets, results):
+        """Typo-tolerant search of the index; rows carry their similarity as 'Score' (1 = exact)"""
+        fetch = SearchService._fetch_ranked
+        for table, query, key_column in (('customers', SEARCH_CUSTOMERS_BY_ID, 'CustomerID'),
+                                         ('products', SEARCH_PRODUCTS_BY_ID, 'ProductID')):
+            if table in offsets:
+                offset = offsets[table]
+                matches, total = index.fuzzy_search(table, search_term, offset + limit)
+                scores = dict(matches[offset:])
+                results[table] = fetch(cursor, index, table, query, list(scores), key_column)
+                for row in results[table]:
+                    row['Score'] = scores[row[key_column]]
+                if offset == 0:
+                    results['totals'][table] = (total, False)
+        
+        # Orders of the best-matching customers, newest first
+        if 'orders' in offsets:
+            offset = offsets['orders']
+            matches, _ = index.fuzzy_search('customers', search_term, SEARCH_FUZZY_CUSTOMERS)
+            customer_ids = [key for key, _ in matches]
+            if customer_ids:
+                keys = ", ".join(["%s"] * len(customer_ids))
+                cursor.execute(SEARCH_ORDERS_BY_CUSTOMER.format(keys=keys), customer_ids + [offset + limit])
+                results['orders'] = cursor.fetchall()[offset:]
+                if offset == 0:
+                    results['totals']['orders'] = SearchService._total(
+                        cursor, results['orders'], limit, COUNT_ORDERS_BY_CUSTOMER.format(keys=keys), customer_ids)
+            elif offset == 0:
+                results['totals']['orders'] = (0, False)
+    
+    @staticmethod
+    def filter_orders(status=None, start_date=None, end_date=None, min_price=None, max_price=None,
+                      sort='date', descending=True, limit=100, after=None):
+        """Filter orders with various criteria, a page at a time.
+        
+        Orders are sorted by ``sort`` (a key of FILTER_SORTS), largest first
+        when ``descending``. ``after`` is the 'last_key' of the previous page;
+        ``limit`` None returns every match. Returns a dict with 'rows',
+        'last_key', 'has_next' and 'total': the match count as
+        (count, capped) on the first page, None on later ones.
+        """
+        if sort not in FILTER_SORTS:
+            raise ValueError(f"Unknown sort: {sort!r} (expected one of {', '.join(FILTER_SORTS)})")
+        key = SearchService.filter_key(status, start_date, end_date, min_price, max_price) + (
+            sort, bool(descending), limit, None if after is None else tuple(after))
+        return SearchService.cache.get_or_compute(key, lambda: SearchService._filter_orders(*key[1:]))
+    
+    @staticmethod
+    def filter_key(status=None, start_date=None, end_date=None, min_price=None, max_price=None):
+        """Cache key of a filter: blanks as None, dates as ISO dates, prices as numbers"""
+        def day(value):
+            value = str(value).strip() if value else None
+            try:
+                return date.fromisoformat(value).isoformat() if value else None
+            except ValueError:
+                return value  # Left for MySQL to interpret, as before
+        
+        def price(value):
+            return None if value is None else float(value)
+        
+        return ('filter', status or None, day(start_date), day(end_date), price(min_price), price(max_price))
+    
+    @staticmethod
+    def _filter_orders(status, start_date, end_date, min_price, max_price, sort, descending, limit, after):
+        filters = (status, start_date, end_date, min_price, max_price)
+        # Checked until the backfill is recorded: before it, most stored totals are still 0
+        if SearchService.use_order_totals is None and SearchService.order_totals_ready():
+            SearchService.use_order_totals = True
+        if SearchService.use_order_totals:
+            try:
+                return SearchService._filter_orders_by_total(*filters, sort, descending, limit, after)
+            except Error as err:
+                if err.errno != errorcode.ER_BAD_FIELD_ERROR:
+                    raise
+                SearchService.use_order_totals = False
+        return SearchService._filter_orders_by_lines(*filters, sort, descending, limit, after)
+    
+    @staticmethod
+    def order_totals_ready():
+        """Whether the stored order totals have been backfilled (migration 0007 is recorded)"""
+        conn = get_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(GET_MIGRATION_APPLIED, (ORDER_TOTALS_BACKFILL,))
+                return cursor.fetchone() is not None
+        except Error as err:
+            if err.errno != errorcode.ER_NO_SUCH_TABLE:
+                raise
+            return False  # No migrations applied
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def _keyset(columns, descending, after):
+        """Condition for the rows after the cursor, and the ORDER BY of the sort"""
+        condition, params = None, []
+        if after is not None:
+            condition, params = keyset_condition(columns, after, '<' if descending else '>', FILTER_ENUMS)
+        direction = "DESC" if descending else "ASC"
+        return condition, params, " ORDER BY " + ", ".join(f"{column} {direction}" for column in columns)
+    
+    @staticmethod
+    def _filter_page(cursor, query, params, page_query, page_params, sort, limit, after):
+        """Fetch a page with ``page_query`` (the filter ``query`` from the
+        cursor on, sorted); the first page also counts the filter's matches"""
+        if limit is not None:
+            page_query += " LIMIT %s"
+            page_params = page_params + [limit + 1]
+        cursor.execute(page_query, page_params)
+        rows = cursor.fetchall()
+        has_next = limit is not None and len(rows) > limit
+        if has_next:
+            rows = rows[:limit]
+        
+        total = None
+        if after is None:
+            if has_next:
+                total = SearchService._capped_count(
+                    cursor, COUNT_FILTERED_ORDERS.format(query=query), params, FILTER_COUNT_CAP)
+            else:
+                total = (len(rows), False)
+        return {
+            'rows': rows,
+            'last_key': tuple(rows[-1][column] for column in FILTER_SORTS[sort]) if rows else None,
+            'has_next': has_next,
+            'total': total,
+        }
+    
+    @staticmethod
+    def _filter_orders_by_total(status, start_date, end_date, min_price, max_price,
+                                sort='date', descending=True, limit=None, after=None):
+        """Every filter is a WHERE condition on indexed orders columns; nothing is grouped"""
         conn = get_connection()
         try:
             with conn.cursor(dictionary=True) as cursor:
-                # Search customers
-                cursor.execute(SEARCH_CUSTOMERS, (f"%{search_term}%",))
-                customers = cursor.fetchall()
+                query = FILTER_ORDERS
+                params = []
                 
-                # Search products
-                cursor.execute(SEARCH_PRODUCTS, (f"%{search_term}%",))
-                products = cursor.fetchall()
+                conditions = []
+                if status:
+                    conditions.append("o.OrderStatus = %s")
+                    params.append(status)
+                if start_date:
+                    conditions.append("o.OrderDate >= %s")
+                    params.append(start_date)
+                if end_date:
+                    conditions.append("o.OrderDate <= %s")
+                    params.append(end_date)
+                if min_price is not None:
+                    conditions.append("o.OrderTotal >= %s")
+                    params.append(min_price)
+                if max_price is not None:
+                    conditions.append("o.OrderTotal <= %s")
+                    params.append(max_price)
                 
-                # Search orders - note: two parameters for the OR condition
-                cursor.execute(SEARCH_ORDERS, (f"%{search_term}%", f"%{search_term}%"))
-                orders = cursor.fetchall()
+                for condition in conditions:
+                    query += " AND " + condition
                 
-                return {
-                    'customers': customers,
-                    'products': products,
-                    'orders': orders
-                }
+                # The cursor condition and ORDER BY follow an index, which MySQL reads from the cursor on
+                columns = [FILTER_COLUMNS[column] for column in FILTER_SORTS[sort]]
+                keyset, keyset_params, order_by = SearchService._keyset(columns, descending, after)
+                page_query = query + (" AND " + keyset if keyset else "") + order_by
+                return SearchService._filter_page(cursor, query, params, page_query, params + keyset_params,
+                                                  sort, limit, after)
         finally:
             conn.close()
     
     @staticmethod
-    def filter_orders(status=None, start_date=None, end_date=None, min_price=None, max_price=None):
-        """Filter orders with various criteria"""
+    def _filter_orders_by_lines(status, start_date, end_date, min_price, max_price,
+                                sort='date', descending=True, limit=None, after=None):
+        """Totals aggregated from the order lines, for databases without migration 0005"""
         conn = get_connection()
         try:
             with conn.cursor(dictionary=True) as cursor:
                 # Modified query to handle ONLY_FULL_GROUP_BY
-                query = """
-                    SELECT 
-                        o.OrderID,
-                        c.CustomerName,
-                        o.OrderDate,
-                        o.OrderStatus,
-                        SUM(q.Quantity * p.Price) as TotalAmount
-                    FROM orders o
-                    JOIN customers c ON o.CustomerID = c.CustomerID
-                    JOIN quantities q ON o.OrderID = q.OrderID
-                    JOIN products p ON q.ProductID = p.ProductID
-                """
+                query = FILTER_ORDERS_BASE
                 params = []
                 
                 # Build WHERE conditions
@@ -142,7 +815,16 @@ class SearchService:
                 if price_conditions:
                     query += " HAVING " + " AND ".join(price_conditions)
                 
-                cursor.execute(query, params)
-                return cursor.fetchall()
+                # Every order is grouped before it can be sorted; the cursor joins the HAVING clause
+                columns = [FILTER_LINE_COLUMNS[column] for column in FILTER_SORTS[sort]]
+                keyset, keyset_params, order_by = SearchService._keyset(columns, descending, after)
+                page_query = query
+                if keyset:
+                    page_query += (" AND " if price_conditions else " HAVING ") + keyset
+                page_query += order_by
+                return SearchService._filter_page(cursor, query, params, page_query, params + keyset_params,
+                                                  sort, limit, after)
         finally:
-            conn.close()
\ No newline at end of file
+            conn.close()
+
+subscribe(SearchService.on_write)
@@ -1,7 +1,34 @@
 import csv
 import os
 from datetime import datetime
-from app.db.connection import get_connection
+from app.db.streaming import stream_rows
+from app.models.customer_model import iter_customers
+from app.models.product_model import iter_products
+from app.models.order_model import iter_orders
+from app.models.quantity_model import iter_quantities
+from app.services.dashboard_service import DashboardService
+
+TABLE_ITERATORS = {
+    "customers": iter_customers,
+    "products": iter_products,
+    "orders": iter_orders,
+    "quantities": iter_quantities,
+}
+
+SALES_REPORT_QUERY = """
+    SELECT 
+        p.ProductID,
+        p.ProductName,
+        p.Price,
+        SUM(q.Quantity) as TotalSold,
+        SUM(q.Quantity * p.Price) as TotalRevenue,
+        COUNT(DISTINCT q.OrderID) as NumberOfOrders
+    FROM products p
+    LEFT JOIN quantities q ON p.ProductID = q.ProductID
+    LEFT JOIN orders o ON q.OrderID = o.OrderID AND o.OrderStatus = 'Delivered'
+    GROUP BY p.ProductID, p.ProductName, p.Price
+    ORDER BY TotalRevenue DESC
+"""
 
 class ExportService:
     def __init__(self):
@@ -10,6 +37,26 @@ class ExportService:
         if not os.path.exists(self.export_dir):
             os.makedirs(self.export_dir)
     
+    def write_csv(self, filepath, rows):
+        """Write an iterable of row dicts to CSV as they arrive; returns the row count.
+        
+        The file is only created once the first row is available.
+        """
+        rows = iter(rows)
+        first = next(rows, None)
+        if first is None:
+            return 0
+        
+        count = 1
+        with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=list(first.keys()))
+            writer.writeheader()
+            writer.writerow(first)
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        return count
+    
     def export_table_to_csv(self, table_name, filename=None):
         """Export a database table to CSV"""
         if filename is None:
@@ -18,32 +65,20 @@ class ExportService:
         
         filepath = os.path.join(self.export_dir, filename)
         
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
-        
         try:
-            # Get data from table
-            cursor.execute(f"SELECT * FROM {table_name}")
-            data = cursor.fetchall()
+            # Stream rows straight from the server into the file
+            if table_name in TABLE_ITERATORS:
+                rows = TABLE_ITERATORS[table_name](row_format='object')
+            else:
+                rows = stream_rows(f"SELECT * FROM {table_name}")
             
-            if not data:
+            if not self.write_csv(filepath, rows):
                 return False, "No data to export"
             
-            # Write to CSV
-            with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-                if data:
-                    fieldnames = data[0].keys()
-                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                    writer.writeheader()
-                    writer.writerows(data)
-            
             return True, f"Data exported successfully to {filename}"
             
         except Exception as e:
             return False, f"Export failed: {str(e)}"
-        finally:
-            cursor.close()
-            conn.close()
     
     def export_customers(self):
         """Export customers data"""
@@ -63,9 +98,6 @@ class ExportService:
     
     def export_orders_with_details(self):
         """Export orders with customer names and calculated totals"""
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
-        
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"orders_detailed_{timestamp}.csv"
         filepath = os.path.join(self.export_dir, filename)
@@ -87,72 +119,32 @@ class ExportService:
             ORDER BY o.OrderDate DESC
             """
             
-            cursor.execute(query)
-            data = cursor.fetchall()
-            
-            if not data:
+            if not self.write_csv(filepath, stream_rows(query)):
                 return False, "No order data to export"
             
-            with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-                if data:
-                    fieldnames = data[0].keys()
-                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                    writer.writeheader()
-                    writer.writerows(data)
-            
             return True, f"Orders with details exported to {filename}"
             
         except Exception as e:
             return False, f"Export failed: {str(e)}"
-        finally:
-            cursor.close()
-            conn.close()
     
     def export_sales_report(self):
         """Export sales report with revenue by product"""
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
-        
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"sales_report_{timestamp}.csv"
         filepath = os.path.join(self.export_dir, filename)
         
         try:
-            query = """
-            SELECT 
-                p.ProductID,
-                p.ProductName,
-                p.Price,
-                SUM(q.Quantity) as TotalSold,
-                SUM(q.Quantity * p.Price) as TotalRevenue,
-                COUNT(DISTINCT q.OrderID) as NumberOfOrders
-            FROM products p
-            LEFT JOIN quantities q ON p.ProductID = q.ProductID
-            LEFT JOIN orders o ON q.OrderID = o.OrderID AND o.OrderStatus = 'Delivered'
-            GROUP BY p.ProductID, p.ProductName, p.Price
-            ORDER BY TotalRevenue DESC
-            """
+            # The columnar engine, when selected, answers without touching MySQL
+            analytics = DashboardService.analytics()
+            rows = analytics.sales_report() if analytics is not None else stream_rows(SALES_REPORT_QUERY)
             
-            cursor.execute(query)
-            data = cursor.fetchall()
-            
-            if not data:
+            if not self.write_csv(filepath, rows):
                 return False, "No sales data to export"
             
-            with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-                if data:
-                    fieldnames = data[0].keys()
-                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                    writer.writeheader()
-                    writer.writerows(data)
-            
             return True, f"Sales report exported to {filename}"
             
         except Exception as e:
             return False, f"Export failed: {str(e)}"
-        finally:
-            cursor.close()
-            conn.close()
     
     def get_export_files(self):
         """Get list of exported files"""
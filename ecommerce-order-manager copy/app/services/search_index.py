@@ -0,0 +1,402 @@
+# search_index.py
+"""In-process trigram indexes for global search.
+
+Customer names, product names and order IDs are split into lowercase
+three-character grams, each mapped to the (integer) documents containing it.
+A substring search only verifies the documents of the term's rarest gram
+instead of scanning every row the way LIKE '%term%' does. The index holds
+keys and search text only; result rows are read from MySQL by primary key.
+
+Fuzzy search reuses the same postings: names sharing enough of the term's
+trigrams are counted up (with NumPy when it is installed) and only the best
+of them are ranked by edit distance, so a misspelled name is found without
+comparing the term against every row.
+
+The index follows writes made through the models via app.db.events. It is
+saved to disk and reused on the next start while it is less than
+INDEX_MAX_AGE old and each table still has the row count and highest key
+the index accounts for: those read when it was built, adjusted by the
+writes it followed. Other clients' inserts and deletes change them and
+force a rebuild; the age limit bounds how long their renames go unseen.
+"""
+import heapq
+import math
+import os
+import pickle
+import threading
+import time
+from array import array
+from app.db.connection import get_connection
+from app.db.events import subscribe
+from app.db.streaming import stream_rows
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+INDEX_PATH = os.path.join("cache", "search_index.pickle")
+INDEX_VERSION = 1
+INDEX_MAX_AGE = 24 * 3600  # Seconds after which a saved index is rebuilt rather than loaded
+# Fuzzy matches must share this fraction of the term's trigrams; the best
+# FUZZY_RERANK_FACTOR * limit of them are ranked by edit distance
+FUZZY_MIN_SIMILARITY = 0.3
+FUZZY_RERANK_FACTOR = 4
+
+# Indexed text per table: (key column, text column)
+SOURCES = {
+    'customers': ("CustomerID", "CustomerName"),
+    'products': ("ProductID", "ProductName"),
+    'orders': ("OrderID", "OrderID"),
+}
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def substring_distance(term, text):
+    """Fewest single-character edits turning term into some substring of text"""
+    previous = [0] * (len(text) + 1)  # A match may start anywhere in text...
+    for i, char in enumerate(term, 1):
+        current = [i]
+        for j, other in enumerate(text, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char != other)))
+        previous = current
+    return min(previous)  # ...and end anywhere
+
+
+class TrigramIndex:
+    """Substring index over short strings such as names and IDs"""
+
+    def __init__(self):
+        self.keys = []      # code -> key, None once removed
+        self.texts = []     # code -> lowercase text, None once removed
+        self.codes = {}     # key -> code
+        self.postings = {}  # trigram -> array of codes, in insertion order
+        self.removed = 0
+
+    def __len__(self):
+        return len(self.codes)
+
+    def add(self, key, text):
+        """Index ``text`` under ``key``, replacing what was indexed for it before"""
+        self.remove(key)
+        code = len(self.keys)
+        text = text.lower()
+        self.keys.append(key)
+        self.texts.append(text)
+        self.codes[key] = code
+        for gram in trigrams(text):
+            postings = self.postings.get(gram)
+            if postings is None:
+                postings = self.postings[gram] = array('I')
+            postings.append(code)
+
+    def remove(self, key):
+        code = self.codes.pop(key, None)
+        if code is None:
+            return
+        # Postings keep the dead code; it is skipped on search and dropped by compact()
+        self.keys[code] = None
+        self.texts[code] = None
+        self.removed += 1
+        if self.removed > 1000 and self.removed > len(self.codes):
+            self.compact()
+
+    def compact(self):
+        """Rebuild without removed entries"""
+        live = [(key, text) for key, text in zip(self.keys, self.texts) if key is not None]
+        self.__init__()
+        for key, text in live:
+            self.add(key, text)
+
+    def search(self, term, limit=50):
+        """Return (keys of the best ``limit`` matches, number of matches).
+
+        Exact matches rank first, then prefix matches, then matches at the
+        start of a word, then the rest; shorter texts before longer ones.
+        Terms shorter than three characters have no trigram and are
+        answered by scanning the indexed texts.
+        """
+        term = term.lower()
+        if len(term) < 3:
+            candidates = range(len(self.texts))
+        else:
+            lists = [self.postings.get(gram) for gram in trigrams(term)]
+            if any(postings is None for postings in lists):
+                return [], 0
+            candidates = min(lists, key=len)
+
+        matches = []
+        texts = self.texts
+        for code in candidates:
+            text = texts[code]
+            if text is None:
+                continue
+            position = text.find(term)
+            if position < 0:
+                continue
+            if text == term:
+                rank = 0
+            elif position == 0:
+                rank = 1
+            elif text[position - 1] == ' ':
+                rank = 2
+            else:
+                rank = 3
+            matches.append((rank, len(text), code))
+
+        best = heapq.nsmallest(limit, matches)
+        return [self.keys[code] for _, _, code in best], len(matches)
+
+    def best_candidates(self, grams, needed, pool):
+        """(codes of up to ``pool`` texts sharing the most ``grams``, number sharing at least ``needed``)"""
+        lists = [self.postings[gram] for gram in grams if gram in self.postings]
+        if not lists:
+            return [], 0
+        if np is not None:
+            counts = np.bincount(np.concatenate([np.frombuffer(postings, dtype=np.uintc) for postings in lists]),
+                                 minlength=len(self.keys))
+            codes = np.flatnonzero(counts >= needed)
+            if len(codes) > pool:
+                codes = codes[np.argpartition(counts[codes], len(codes) - pool)[-pool:]]
+                total = int(np.count_nonzero(counts >= needed))
+            else:
+                total = len(codes)
+            return codes.tolist(), total
+        counts = {}
+        for postings in lists:
+            for code in postings:
+                counts[code] = counts.get(code, 0) + 1
+        candidates = [(count, code) for code, count in counts.items() if count >= needed]
+        return [code for _, code in heapq.nlargest(pool, candidates)], len(candidates)
+
+    def fuzzy_search(self, term, limit=50, min_similarity=FUZZY_MIN_SIMILARITY):
+        """Return ([(key, score)] of the best ``limit`` typo-tolerant matches, number of candidates).
+
+        Candidates share at least ``min_similarity`` of the term's trigrams;
+        the best of them by shared trigrams are scored 1 - edits / len(term),
+        where edits is the edit distance from the term to the closest part
+        of the text. Terms shorter than three characters have no trigrams
+        and match nothing.
+        """
+        term = term.lower()
+        grams = trigrams(term)
+        if not grams:
+            return [], 0
+        needed = max(1, math.ceil(min_similarity * len(grams)))
+        codes, total = self.best_candidates(grams, needed, limit * FUZZY_RERANK_FACTOR)
+
+        texts = self.texts
+        ranked = []
+        for code in codes:
+            text = texts[code]
+            if text is None:
+                continue  # Removed since the postings were written
+            score = 1 - substring_distance(term, text) / len(term)
+            ranked.append((-score, len(text), code))
+        best = heapq.nsmallest(limit, ranked)
+        return [(self.keys[code], round(-score, 3)) for score, _, code in best], total
+
+
+class SearchIndex:
+    """Trigram indexes for every table in SOURCES, kept current by write events"""
+
+    def __init__(self):
+        self.indexes = {table: TrigramIndex() for table in SOURCES}
+        self.fingerprint = None
+        self.built_at = None
+        self.dirty = False
+        self._lock = threading.Lock()
+        self._pending = {}  # table -> set of keys written since the last search
+
+    def __getstate__(self):
+        return {'indexes': self.indexes, 'fingerprint': self.fingerprint, 'built_at': self.built_at}
+
+    def __setstate__(self, state):
+        self.__init__()
+        self.__dict__.update(state)
+
+    @staticmethod
+    def current_fingerprint():
+        """Row count and highest key per table; cheap to read through the primary keys"""
+        conn = get_connection()
+        cursor = conn.cursor()
+        try:
+            fingerprint = {}
+            for table, (key, _) in SOURCES.items():
+                cursor.execute(f"SELECT COUNT(*), MAX({key}) FROM {table}")
+                fingerprint[table] = tuple(cursor.fetchone())
+            return fingerprint
+        finally:
+            cursor.close()
+            conn.close()
+
+    def build(self):
+        """Index every row; writes reported meanwhile are applied on the next search"""
+        with self._lock:
+            # Set first, so writes reported during the build adjust it
+            self.fingerprint = self.current_fingerprint()
+        indexes = {}
+        for table, (key, text) in SOURCES.items():
+            indexes[table] = TrigramIndex()
+            for row_key, row_text in stream_rows(f"SELECT {key}, {text} FROM {table}", dictionary=False):
+                indexes[table].add(row_key, row_text)
+        with self._lock:
+            self.indexes = indexes
+            self.built_at = time.time()
+            self.dirty = True
+
+    @classmethod
+    def load(cls, path=INDEX_PATH):
+        """The saved index if it still matches the database, else None"""
+        try:
+            with open(path, "rb") as f:
+                saved = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+        if not isinstance(saved, dict) or saved.get('version') != INDEX_VERSION:
+            return None
+        index = saved['index']
+        if index.built_at is None or time.time() - index.built_at > INDEX_MAX_AGE:
+            return None
+        if index.fingerprint != cls.current_fingerprint():
+            return None
+        return index
+
+    def save(self, path=INDEX_PATH):
+        with self._lock:
+            self._apply_pending()
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = path + ".tmp"
+            with open(temp_path, "wb") as f:
+                pickle.dump({'version': INDEX_VERSION, 'index': self}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+            self.dirty = False
+
+    def on_write(self, table, action, keys):
+        """Write listener: re-read the written keys on the next search"""
+        if table not in self.indexes:
+            return
+        with self._lock:
+            self.dirty = True
+            self._adjust_fingerprint(table, action, keys)
+            if keys is None:
+                self._pending[table] = None
+            elif self._pending.get(table, ()) is not None:
+                self._pending.setdefault(table, set()).update(keys)
+
+    def _adjust_fingerprint(self, table, action, keys):
+        """Count a write of this process into the fingerprint (lock held).
+
+        A table whose count or highest key can no longer be worked out is set
+        to None, which no database matches, so it is rebuilt on the next start.
+        """
+        if self.fingerprint is None:
+            return
+        if table == 'customers' and action == 'delete':
+            self.fingerprint['orders'] = None  # The customer's orders were deleted too
+        if self.fingerprint.get(table) is None or action == 'update':
+            return
+        count, highest = self.fingerprint[table]
+        if keys is None or (action == 'delete' and highest in keys):
+            self.fingerprint[table] = None
+        elif action == 'create':
+            self.fingerprint[table] = (count + len(keys), max([*keys, highest] if highest is not None else keys))
+        elif action == 'delete':
+            self.fingerprint[table] = (count - len(keys), highest)
+
+    def _apply_pending(self):
+        """Re-index the pending keys from the database (lock held)"""
+        pending, self._pending = self._pending, {}
+        for table, keys in pending.items():
+            key_column, text_column = SOURCES[table]
+            index = self.indexes[table]
+            if keys is None:
+                fresh = TrigramIndex()
+                for row_key, row_text in stream_rows(f"SELECT {key_column}, {text_column} FROM {table}",
+                                                     dictionary=False):
+                    fresh.add(row_key, row_text)
+                self.indexes[table] = fresh
+                continue
+            keys = list(keys)
+            for key in keys:
+                index.remove(key)
+            for start in range(0, len(keys), 1000):
+                chunk = keys[start:start + 1000]
+                placeholders = ", ".join(["%s"] * len(chunk))
+                for row_key, row_text in stream_rows(
+                        f"SELECT {key_column}, {text_column} FROM {table} WHERE {key_column} IN ({placeholders})",
+                        chunk, dictionary=False):
+                    index.add(row_key, row_text)
+
+    def search(self, table, term, limit=50):
+        """(keys, total) of the best matches for ``term`` in ``table``"""
+        with self._lock:
+            if self._pending:
+                self._apply_pending()
+            return self.indexes[table].search(term, limit)
+
+    def fuzzy_search(self, table, term, limit=50):
+        """([(key, score)], candidates) of the best typo-tolerant matches for ``term`` in ``table``"""
+        with self._lock:
+            if self._pending:
+                self._apply_pending()
+            return self.indexes[table].fuzzy_search(term, limit)
+
+    def forget(self, table, keys):
+        """Drop keys found to be gone from the database (e.g. deleted by a cascade)"""
+        with self._lock:
+            for key in keys:
+                self.indexes[table].remove(key)
+            if self.fingerprint is not None:
+                self.fingerprint[table] = None  # Deleted without a write event
+            self.dirty = True
+
+
+_index = None
+_index_lock = threading.Lock()
+_warm_thread = None
+_warm_lock = threading.Lock()
+
+
+def get_index(wait=True):
+    """The shared search index, loaded from disk or built on first use.
+
+    With wait=False, never loads or builds it in the calling thread: returns
+    None until it is ready, starting warm_index() if nothing is loading it.
+    """
+    global _index
+    if _index is not None:
+        return _index
+    if not wait:
+        warm_index()
+        return None
+    with _index_lock:
+        if _index is None:
+            index = SearchIndex.load()
+            if index is None:
+                index = SearchIndex()
+                subscribe(index.on_write)
+                index.build()
+            else:
+                subscribe(index.on_write)
+            _index = index
+        return _index
+
+
+def warm_index():
+    """Load or build the shared index on a daemon thread, unless it is ready or already underway"""
+    global _warm_thread
+    with _warm_lock:
+        if _index is not None or (_warm_thread is not None and _warm_thread.is_alive()):
+            return
+        _warm_thread = threading.Thread(target=get_index, daemon=True, name="search-index")
+        _warm_thread.start()
+
+
+def save_index():
+    """Persist the shared index if it changed since it was loaded"""
+    if _index is not None and _index.dirty:
+        _index.save()
@@ -0,0 +1,50 @@
+# charts.py
+from matplotlib.figure import Figure
+
+
+def make_figure(title=""):
+    """Create a standalone Figure with one Axes.
+
+    Unlike pyplot figures these are not kept alive by a global registry, so
+    they are freed as soon as the screen holding them lets go.
+    """
+    fig = Figure(figsize=(6, 4), tight_layout=True)
+    ax = fig.add_subplot()
+    ax.set_title(title)
+    return fig, ax
+
+
+def set_bars(ax, labels, values, color, horizontal=False):
+    """Show ``values`` as bars on ``ax``, updating the existing bars in place.
+
+    Bars are only re-created when their number changes; otherwise just their
+    heights (widths for horizontal bars) and the tick labels are updated.
+    """
+    bars = ax.containers[0] if ax.containers else None
+    if bars is not None and len(bars) == len(values):
+        for bar, value in zip(bars, values):
+            if horizontal:
+                bar.set_width(value)
+            else:
+                bar.set_height(value)
+    else:
+        if bars is not None:
+            bars.remove()
+        positions = range(len(values))
+        if horizontal:
+            ax.barh(positions, values, color=color)
+        else:
+            ax.bar(positions, values, color=color)
+
+    ticks = range(len(labels))
+    if horizontal:
+        ax.set_yticks(ticks, labels)
+    else:
+        ax.set_xticks(ticks, labels, rotation=45, ha='right')
+    ax.relim()
+    ax.autoscale_view()
+
+
+def release_figure(fig):
+    """Drop every artist of a figure that is no longer shown"""
+    fig.clear()
@@ -2,13 +2,18 @@ from tkinter import *
 from tkinter import ttk
 import threading
 from app.models.order_model import (
-    create_order, get_order, update_order, delete_order, get_all_orders
+    create_order, get_order, update_order, delete_order, get_orders_page
 )
 from app.models.customer_model import get_all_customers
 
 class OrderForms:
+    PAGE_SIZE = 50
+    
     def __init__(self, main_app):
         self.main_app = main_app
+        self.page = None
+        self.page_number = 1
+        self.total_rows = None
     
     def show_order_management(self):
         """Show order management interface"""
@@ -471,7 +476,7 @@ class OrderForms:
         self.refresh_order_table()
     
     def refresh_order_table(self):
-        """Refresh order table with all data"""
+        """Rebuild the order table and load its first page"""
         # Clear table
         for widget in self.main_app.F2.winfo_children():
             widget.destroy()
@@ -484,6 +489,24 @@ class OrderForms:
         Label(table_frame, text="Orders", font=self.main_app.H2_STYLE,
               bg=self.main_app.COLOUR4, fg="white").pack(anchor='w', pady=(0, 10))
         
+        # Pager
+        pager = Frame(table_frame, bg=self.main_app.COLOUR4)
+        pager.pack(side='bottom', fill='x', pady=(10, 0))
+        
+        self.prev_btn = Button(pager, text="◀ Previous", font=self.main_app.FONT_STYLE1,
+                               bg=self.main_app.COLOUR2, fg=self.main_app.COLOUR5,
+                               state=DISABLED, command=self.previous_page)
+        self.prev_btn.pack(side='left')
+        
+        self.next_btn = Button(pager, text="Next ▶", font=self.main_app.FONT_STYLE1,
+                               bg=self.main_app.COLOUR2, fg=self.main_app.COLOUR5,
+                               state=DISABLED, command=self.next_page)
+        self.next_btn.pack(side='right')
+        
+        self.page_label = Label(pager, text="", font=(self.main_app.FONT, 10),
+                                bg=self.main_app.COLOUR4, fg="white")
+        self.page_label.pack(side='left', expand=True)
+        
         # Create table
         self.order_table = ttk.Treeview(table_frame, columns=("OrderID", "CustomerID", "OrderDate", "OrderStatus"), 
                                           show="headings", style="Custom.Treeview")
@@ -505,16 +528,48 @@ class OrderForms:
         self.order_table.pack(side='left', fill=BOTH, expand=True)
         scrollbar.pack(side='right', fill='y')
         
-        # Load data
+        # Load first page
+        self.load_page(with_total=True)
+    
+    def load_page(self, after=None, before=None, page_number=1, with_total=False):
+        """Load one page of orders in the background"""
         def load_data():
             try:
-                orders = get_all_orders()
-                self.main_app.root.after(0, lambda: self.populate_table(orders))
+                page = get_orders_page(self.PAGE_SIZE, after=after, before=before, with_total=with_total,
+                                       row_format='object')
+                self.main_app.root.after(0, lambda: self.show_page(page, page_number))
             except Exception as e:
                 self.main_app.root.after(0, lambda: self.show_table_error(f"Error loading orders: {str(e)}"))
         
         threading.Thread(target=load_data, daemon=True).start()
     
+    def show_page(self, page, page_number):
+        """Show a loaded page and update the pager"""
+        if not self.order_table.winfo_exists():
+            return
+        self.page = page
+        self.page_number = page_number
+        if page['total'] is not None:
+            self.total_rows = page['total']
+        
+        self.populate_table(page['rows'])
+        self.prev_btn.config(state=NORMAL if page['has_prev'] else DISABLED)
+        self.next_btn.config(state=NORMAL if page['has_next'] else DISABLED)
+        
+        text = f"Page {page_number}"
+        if self.total_rows is not None:
+            pages = max(1, -(-self.total_rows // self.PAGE_SIZE))
+            text += f" of {pages} ({self.total_rows} orders)"
+        self.page_label.config(text=text)
+    
+    def next_page(self):
+        if self.page and self.page['has_next']:
+            self.load_page(after=self.page['last_key'], page_number=self.page_number + 1)
+    
+    def previous_page(self):
+        if self.page and self.page['has_prev']:
+            self.load_page(before=self.page['first_key'], page_number=self.page_number - 1)
+    
     def populate_table(self, data):
         """Populate table with data"""
         self.order_table.delete(*self.order_table.get_children())
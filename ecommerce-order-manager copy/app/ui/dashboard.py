@@ -1,48 +1,168 @@
+import time
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import ttk
 from app.services.dashboard_service import DashboardService
-import matplotlib.pyplot as plt
+from app.ui.charts import make_figure, release_figure, set_bars
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 class Dashboard:
+    # Queries run here, never on the Tk thread; results are handed back with root.after
+    executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="dashboard")
+    
     def __init__(self, parent_frame, main_app):
         self.parent = parent_frame
         self.main_app = main_app
         self.service = DashboardService()
+        self.load_id = 0
+        self.load_started = None
+        self.stale = False
+        self.results = {'kpis': {}}
         
-    def show(self):
+    def show(self, snapshot=None):
         # Clear existing widgets
         for widget in self.parent.winfo_children():
             widget.destroy()
         
-        # Create dashboard layout
+        # Create dashboard layout with placeholders, then fill it as results arrive
+        self.create_header()
         self.create_kpi_section()
         self.create_charts_section()
+        if snapshot is not None:
+            self.show_snapshot(snapshot)
+        else:
+            self.load_data()
+    
+    def show_snapshot(self, snapshot):
+        """Render saved data right away, greyed out until load_data() replaces it"""
+        self.stale = True
+        self.period_var.set(snapshot['period'])
+        self.fill_kpi_cards(snapshot['kpis'], None)
+        self.update_revenue_chart(snapshot['period'], snapshot['revenue'])
+        self.update_top_products_chart(snapshot['top_products'])
+        self.snapshot_saved = time.strftime('%Y-%m-%d %H:%M', time.localtime(snapshot['saved_at']))
+        self.age_label.config(text=f"Saved data from {self.snapshot_saved} (stale), refreshing...")
+    
+    def show_refresh_failed(self):
+        """The database could not be reached, so the snapshot stays up without a refresh"""
+        self.age_label.config(text=f"Saved data from {self.snapshot_saved} (stale), database unavailable")
+    
+    def is_stale(self):
+        """Whether this dashboard is on screen and still showing snapshot data"""
+        return self.stale and self.age_label.winfo_exists()
+    
+    def submit(self, fetch, apply):
+        """Run fetch() on the worker pool and apply(result, error) on the Tk thread"""
+        load_id = self.load_id
+        
+        def deliver(future):
+            error = future.exception()
+            result = None if error else future.result()
+            try:
+                self.main_app.root.after(0, lambda: self.deliver(load_id, apply, result, error))
+            except (RuntimeError, tk.TclError):
+                pass  # The window was closed while the query ran
+        
+        self.executor.submit(fetch).add_done_callback(deliver)
+    
+    def deliver(self, load_id, apply, result, error):
+        # Drop results for a dashboard that was refreshed or navigated away from
+        if load_id != self.load_id or not self.age_label.winfo_exists():
+            return
+        if error is not None:
+            print(f"Dashboard: query failed: {error}")
+            self.load_failed = True
+        apply(result, error)
+    
+    def load_data(self):
+        """Dispatch every dashboard query concurrently and fill each card as it completes"""
+        self.load_id += 1
+        self.load_started = time.perf_counter()
+        self.first_card_ms = None
+        self.pending = len(self.kpi_labels) + 3  # KPIs, orders by status, two charts
+        self.load_failed = False
+        self.results = {'kpis': {}}
+        if not self.stale:
+            self.age_label.config(text="Loading...")
+        self.stale = False
+        
+        if self.service.kpi_snapshot:
+            # One query answers every KPI card
+            self.submit(self.service.get_kpis, self.fill_kpi_cards)
+        else:
+            for name in self.kpi_labels:
+                self.submit(lambda name=name: self.service.get_kpi(name),
+                            lambda value, error, name=name: self.fill_kpi_card(name, value, error))
+            self.submit(lambda: self.service.get_kpi('orders_by_status'), self.fill_status_card)
+        self.load_revenue_chart(self.period_var.get())
+        self.submit(lambda: self.service.get_top_products_by_revenue(10), self.fill_top_products_chart)
+    
+    def loaded(self):
+        """Record load timings once a card or chart has been filled"""
+        if self.load_started is None:
+            return  # filled from a snapshot
+        elapsed_ms = (time.perf_counter() - self.load_started) * 1000
+        if self.first_card_ms is None:
+            self.first_card_ms = elapsed_ms
+            print(f"Dashboard: first card after {elapsed_ms:.0f} ms")
+        self.pending -= 1
+        if self.pending == 0:
+            print(f"Dashboard: complete after {elapsed_ms:.0f} ms")
+            self.update_data_age()
+            if not self.load_failed:
+                # Saved off the Tk thread; shown instantly on the next start
+                self.executor.submit(self.service.save_snapshot, self.results)
+    
+    def create_header(self):
+        header = tk.Frame(self.parent, bg=self.main_app.COLOUR4)
+        header.pack(fill='x', padx=20, pady=(10, 0))
+        
+        self.age_label = tk.Label(header, text="", font=(self.main_app.FONT, 10),
+                                  bg=self.main_app.COLOUR4, fg="white")
+        self.age_label.pack(side='left')
+        
+        tk.Button(header, text="⟳ Refresh", font=(self.main_app.FONT, 10),
+                  bg=self.main_app.COLOUR2, fg=self.main_app.COLOUR5,
+                  command=self.refresh).pack(side='right')
+    
+    def refresh(self):
+        """Drop cached data and reload the dashboard"""
+        self.service.invalidate()
+        self.show()
+    
+    def update_data_age(self):
+        """Show when the displayed (possibly cached) data was queried"""
+        age = self.service.data_age(self.period_var.get())
+        if age is None:
+            text = "Live data"
+        else:
+            as_of = time.strftime('%H:%M:%S', time.localtime(time.time() - age))
+            text = f"Data as of {as_of} ({age:.0f}s old)"
+        self.age_label.config(text=text)
         
     def create_kpi_section(self):
         # KPI Frame
         kpi_frame = tk.Frame(self.parent, bg=self.main_app.COLOUR3)
         kpi_frame.pack(fill='x', padx=20, pady=10)
         
-        # Get KPI data
-        kpis = self.service.get_kpis()
-        
-        # KPI Cards
+        # KPI Cards, showing a placeholder until their query returns
         cards_data = [
-            ("Total Customers", kpis['total_customers'], self.main_app.COLOUR2),
-            ("Total Products", kpis['total_products'], self.main_app.COLOUR2),
-            ("Revenue to Date", f"${kpis['revenue_to_date']:,.2f}", self.main_app.COLOUR2),
+            ("Total Customers", 'total_customers', self.main_app.COLOUR2),
+            ("Total Products", 'total_products', self.main_app.COLOUR2),
+            ("Revenue to Date", 'revenue_to_date', self.main_app.COLOUR2),
         ]
         
-        for i, (title, value, color) in enumerate(cards_data):
+        self.kpi_labels = {}
+        for i, (title, name, color) in enumerate(cards_data):
             card = tk.Frame(kpi_frame, bg=color, relief='raised', bd=2)
             card.grid(row=0, column=i, padx=10, pady=5, sticky='ew')
             kpi_frame.columnconfigure(i, weight=1)
             
             tk.Label(card, text=title, font=(self.main_app.FONT, 12, 'bold'), 
                     bg=color, fg=self.main_app.COLOUR5).pack(pady=(10, 5))
-            tk.Label(card, text=str(value), font=(self.main_app.FONT, 16, 'bold'), 
-                    bg=color, fg=self.main_app.COLOUR5).pack(pady=(0, 10))
+            self.kpi_labels[name] = tk.Label(card, text="···", font=(self.main_app.FONT, 16, 'bold'), 
+                                             bg=color, fg="gray")
+            self.kpi_labels[name].pack(pady=(0, 10))
         
         # Orders by status
         status_frame = tk.Frame(kpi_frame, bg=self.main_app.COLOUR2, relief='raised', bd=2)
@@ -51,15 +171,46 @@ class Dashboard:
         tk.Label(status_frame, text="Orders by Status", font=(self.main_app.FONT, 12, 'bold'),
                 bg=self.main_app.COLOUR2, fg=self.main_app.COLOUR5).pack(pady=(10, 5))
         
-        for status in kpis['orders_by_status']:
+        self.status_list = tk.Frame(status_frame, bg=self.main_app.COLOUR2)
+        self.status_list.pack()
+        tk.Label(self.status_list, text="···", font=(self.main_app.FONT, 10),
+                bg=self.main_app.COLOUR2, fg="gray").pack()
+    
+    def fill_kpi_cards(self, kpis, error):
+        for name in self.kpi_labels:
+            self.fill_kpi_card(name, None if error else kpis[name], error)
+        self.fill_status_card(None if error else kpis['orders_by_status'], error)
+    
+    def fill_kpi_card(self, name, value, error):
+        if error is not None:
+            text = "Error"
+        elif name == 'revenue_to_date':
+            text = f"${value:,.2f}"
+        else:
+            text = str(value)
+        self.kpi_labels[name].config(text=text, fg="gray" if self.stale else self.main_app.COLOUR5)
+        self.results['kpis'][name] = value
+        self.loaded()
+    
+    def fill_status_card(self, orders_by_status, error):
+        for widget in self.status_list.winfo_children():
+            widget.destroy()
+        
+        for status in orders_by_status if error is None else []:
             text = f"{status['OrderStatus']}: {status['count']}"
-            tk.Label(status_frame, text=text, font=(self.main_app.FONT, 10),
+            tk.Label(self.status_list, text=text, font=(self.main_app.FONT, 10),
+                    bg=self.main_app.COLOUR2, fg="gray" if self.stale else self.main_app.COLOUR5).pack()
+        if error is not None:
+            tk.Label(self.status_list, text="Error", font=(self.main_app.FONT, 10),
                     bg=self.main_app.COLOUR2, fg=self.main_app.COLOUR5).pack()
+        self.results['kpis']['orders_by_status'] = orders_by_status
+        self.loaded()
     
     def create_charts_section(self):
         # Charts Frame
         charts_frame = tk.Frame(self.parent, bg=self.main_app.COLOUR4)
         charts_frame.pack(fill='both', expand=True, padx=20, pady=10)
+        charts_frame.bind('<Destroy>', self.release_charts)
         
         # Left chart - Revenue by period
         left_chart_frame = tk.Frame(charts_frame, bg=self.main_app.COLOUR3)
@@ -72,12 +223,12 @@ class Dashboard:
         tk.Label(period_frame, text="View by:", font=self.main_app.FONT_STYLE1,
                 bg=self.main_app.COLOUR3, fg=self.main_app.COLOUR5).pack(side='left')
         
-        period_var = tk.StringVar(value='day')
+        self.period_var = tk.StringVar(value='day')
         periods = [('Day', 'day'), ('Week', 'week'), ('Month', 'month')]
         
         for text, value in periods:
-            tk.Radiobutton(period_frame, text=text, variable=period_var, value=value,
-                          command=lambda: self.update_revenue_chart(period_var.get(), chart_canvas),
+            tk.Radiobutton(period_frame, text=text, variable=self.period_var, value=value,
+                          command=lambda: self.load_revenue_chart(self.period_var.get(), initial=False),
                           bg=self.main_app.COLOUR3, fg=self.main_app.COLOUR5,
                           font=self.main_app.FONT_STYLE1).pack(side='left', padx=5)
         
@@ -85,11 +236,10 @@ class Dashboard:
         chart_container = tk.Frame(left_chart_frame, bg='white')
         chart_container.pack(fill='both', expand=True, padx=10, pady=10)
         
-        # Create initial chart
-        fig, ax = plt.subplots(figsize=(6, 4))
-        canvas = FigureCanvasTkAgg(fig, chart_container)
-        chart_canvas = canvas.get_tk_widget()
-        chart_canvas.pack(fill='both', expand=True)
+        # The figure lives as long as the screen; period switches only update its bars
+        self.revenue_fig, self.revenue_ax = make_figure('Loading...')
+        self.revenue_canvas = FigureCanvasTkAgg(self.revenue_fig, chart_container)
+        self.revenue_canvas.get_tk_widget().pack(fill='both', expand=True)
         
         # Right chart - Top products
         right_chart_frame = tk.Frame(charts_frame, bg=self.main_app.COLOUR3)
@@ -103,53 +253,51 @@ class Dashboard:
         products_container = tk.Frame(right_chart_frame, bg='white')
         products_container.pack(fill='both', expand=True, padx=10, pady=10)
         
-        # Create products chart
-        self.create_top_products_chart(products_container)
-        
-        # Initial chart update
-        self.update_revenue_chart('day', chart_canvas)
+        self.products_fig, self.products_ax = make_figure('Loading...')
+        self.products_canvas = FigureCanvasTkAgg(self.products_fig, products_container)
+        self.products_canvas.get_tk_widget().pack(fill='both', expand=True)
     
-    def update_revenue_chart(self, period, canvas_widget):
-        data = self.service.get_revenue_by_period(period)
-        
-        # Clear previous chart
-        for widget in canvas_widget.winfo_children():
-            widget.destroy()
-        
-        fig, ax = plt.subplots(figsize=(6, 4))
-        
-        if data:
-            dates = [item[list(item.keys())[0]] for item in data]
-            revenues = [float(item['revenue']) for item in data]
-            
-            ax.bar(range(len(dates)), revenues, color=self.main_app.COLOUR4)
-            ax.set_ylabel('Revenue ($)')
-            ax.set_xlabel('Period')
-            ax.set_title(f'Revenue by {period.capitalize()}')
-            
-            # Rotate x-axis labels for better readability
-            plt.xticks(rotation=45)
-            plt.tight_layout()
+    def release_charts(self, event=None):
+        """Free the chart figures once the dashboard is destroyed"""
+        for fig in (self.revenue_fig, self.products_fig):
+            release_figure(fig)
+        self.revenue_canvas = self.products_canvas = None
+    
+    def load_revenue_chart(self, period, initial=True):
+        """Fetch revenue for ``period`` in the background and redraw the chart"""
+        def apply(data, error):
+            # A later period switch may have overtaken this one
+            if period == self.period_var.get():
+                self.update_revenue_chart(period, data or [])
+            if initial:
+                self.results['period'], self.results['revenue'] = period, data
+                self.loaded()
         
-        canvas = FigureCanvasTkAgg(fig, canvas_widget)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
+        self.submit(lambda: self.service.get_revenue_by_period(period), apply)
     
-    def create_top_products_chart(self, parent):
-        data = self.service.get_top_products_by_revenue(10)
+    def update_revenue_chart(self, period, data):
+        labels = [str(item[list(item.keys())[0]]) for item in data]
+        revenues = [float(item['revenue']) for item in data]
         
-        fig, ax = plt.subplots(figsize=(6, 4))
+        ax = self.revenue_ax
+        set_bars(ax, labels, revenues, self.main_app.COLOUR4)
+        ax.set_ylabel('Revenue ($)')
+        ax.set_xlabel('Period')
+        ax.set_title(f'Revenue by {period.capitalize()}')
+        self.revenue_canvas.draw_idle()
+    
+    def fill_top_products_chart(self, data, error):
+        self.update_top_products_chart(data or [])
+        self.results['top_products'] = data
+        self.loaded()
+    
+    def update_top_products_chart(self, data):
+        products = [item['ProductName'][:15] + '...' if len(item['ProductName']) > 15 else item['ProductName'] 
+                   for item in data]
+        revenues = [float(item['revenue']) for item in data]
         
-        if data:
-            products = [item['ProductName'][:15] + '...' if len(item['ProductName']) > 15 else item['ProductName'] 
-                       for item in data]
-            revenues = [float(item['revenue']) for item in data]
-            
-            ax.barh(products, revenues, color=self.main_app.COLOUR4)
-            ax.set_xlabel('Revenue ($)')
-            ax.set_title('Top Products by Revenue')
-            plt.tight_layout()
-        
-        canvas = FigureCanvasTkAgg(fig, parent)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
\ No newline at end of file
+        ax = self.products_ax
+        set_bars(ax, products, revenues, self.main_app.COLOUR4, horizontal=True)
+        ax.set_xlabel('Revenue ($)')
+        ax.set_title('Top Products by Revenue')
+        self.products_canvas.draw_idle()
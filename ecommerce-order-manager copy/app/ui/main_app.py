@@ -1,6 +1,9 @@
 from tkinter import *
 from tkinter import ttk
-import threading
+import time
+from app.db.connection import close_pool, init_database_async
+from app.services.dashboard_service import DashboardService, SearchService
+from app.services.search_index import save_index, warm_index
 from app.ui.components.constants import ConstMeta
 from app.ui.components.navigation import NavigationPanel
 from app.ui.components.customer_forms import CustomerForms
@@ -23,12 +26,22 @@ class eCommerce(metaclass=ConstMeta):
     COLOUR4 = "#9c8870"  # Brown
     COLOUR5 = "#002b4a"  # Dark blue
     
-    def __init__(self, root: Tk) -> None:
+    def __init__(self, root: Tk, started_at=None) -> None:
         self.root = root
+        self.started_at = started_at if started_at is not None else time.perf_counter()
         self.setup_window()
         self.create_widgets()
         self.setup_styles()
-        self.show_loading_screen()
+        
+        # Show the last saved dashboard (marked stale) instead of a loading
+        # screen; it is refreshed in place once the database is ready
+        self.loading_progress = None
+        self.dashboard = None
+        snapshot = DashboardService.load_snapshot()
+        if snapshot is not None:
+            self.show_dashboard(snapshot)
+        else:
+            self.show_loading_screen()
         
         # Initialize form handlers
         self.customer_forms = CustomerForms(self)
@@ -40,12 +53,30 @@ class eCommerce(metaclass=ConstMeta):
         # Properly handle window closing
         self.root.protocol("WM_DELETE_WINDOW", self.quit_app)
         
-        # Load data after a short delay to show loading screen
-        self.root.after(100, self.finish_loading)
+        # Navigation is usable right away; only the dashboard waits for the database
+        self.nav_panel = NavigationPanel(self.F1, self)
+        self.nav_panel.show()
+        self.root.after_idle(self.report_first_paint)
+        
+        # Warm up the connection pool in the background
+        init_database_async(
+            progress=lambda fraction, message: self.root.after(0, lambda: self.update_loading(fraction, message)),
+            done=lambda error: self.root.after(0, lambda: self.finish_loading(error))
+        )
     
     def quit_app(self):
         """Properly quit the application"""
         print("Shutting down application...")  # Debug
+        Dashboard.executor.shutdown(wait=False, cancel_futures=True)
+        SearchAndFilter.executor.shutdown(wait=False, cancel_futures=True)
+        stats = SearchService.cache_stats()
+        print(f"Search cache: {stats['hit_rate']:.0%} hit rate, {stats['entries']} entries, "
+              f"{stats['bytes'] / 1024:.0f} KiB")
+        try:
+            save_index()
+        except Exception as e:
+            print(f"Could not save the search index: {e}")
+        close_pool()
         self.root.quit()     # Stop the mainloop
         self.root.destroy()  # Destroy all widgets
         # Force exit if needed (uncomment if still having issues)
@@ -133,21 +164,56 @@ class eCommerce(metaclass=ConstMeta):
         Label(loading_frame, text="E-commerce Order Manager", 
               font=(self.FONT, 24, "bold"), bg=self.COLOUR4, fg="white").pack(pady=50)
         
-        Label(loading_frame, text="Loading...", 
-              font=(self.FONT, 14), bg=self.COLOUR4, fg="white").pack()
+        self.loading_label = Label(loading_frame, text="Loading...", 
+                                   font=(self.FONT, 14), bg=self.COLOUR4, fg="white")
+        self.loading_label.pack()
         
-        # Progress bar
-        self.loading_progress = ttk.Progressbar(loading_frame, mode='indeterminate')
+        # Progress bar, driven by the database warm-up
+        self.loading_progress = ttk.Progressbar(loading_frame, mode='determinate', maximum=100)
         self.loading_progress.pack(pady=20, ipadx=200)
-        self.loading_progress.start()
         
         Label(loading_frame, text="Please wait while we load your data...", 
               font=(self.FONT, 10), bg=self.COLOUR4, fg="white").pack()
     
-    def finish_loading(self):
-        """Finish loading and show main screen"""
-        self.loading_progress.stop()
-        self.mainScreen()
+    def report_first_paint(self):
+        """Record how long it took from process start to the first drawn window"""
+        self.first_paint_ms = (time.perf_counter() - self.started_at) * 1000
+        print(f"Startup: first paint after {self.first_paint_ms:.0f} ms")
+        if self.dashboard is not None and self.dashboard.is_stale():
+            print(f"Startup: saved dashboard shown after {self.first_paint_ms:.0f} ms")
+    
+    def loading_screen_shown(self):
+        return self.loading_progress is not None and self.loading_progress.winfo_exists()
+    
+    def update_loading(self, fraction, message):
+        """Show database warm-up progress on the loading screen"""
+        if not self.loading_screen_shown():
+            return
+        self.loading_progress['value'] = fraction * 100
+        self.loading_label.config(text=message)
+        self.update_status(message)
+    
+    def finish_loading(self, error=None):
+        """Finish loading and show the dashboard once the database is ready"""
+        ready_ms = (time.perf_counter() - self.started_at) * 1000
+        print(f"Startup: database ready after {ready_ms:.0f} ms")
+        
+        if error is not None:
+            if self.loading_screen_shown():
+                self.loading_label.config(text="Could not connect to the database")
+            elif self.dashboard is not None and self.dashboard.is_stale():
+                self.dashboard.show_refresh_failed()
+            self.update_status(f"Database unavailable: {error}")
+            return
+        
+        # Load or build the search index in the background; searches use LIKE until it is ready
+        warm_index()
+        
+        # Only switch to the dashboard if the user has not navigated away
+        if self.loading_screen_shown():
+            self.mainScreen()
+        elif self.dashboard is not None and self.dashboard.is_stale():
+            self.dashboard.load_data()
         self.update_status("Application ready")
     
     def update_status(self, message):
@@ -180,12 +246,12 @@ class eCommerce(metaclass=ConstMeta):
         self.show_dashboard()
     
     # Navigation methods
-    def show_dashboard(self):
+    def show_dashboard(self, snapshot=None):
         self.update_status("Loading dashboard...")
         for widget in self.F2.winfo_children():
             widget.destroy()
-        dashboard = Dashboard(self.F2, self)
-        dashboard.show()
+        self.dashboard = Dashboard(self.F2, self)
+        self.dashboard.show(snapshot)
         self.update_status("Dashboard loaded")
     
     def show_search(self):
@@ -1,12 +1,36 @@
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from tkinter import ttk
-from app.services.dashboard_service import SearchService
+from tkinter import messagebox
+from app.services.dashboard_service import SearchService, SEARCH_MODES, SEARCH_TABLES
+from mysql.connector import Error
 
 class SearchAndFilter:
+    # Searches run one at a time off the Tk thread; queued ones are cancelled when superseded
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="search")
+    DEBOUNCE_MS = 250   # Wait for a pause in typing before searching
+    MIN_TYPED_CHARS = 2  # Shorter terms are only searched on Enter/click
+    PAGE_SIZE = 100      # Rows fetched per tab; more are loaded when scrolling near the end
+    LOAD_MORE_AT = 0.9   # Fraction of a tab scrolled past that loads the next page
+    # Filtered Orders columns and the filter_orders sort keys their headings sort by
+    FILTER_SORT_KEYS = {'OrderID': 'id', 'CustomerName': 'customer', 'OrderDate': 'date',
+                        'OrderStatus': 'status', 'TotalAmount': 'total'}
+    
     def __init__(self, parent_frame, main_app):
         self.parent = parent_frame
         self.main_app = main_app
         self.service = SearchService()
+        self.search_id = 0        # Increases with every search; older results are dropped
+        self.pending_search = None
+        self.pending_future = None
+        self.last_search = None   # (term, mode, results) of the last complete result set
+        self.current_search = None  # (term, mode) shown in the result tabs
+        self.pages = {}           # table -> {'loaded', 'total', 'done', 'loading'}
+        self.filter_id = 0        # Increases with every filter run or re-sort; older pages are dropped
+        self.filters = None       # filter_orders arguments of the orders in the Filtered Orders tab
+        self.filter_sort = ('date', True)  # (sort key, descending)
+        self.filter_page = None   # {'last_key', 'has_next', 'loading'} of the filtered orders shown
         
     def show(self):
         # Clear existing widgets
@@ -38,8 +62,21 @@ class SearchAndFilter:
                               command=self.perform_global_search)
         search_btn.pack(side='left')
         
-        # Bind Enter key to search
+        self.search_status = tk.Label(search_container, text="", font=(self.main_app.FONT, 9),
+                                      bg=self.main_app.COLOUR3, fg=self.main_app.COLOUR5)
+        
+        # Search mode: exact substring or fulltext (FULLTEXT indexes, by relevance)
+        self.mode_var = tk.StringVar(value=SEARCH_MODES['substring'])
+        mode_combo = ttk.Combobox(search_container, textvariable=self.mode_var,
+                                values=list(SEARCH_MODES.values()),
+                                state='readonly', width=22)
+        mode_combo.pack(side='left', padx=(10, 0))
+        mode_combo.bind('<<ComboboxSelected>>', lambda e: self.schedule_search())
+        self.search_status.pack(side='left', padx=(10, 0))
+        
+        # Bind Enter key to search; typing searches after a short pause
         search_entry.bind('<Return>', lambda e: self.perform_global_search())
+        self.search_var.trace_add('write', lambda *args: self.schedule_search())
     
     def create_filters(self):
         filter_frame = tk.Frame(self.parent, bg=self.main_app.COLOUR3, pady=10)
@@ -120,16 +157,7 @@ class SearchAndFilter:
 
     def show_all_orders(self):
         """Show all orders without any filters"""
-        results = self.service.filter_orders()  # Call without any parameters
-        
-        # Update filtered orders table
-        self.filtered_orders_table.delete(*self.filtered_orders_table.get_children())
-        for order in results:
-            self.filtered_orders_table.insert("", "end", values=(
-                order['OrderID'], order['CustomerName'], 
-                order['OrderDate'], order['OrderStatus'],
-                f"${order['TotalAmount']:.2f}" if order['TotalAmount'] else "$0.00"
-            ))
+        self.run_filter({})
     
     def create_results_section(self):
         # Results notebook
@@ -151,29 +179,36 @@ class SearchAndFilter:
         self.results_notebook.add(self.orders_frame, text="Orders")
         self.setup_orders_table()
         
+        # Order lines tab, filled when an exact order ID is searched
+        self.lines_frame = tk.Frame(self.results_notebook)
+        self.results_notebook.add(self.lines_frame, text="Order Lines")
+        self.setup_lines_table()
+        
         # Filtered orders tab
         self.filtered_orders_frame = tk.Frame(self.results_notebook)
         self.results_notebook.add(self.filtered_orders_frame, text="Filtered Orders")
         self.setup_filtered_orders_table()
     
     def setup_customers_table(self):
-        columns = ("CustomerID", "CustomerName")
+        columns = ("CustomerID", "CustomerName", "Score")
         self.customers_table = ttk.Treeview(self.customers_frame, columns=columns, show="headings")
         
         for col in columns:
             self.customers_table.heading(col, text=col)
             self.customers_table.column(col, width=200)
         
+        self.add_paging(self.customers_frame, self.customers_table, partial(self.load_more, 'customers'))
         self.customers_table.pack(fill='both', expand=True)
     
     def setup_products_table(self):
-        columns = ("ProductID", "ProductName", "Price")
+        columns = ("ProductID", "ProductName", "Price", "Score")
         self.products_table = ttk.Treeview(self.products_frame, columns=columns, show="headings")
         
         for col in columns:
             self.products_table.heading(col, text=col)
             self.products_table.column(col, width=150)
         
+        self.add_paging(self.products_frame, self.products_table, partial(self.load_more, 'products'))
         self.products_table.pack(fill='both', expand=True)
     
     def setup_orders_table(self):
@@ -184,46 +219,226 @@ class SearchAndFilter:
             self.orders_table.heading(col, text=col)
             self.orders_table.column(col, width=150)
         
+        self.add_paging(self.orders_frame, self.orders_table, partial(self.load_more, 'orders'))
         self.orders_table.pack(fill='both', expand=True)
     
+    def add_paging(self, frame, tree, load_more):
+        """Scrollbar for a result tab that calls load_more near the end"""
+        scrollbar = ttk.Scrollbar(frame, orient='vertical', command=tree.yview)
+        scrollbar.pack(side='right', fill='y')
+        
+        def on_scroll(first, last):
+            scrollbar.set(first, last)
+            if float(last) >= self.LOAD_MORE_AT:
+                load_more()
+        
+        tree.configure(yscrollcommand=on_scroll)
+    
+    def setup_lines_table(self):
+        columns = ("ProductID", "ProductName", "Quantity", "Price", "LineTotal")
+        self.lines_table = ttk.Treeview(self.lines_frame, columns=columns, show="headings")
+        
+        for col in columns:
+            self.lines_table.heading(col, text=col)
+            self.lines_table.column(col, width=120)
+        
+        self.lines_table.pack(fill='both', expand=True)
+    
     def setup_filtered_orders_table(self):
         columns = ("OrderID", "CustomerName", "OrderDate", "OrderStatus", "TotalAmount")
         self.filtered_orders_table = ttk.Treeview(self.filtered_orders_frame, columns=columns, show="headings")
         
         for col in columns:
-            self.filtered_orders_table.heading(col, text=col)
+            # Headings re-sort on the server, which reads the sort's index from the top
+            self.filtered_orders_table.heading(col, text=col, command=partial(self.sort_filtered_orders, col))
             self.filtered_orders_table.column(col, width=120)
         
+        # The new table starts empty; pages still loading for the last one are dropped
+        self.filters = None
+        self.filter_page = None
+        self.filter_id += 1
+        self.show_sort_arrow()
+        self.add_paging(self.filtered_orders_frame, self.filtered_orders_table, self.load_more_filtered)
         self.filtered_orders_table.pack(fill='both', expand=True)
     
-    def perform_global_search(self):
+    def schedule_search(self):
+        """Debounce keystrokes: search once typing has paused for DEBOUNCE_MS"""
+        if self.pending_search is not None:
+            self.main_app.root.after_cancel(self.pending_search)
+        self.pending_search = self.main_app.root.after(self.DEBOUNCE_MS, self.search_as_you_type)
+    
+    def search_as_you_type(self):
+        self.pending_search = None
+        if not self.customers_table.winfo_exists():
+            return
+        if len(self.search_var.get().strip()) >= self.MIN_TYPED_CHARS:
+            self.perform_global_search(refine=True)
+    
+    def selected_mode(self):
+        return next(mode for mode, label in SEARCH_MODES.items() if label == self.mode_var.get())
+    
+    def perform_global_search(self, refine=False):
+        """Search on the worker thread; with refine=True an extension of the last
+        term is filtered from the last result set instead of queried again"""
         search_term = self.search_var.get().strip()
         if not search_term:
             return
+        mode = self.selected_mode()
+        if self.pending_search is not None:
+            self.main_app.root.after_cancel(self.pending_search)
+            self.pending_search = None
+        
+        self.search_id += 1
+        search_id = self.search_id
+        self.pages = {}  # Stop loading more pages of the previous results
+        if self.pending_future is not None:
+            self.pending_future.cancel()  # Only succeeds while it is still queued
+            self.pending_future = None
+        
+        refined = self.refine_last_search(search_term, mode) if refine else None
+        if refined is not None:
+            self.current_search = (search_term, mode)
+            self.show_search_results(refined, "refined")
+            return
         
-        results = self.service.global_search(search_term)
-        
-        # Update customers table
-        self.customers_table.delete(*self.customers_table.get_children())
-        for customer in results['customers']:
-            self.customers_table.insert("", "end", values=(
-                customer['CustomerID'], customer['CustomerName']
-            ))
-        
-        # Update products table
-        self.products_table.delete(*self.products_table.get_children())
-        for product in results['products']:
-            self.products_table.insert("", "end", values=(
-                product['ProductID'], product['ProductName'], product['Price']
+        self.search_status.config(text="Searching...")
+        limit = self.PAGE_SIZE
+        
+        def deliver(future):
+            if future.cancelled():
+                return
+            error = future.exception()
+            result = None if error else future.result()
+            try:
+                self.main_app.root.after(0, lambda: self.deliver_search(search_id, search_term, mode, result, error))
+            except (RuntimeError, tk.TclError):
+                pass  # The window was closed while the query ran
+        
+        self.pending_future = self.executor.submit(self.service.global_search, search_term, limit, mode)
+        self.pending_future.add_done_callback(deliver)
+    
+    def deliver_search(self, search_id, search_term, mode, results, error):
+        # Drop results of outdated keystrokes and of a screen that was navigated away from
+        if search_id != self.search_id or not self.customers_table.winfo_exists():
+            return
+        self.pending_future = None
+        if error is not None:
+            self.search_status.config(text="")
+            messagebox.showerror("Search failed", f"Error: {getattr(error, 'msg', error)}")
+            return
+        complete = all(results['totals'][table] == (len(results[table]), False) for table in SEARCH_TABLES)
+        # ID searches are key lookups, not name matches a longer term could be filtered from
+        complete = complete and not self.service.is_id_search(search_term)
+        self.last_search = (search_term, mode, results) if complete else None
+        self.current_search = (search_term, mode)
+        self.show_search_results(results)
+    
+    def refine_last_search(self, search_term, mode):
+        """Results for search_term filtered from the last result set, or None.
+        
+        Only exact-substring results can be refined: every match of a longer
+        term is also a match of its prefix, so a complete (not truncated)
+        result set for the prefix contains all of them.
+        """
+        if self.last_search is None:
+            return None
+        last_term, last_mode, results = self.last_search
+        term = search_term.lower()
+        if mode != 'substring' or last_mode != mode or not term.startswith(last_term.lower()):
+            return None
+        if self.service.is_id_search(search_term):
+            return None  # Query it: IDs are looked up by key, and a full order ID also brings its lines
+        refined = {
+            'customers': [row for row in results['customers'] if term in row['CustomerName'].lower()],
+            'products': [row for row in results['products'] if term in row['ProductName'].lower()],
+            'orders': [row for row in results['orders']
+                       if term in row['OrderID'].lower() or term in (row['CustomerName'] or '').lower()],
+        }
+        refined['totals'] = {table: (len(rows), False) for table, rows in refined.items()}
+        return refined
+    
+    def show_search_results(self, results, note=None):
+        """Show the first page of every tab"""
+        self.pages = {}
+        for table in SEARCH_TABLES:
+            tree = self.result_table(table)
+            tree.delete(*tree.get_children())
+            total, capped = results['totals'][table]
+            self.pages[table] = {'loaded': 0, 'total': (total, capped), 'loading': False,
+                                 'done': not capped and len(results[table]) >= total}
+            self.add_results(table, results[table])
+        
+        self.lines_table.delete(*self.lines_table.get_children())
+        for line in results.get('lines', []):
+            self.lines_table.insert("", "end", values=(
+                line['ProductID'], line['ProductName'], line['Quantity'],
+                line['Price'], f"${line['LineTotal']:.2f}"
             ))
+        if results.get('lines'):
+            self.results_notebook.select(self.lines_frame)
         
-        # Update orders table
-        self.orders_table.delete(*self.orders_table.get_children())
-        for order in results['orders']:
-            self.orders_table.insert("", "end", values=(
-                order['OrderID'], order['CustomerName'], 
-                order['OrderDate'], order['OrderStatus']
-            ))
+        count = sum(total for total, _ in results['totals'].values())
+        capped = any(capped for _, capped in results['totals'].values())
+        self.search_status.config(text=f"{count}{'+' if capped else ''} results" + (f" ({note})" if note else ""))
+    
+    def result_table(self, table):
+        return {'customers': self.customers_table, 'products': self.products_table,
+                'orders': self.orders_table}[table]
+    
+    def add_results(self, table, rows):
+        tree = self.result_table(table)
+        for row in rows:
+            if table == 'customers':
+                values = (row['CustomerID'], row['CustomerName'], row.get('Score', ""))
+            elif table == 'products':
+                values = (row['ProductID'], row['ProductName'], row['Price'], row.get('Score', ""))
+            else:
+                values = (row['OrderID'], row['CustomerName'], row['OrderDate'], row['OrderStatus'])
+            tree.insert("", "end", values=values)
+        
+        page = self.pages[table]
+        page['loaded'] += len(rows)
+        total, capped = page['total']
+        if not capped and page['loaded'] >= total:
+            page['done'] = True
+        frame = tree.master
+        self.results_notebook.tab(frame, text=f"{table.capitalize()} ({total}{'+' if capped else ''})")
+    
+    def load_more(self, table):
+        """Fetch the next page of a result tab on the worker thread"""
+        page = self.pages.get(table)
+        if page is None or page['done'] or page['loading'] or self.current_search is None:
+            return
+        page['loading'] = True
+        search_term, mode = self.current_search
+        search_id = self.search_id
+        
+        def deliver(future):
+            if future.cancelled():
+                return
+            error = future.exception()
+            result = None if error else future.result()
+            try:
+                self.main_app.root.after(0, lambda: self.deliver_page(search_id, table, result, error))
+            except (RuntimeError, tk.TclError):
+                pass  # The window was closed while the query ran
+        
+        self.executor.submit(self.service.global_search, search_term, self.PAGE_SIZE, mode,
+                             {table: page['loaded']}).add_done_callback(deliver)
+    
+    def deliver_page(self, search_id, table, results, error):
+        if search_id != self.search_id or not self.customers_table.winfo_exists():
+            return
+        page = self.pages[table]
+        page['loading'] = False
+        if error is not None:
+            print(f"Search: loading more {table} failed: {error}")
+            page['done'] = True
+            return
+        rows = results[table]
+        if len(rows) < self.PAGE_SIZE:
+            page['done'] = True
+        self.add_results(table, rows)
     
     def apply_filters(self):
         # Get filter values with debug prints
@@ -246,30 +461,93 @@ class SearchAndFilter:
         # Debug: Print what filters are being applied
         print(f"Applying filters - Status: {status}, Start: {start_date}, End: {end_date}, Min Price: {min_price}, Max Price: {max_price}")  # Debug
         
-        results = self.service.filter_orders(
-            status=status,
-            start_date=start_date,
-            end_date=end_date,
-            min_price=min_price,
-            max_price=max_price
-        )
-        
-        print(f"Filter returned {len(results)} results")  # Debug
-        
-        # Update filtered orders table
+        self.run_filter({
+            'status': status,
+            'start_date': start_date,
+            'end_date': end_date,
+            'min_price': min_price,
+            'max_price': max_price,
+        })
+    
+    def run_filter(self, filters):
+        """Show the first page of the orders matching filters, in the current sort"""
+        self.filters = filters
+        self.filter_id += 1
+        self.filter_page = {'last_key': None, 'has_next': True, 'loading': False}
         self.filtered_orders_table.delete(*self.filtered_orders_table.get_children())
-        for order in results:
+        self.load_more_filtered()
+    
+    def sort_filtered_orders(self, column):
+        """Sort by a heading's column; clicking the sorted column again reverses it"""
+        sort = self.FILTER_SORT_KEYS[column]
+        current, descending = self.filter_sort
+        # Newest and largest first, names and IDs from A
+        self.filter_sort = (sort, not descending if sort == current else sort in ('date', 'total'))
+        self.show_sort_arrow()
+        if self.filters is not None:
+            self.run_filter(self.filters)
+    
+    def show_sort_arrow(self):
+        sort, descending = self.filter_sort
+        for column, key in self.FILTER_SORT_KEYS.items():
+            arrow = (" ▼" if descending else " ▲") if key == sort else ""
+            self.filtered_orders_table.heading(column, text=column + arrow)
+    
+    def load_more_filtered(self):
+        """Fetch the next page of filtered orders on the worker thread"""
+        page = self.filter_page
+        if page is None or not page['has_next'] or page['loading']:
+            return
+        page['loading'] = True
+        sort, descending = self.filter_sort
+        filter_id = self.filter_id
+        
+        def deliver(future):
+            if future.cancelled():
+                return
+            error = future.exception()
+            result = None if error else future.result()
+            try:
+                self.main_app.root.after(0, lambda: self.deliver_filter_page(filter_id, result, error))
+            except (RuntimeError, tk.TclError):
+                pass  # The window was closed while the query ran
+        
+        self.executor.submit(self.service.filter_orders, **self.filters, sort=sort, descending=descending,
+                             limit=self.PAGE_SIZE, after=page['last_key']).add_done_callback(deliver)
+    
+    def deliver_filter_page(self, filter_id, result, error):
+        # Drop pages of an earlier filter or sort and of a screen that was navigated away from
+        if filter_id != self.filter_id or not self.filtered_orders_table.winfo_exists():
+            return
+        page = self.filter_page
+        page['loading'] = False
+        first_page = page['last_key'] is None
+        if error is not None:
+            page['has_next'] = False
+            if first_page:
+                messagebox.showerror("Filter failed", f"Error: {getattr(error, 'msg', error)}")
+            else:
+                print(f"Filter: loading more orders failed: {error}")
+            return
+        page['last_key'], page['has_next'] = result['last_key'], result['has_next']
+        
+        for order in result['rows']:
             self.filtered_orders_table.insert("", "end", values=(
                 order['OrderID'], order['CustomerName'], 
                 order['OrderDate'], order['OrderStatus'],
                 f"${order['TotalAmount']:.2f}" if order['TotalAmount'] else "$0.00"
             ))
         
-        # If no results, show a message
-        if len(results) == 0:
-            self.filtered_orders_table.insert("", "end", values=(
-                "No orders found", "Try different filters", "", "", ""
-            ))
+        if first_page:
+            count, capped = result['total']
+            count = f"{count}{'+' if capped else ''}"
+            print(f"Filter returned {count} results")  # Debug
+            self.results_notebook.tab(self.filtered_orders_frame, text=f"Filtered Orders ({count})")
+            # If no results, show a message
+            if not result['rows']:
+                self.filtered_orders_table.insert("", "end", values=(
+                    "No orders found", "Try different filters", "", "", ""
+                ))
     
     def clear_filters(self):
         self.status_var.set('')
@@ -277,4 +555,8 @@ class SearchAndFilter:
         self.end_date_var.set('')
         self.min_price_var.set('')
         self.max_price_var.set('')
-        self.filtered_orders_table.delete(*self.filtered_orders_table.get_children())
\ No newline at end of file
+        self.filters = None
+        self.filter_id += 1
+        self.filter_page = None
+        self.filtered_orders_table.delete(*self.filtered_orders_table.get_children())
+        self.results_notebook.tab(self.filtered_orders_frame, text="Filtered Orders")
\ No newline at end of file
@@ -0,0 +1,107 @@
+# analytics_engine.py
+"""Dashboard aggregates and the sales report: MySQL versus the columnar engine.
+
+Loads synthetic data, times every aggregate on both engines (the dashboard
+cache is cleared before each SQL call), checks that they agree, and times an
+incremental refresh after a few new orders:
+    python -m benchmarks.analytics_engine --orders 1000000
+"""
+import argparse
+import statistics
+import time
+from app.models.order_model import create_orders_bulk
+from app.models.quantity_model import create_quantities_bulk
+from app.services.analytics_engine import AnalyticsEngine, available
+from app.services.dashboard_service import DashboardService
+from app.services.export_service import SALES_REPORT_QUERY
+from app.db.events import subscribe, unsubscribe
+from app.db.streaming import stream_rows
+from benchmarks import synthetic
+
+
+def sql_sales_report():
+    # What ExportService.export_sales_report writes, without the file
+    return list(stream_rows(SALES_REPORT_QUERY))
+
+
+def sql(fetch):
+    def run():
+        DashboardService.invalidate()
+        return fetch()
+    return run
+
+
+def timed(fetch, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fetch()
+        timings.append((time.perf_counter() - started) * 1000)
+    return result, statistics.median(timings)
+
+
+def comparable(rows):
+    # Sorted, since rows with equal revenue may come back in either order
+    return sorted(tuple(str(value) for value in row.values()) for row in rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=1000000)
+    parser.add_argument("--customers", type=int, default=100000)
+    parser.add_argument("--products", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="leave the synthetic rows in place")
+    args = parser.parse_args()
+    if not available():
+        raise SystemExit("NumPy is not installed")
+
+    DashboardService.engine = 'sql'
+    engine = AnalyticsEngine()
+    synthetic.cleanup()
+    try:
+        synthetic.populate(args.orders, args.customers, args.products)
+        subscribe(engine.on_write)
+
+        started = time.perf_counter()
+        engine.refresh()
+        print(f"Columnar load: {time.perf_counter() - started:.1f} s "
+              f"({len(engine.line_qty)} lines, {len(engine.orders)} orders)\n")
+
+        cases = [("revenue by day", sql(lambda: DashboardService.get_revenue_by_period('day')),
+                  lambda: engine.revenue_by_period('day')),
+                 ("revenue by week", sql(lambda: DashboardService.get_revenue_by_period('week')),
+                  lambda: engine.revenue_by_period('week')),
+                 ("revenue by month", sql(lambda: DashboardService.get_revenue_by_period('month')),
+                  lambda: engine.revenue_by_period('month')),
+                 ("top products", sql(lambda: DashboardService.get_top_products_by_revenue(10)),
+                  lambda: engine.top_products(10)),
+                 ("kpis", sql(DashboardService.get_kpis), engine.kpis),
+                 ("sales report", sql_sales_report, engine.sales_report)]
+
+        print(f"{'aggregate':<18} {'sql ms':>10} {'columnar ms':>12} {'speed-up':>9}")
+        for label, run_sql, run_engine in cases:
+            expected, sql_ms = timed(run_sql, args.repeat)
+            got, engine_ms = timed(run_engine, args.repeat)
+            note = ""
+            if isinstance(got, list) and comparable(got) != comparable(expected):
+                note = "  (results differ)"
+            print(f"{label:<18} {sql_ms:>10.1f} {engine_ms:>12.2f} {sql_ms / engine_ms:>8.0f}x{note}")
+
+        # Incremental refresh after a handful of new orders
+        new = args.orders
+        orders = synthetic.order_rows(new + 100, args.customers)[new:]
+        lines = synthetic.quantity_rows(new + 100, args.products)[3 * new:]
+        create_orders_bulk(orders)
+        create_quantities_bulk(lines)
+        started = time.perf_counter()
+        engine.refresh()
+        print(f"\nIncremental refresh after 100 new orders: {(time.perf_counter() - started) * 1000:.1f} ms")
+    finally:
+        unsubscribe(engine.on_write)
+        if not args.keep:
+            synthetic.cleanup()
+
+
+if __name__ == "__main__":
+    main()
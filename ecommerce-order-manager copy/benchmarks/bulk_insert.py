@@ -0,0 +1,61 @@
+# bulk_insert.py
+"""Rows/second of the single-row create_* functions versus the bulk ones.
+
+Run from the project directory against a scratch database:
+    python -m benchmarks.bulk_insert --rows 50000 --single-rows 2000
+"""
+import argparse
+import time
+from app.models.customer_model import create_customer, create_customers_bulk
+from app.models.product_model import create_product, create_products_bulk
+from app.models.order_model import create_order, create_orders_bulk
+from app.models.quantity_model import create_quantity, create_quantities_bulk
+from benchmarks import synthetic
+
+
+def timed(label, count, func):
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {count:>8} rows  {elapsed:8.2f} s  {count / elapsed:>10.0f} rows/s")
+    return result
+
+
+def run_single(rows, create):
+    for row in rows:
+        create(*row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50000, help="rows per table for the bulk path")
+    parser.add_argument("--single-rows", type=int, default=2000, help="rows per table for the single-row path")
+    args = parser.parse_args()
+
+    customers = synthetic.customer_rows(args.rows)
+    products = synthetic.product_rows(args.rows)
+    orders = synthetic.order_rows(args.rows, args.rows)
+    quantities = synthetic.quantity_rows(args.rows, args.rows)
+
+    synthetic.cleanup()
+    try:
+        n = args.single_rows
+        timed("create_customer", n, lambda: run_single(customers[:n], create_customer))
+        timed("create_product", n, lambda: run_single(products[:n], create_product))
+        timed("create_order", n, lambda: run_single(orders[:n], create_order))
+        timed("create_quantity", 3 * n, lambda: run_single(quantities[:3 * n], create_quantity))
+        synthetic.cleanup()
+
+        for label, rows, create in (("create_customers_bulk", customers, create_customers_bulk),
+                                    ("create_products_bulk", products, create_products_bulk),
+                                    ("create_orders_bulk", orders, create_orders_bulk),
+                                    ("create_quantities_bulk", quantities, create_quantities_bulk)):
+            report = timed(label, len(rows), lambda: create(rows))
+            if report['errors']:
+                print(f"  {len(report['errors'])} rejected, first: {report['errors'][0]}")
+    finally:
+        synthetic.cleanup()
+
+
+if __name__ == "__main__":
+    main()
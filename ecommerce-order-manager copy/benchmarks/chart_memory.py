@@ -0,0 +1,99 @@
+# chart_memory.py
+"""Memory growth of the dashboard revenue chart across period switches.
+
+Compares the old approach (a new pyplot figure per switch, never closed)
+with one persistent Figure updated through app.ui.charts.set_bars. Needs no
+database or display: charts are rendered with the Agg backend.
+    python -m benchmarks.chart_memory --switches 100
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import date, timedelta
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+plt.rcParams['figure.max_open_warning'] = 0  # the leak is what is being measured
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from app.ui.charts import make_figure, set_bars
+
+PERIODS = ('day', 'week', 'month')
+COLOUR = "#9c8870"
+
+
+def sample_data(period):
+    """Revenue rows shaped like the dashboard queries return them"""
+    count = 30 if period == 'day' else 12
+    start = date(2025, 1, 1)
+    return [{period: str(start + timedelta(days=i)), 'revenue': 100 + (i * 37) % 250}
+            for i in range(count)]
+
+
+def old_update(period, data):
+    fig, ax = plt.subplots(figsize=(6, 4))
+    ax.bar(range(len(data)), [float(item['revenue']) for item in data], color=COLOUR)
+    ax.set_title(f'Revenue by {period.capitalize()}')
+    plt.xticks(rotation=45)
+    plt.tight_layout()
+    FigureCanvasAgg(fig).draw()
+
+
+def persistent_chart():
+    fig, ax = make_figure()
+    canvas = FigureCanvasAgg(fig)
+
+    def update(period, data):
+        set_bars(ax, [item[period] for item in data], [float(item['revenue']) for item in data], COLOUR)
+        ax.set_title(f'Revenue by {period.capitalize()}')
+        canvas.draw()
+    return update
+
+
+def switch(update, datasets, i):
+    period = PERIODS[i % len(PERIODS)]
+    update(period, datasets[period])
+
+
+def measure(label, make_update, switches, report_every):
+    datasets = {period: sample_data(period) for period in PERIODS}
+    print(label)
+
+    # Allocation tracing slows rendering down, so time is measured in a separate pass
+    update = make_update()
+    update('day', datasets['day'])  # warm-up: fonts, caches
+    started = time.perf_counter()
+    for i in range(1, switches + 1):
+        switch(update, datasets, i)
+    per_switch = (time.perf_counter() - started) / switches * 1000
+    plt.close('all')
+
+    update = make_update()
+    update('day', datasets['day'])
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    for i in range(1, switches + 1):
+        switch(update, datasets, i)
+        if i % report_every == 0 or i == switches:
+            gc.collect()
+            grown = tracemalloc.get_traced_memory()[0] - base
+            print(f"  after {i:>4} switches  {grown / 2**20:8.2f} MiB retained"
+                  f"  {len(plt.get_fignums()):>4} pyplot figures open")
+    tracemalloc.stop()
+    plt.close('all')
+    print(f"  {per_switch:.1f} ms per switch")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--switches", type=int, default=100)
+    parser.add_argument("--report-every", type=int, default=25)
+    args = parser.parse_args()
+
+    measure("new figure per switch", lambda: old_update, args.switches, args.report_every)
+    measure("persistent figure", persistent_chart, args.switches, args.report_every)
+
+
+if __name__ == "__main__":
+    main()
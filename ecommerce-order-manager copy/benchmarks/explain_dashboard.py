@@ -0,0 +1,130 @@
+# explain_dashboard.py
+"""EXPLAIN every query constant in app/queries/dashboard_queries.py.
+
+Query templates are filled in (SAMPLE_FORMATS) as SearchService fills them.
+
+Capture plans before and after applying migrations:
+    python -m benchmarks.explain_dashboard --save before
+    python -m app.db.migrate
+    python -m benchmarks.explain_dashboard --save after
+Plans are printed and, with --save, written to docs/explain/<label>.txt.
+"""
+import argparse
+import os
+from app.db.connection import get_connection
+from app.queries import dashboard_queries
+from app.services.dashboard_service import FULLTEXT_MATCH
+from mysql.connector import Error
+
+EXPLAIN_DIR = os.path.join("docs", "explain")
+
+# Sample arguments for queries that take parameters
+SAMPLE_PARAMS = {
+    'GET_TOP_PRODUCTS_BY_REVENUE': (10,),
+    'SEARCH_CUSTOMERS': ('%a%', 100, 0),
+    'SEARCH_PRODUCTS': ('%a%', 100, 0),
+    'SEARCH_ORDERS': ('%a%', '%a%', 100, 0),
+    'COUNT_SEARCH_CUSTOMERS': ('%a%', 1001),
+    'COUNT_SEARCH_PRODUCTS': ('%a%', 1001),
+    'COUNT_SEARCH_ORDERS': ('%a%', '%a%', 1001),
+    'SEARCH_CUSTOMERS_BY_ID_PREFIX': ('C1%', 100, 0),
+    'SEARCH_PRODUCTS_BY_ID_PREFIX': ('P1%', 100, 0),
+    'SEARCH_ORDERS_BY_ID_PREFIX': ('O1%', 100, 0),
+    'COUNT_CUSTOMERS_BY_ID_PREFIX': ('C1%', 1001),
+    'COUNT_PRODUCTS_BY_ID_PREFIX': ('P1%', 1001),
+    'GET_ORDER_WITH_CUSTOMER': ('O000000001',),
+    'GET_ORDER_LINES': ('O000000001',),
+    'COUNT_ORDERS_BY_ID_PREFIX': ('O1%', 1001),
+    'GET_MIGRATION_APPLIED': ('0007',),
+    'SEARCH_CUSTOMERS_FULLTEXT': ('+a*', '+a*', 100, 0),
+    'SEARCH_PRODUCTS_FULLTEXT': ('+a*', '+a*', 100, 0),
+    'SEARCH_ORDERS_FULLTEXT': ('+a*', '+a*', 100),
+    'COUNT_CUSTOMERS_FULLTEXT': ('+a*', 1001),
+    'COUNT_PRODUCTS_FULLTEXT': ('+a*', 1001),
+    'COUNT_ORDERS_FULLTEXT': ('+a*', 1001),
+    'SEARCH_CUSTOMERS_BY_ID': ('C000000001', 'C000000002', 'C000000003'),
+    'SEARCH_PRODUCTS_BY_ID': ('P000000001', 'P000000002', 'P000000003'),
+    'SEARCH_ORDERS_BY_ID': ('O000000001', 'O000000002', 'O000000003'),
+    'SEARCH_ORDERS_BY_CUSTOMER': ('C000000001', 'C000000002', 'C000000003', 100),
+    'COUNT_ORDERS_BY_CUSTOMER': ('C000000001', 'C000000002', 'C000000003', 1001),
+    'COUNT_FILTERED_ORDERS': ('Pending', 10001),
+}
+
+# Placeholders filled in for query templates, as SearchService fills them
+_MATCH = {table: match.format(mode="BOOLEAN MODE") for table, match in FULLTEXT_MATCH.items()}
+_KEYS = ", ".join(["%s"] * 3)
+SAMPLE_FORMATS = {
+    'SEARCH_CUSTOMERS_FULLTEXT': {'match': _MATCH['customers']},
+    'SEARCH_PRODUCTS_FULLTEXT': {'match': _MATCH['products']},
+    'SEARCH_ORDERS_FULLTEXT': {'match': _MATCH['orders']},
+    'COUNT_CUSTOMERS_FULLTEXT': {'match': _MATCH['customers']},
+    'COUNT_PRODUCTS_FULLTEXT': {'match': _MATCH['products']},
+    'COUNT_ORDERS_FULLTEXT': {'match': _MATCH['orders']},
+    'SEARCH_CUSTOMERS_BY_ID': {'keys': _KEYS},
+    'SEARCH_PRODUCTS_BY_ID': {'keys': _KEYS},
+    'SEARCH_ORDERS_BY_ID': {'keys': _KEYS},
+    'SEARCH_ORDERS_BY_CUSTOMER': {'keys': _KEYS},
+    'COUNT_ORDERS_BY_CUSTOMER': {'keys': _KEYS},
+    'COUNT_FILTERED_ORDERS': {'query': dashboard_queries.FILTER_ORDERS + " AND o.OrderStatus = %s"},
+}
+
+
+def query_constants():
+    return [(name, value) for name, value in vars(dashboard_queries).items()
+            if name.isupper() and isinstance(value, str) and "SELECT" in value.upper()]
+
+
+def format_table(columns, rows):
+    cells = [[("NULL" if value is None else str(value)) for value in row] for row in rows]
+    widths = [max(len(column), *(len(row[i]) for row in cells)) for i, column in enumerate(columns)]
+    line = "+".join("-" * (width + 2) for width in widths)
+    out = [" | ".join(column.ljust(width) for column, width in zip(columns, widths)), line]
+    out += [" | ".join(cell.ljust(width) for cell, width in zip(row, widths)) for row in cells]
+    return "\n".join(out)
+
+
+def explain_all(analyze=False):
+    conn = get_connection()
+    cursor = conn.cursor()
+    sections = []
+    try:
+        for name, query in query_constants():
+            if name in SAMPLE_FORMATS:
+                query = query.format(**SAMPLE_FORMATS[name])
+            params = SAMPLE_PARAMS.get(name, ())
+            try:
+                cursor.execute(("EXPLAIN ANALYZE " if analyze else "EXPLAIN ") + query, params or None)
+                rows = cursor.fetchall()
+            except Error as err:
+                # e.g. rollup queries before their migration has been applied
+                sections.append(f"== {name} ==\n(not available: {err.msg})\n")
+                continue
+            if analyze:
+                body = "\n".join(row[0] for row in rows)
+            else:
+                body = format_table(cursor.column_names, rows)
+            sections.append(f"== {name} ==\n{body}\n")
+        return "\n".join(sections)
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--save", metavar="LABEL", help="also write the plans to docs/explain/LABEL.txt")
+    parser.add_argument("--analyze", action="store_true", help="use EXPLAIN ANALYZE (runs the queries)")
+    args = parser.parse_args()
+
+    report = explain_all(args.analyze)
+    print(report)
+    if args.save:
+        os.makedirs(EXPLAIN_DIR, exist_ok=True)
+        path = os.path.join(EXPLAIN_DIR, f"{args.save}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(report)
+        print(f"Saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# filter_paging.py
+"""Sorted order filters: every match at once versus keyset pages.
+
+Loads synthetic orders and, for every sort key of SearchService.filter_orders
+and a few filters, times fetching all matches (as the Filtered Orders tab did
+before it paged), the first page with its count, and a page from the middle
+of the result through its cursor. Then pages through the orders of the last
+30 days (all statuses) for every sort, in both directions and from both the
+stored and the line totals, and checks the pages add up to the full result.
+Apply migration 0006 first for the sort indexes:
+    python -m benchmarks.filter_paging --orders 1000000
+"""
+import argparse
+import statistics
+import time
+from datetime import date, timedelta
+from app.services.dashboard_service import SearchService, FILTER_SORTS
+from benchmarks import synthetic
+
+
+def cases():
+    recent = (date.today() - timedelta(days=90)).isoformat()
+    return [
+        ("no filter", {}),
+        ("pending", {'status': 'Pending'}),
+        ("last 90 days", {'start_date': recent}),
+    ]
+
+
+def fetch(filters, sort, limit=None, after=None, descending=None, source=SearchService._filter_orders_by_total):
+    if descending is None:
+        descending = sort in ('date', 'total')
+    return source(filters.get('status'), filters.get('start_date'), None, None, None,
+                  sort, descending, limit, after)
+
+
+def walk(filters, sort, descending, page_size, source):
+    """OrderIDs of every page from the first on, following the cursors"""
+    ids, after = [], None
+    while True:
+        page = fetch(filters, sort, page_size, after, descending, source)
+        ids.extend(row['OrderID'] for row in page['rows'])
+        if not page['has_next']:
+            return ids
+        after = page['last_key']
+
+
+def check_pages(page_size):
+    filters = {'start_date': (date.today() - timedelta(days=30)).isoformat()}
+    sources = [("stored", SearchService._filter_orders_by_total), ("lines", SearchService._filter_orders_by_lines)]
+    failures = 0
+    for name, source in sources:
+        for sort in FILTER_SORTS:
+            for descending in (False, True):
+                expected = [row['OrderID'] for row in fetch(filters, sort, None, None, descending, source)['rows']]
+                paged = walk(filters, sort, descending, page_size, source)
+                if paged != expected:
+                    failures += 1
+                    print(f"pages differ: {name} totals, sort={sort}, "
+                          f"{'descending' if descending else 'ascending'} ({len(paged)} paged, {len(expected)} expected)")
+    print(f"paging check: {failures} of {len(sources) * len(FILTER_SORTS) * 2} walks differ")
+    return failures
+
+
+def timed(fetch, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fetch()
+        timings.append((time.perf_counter() - started) * 1000)
+    return result, statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=1000000)
+    parser.add_argument("--customers", type=int, default=100000)
+    parser.add_argument("--products", type=int, default=10000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--check-page-size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--keep", action="store_true", help="leave the synthetic rows in place")
+    args = parser.parse_args()
+
+    synthetic.cleanup()
+    try:
+        synthetic.populate(args.orders, args.customers, args.products)
+        print(f"{'filter':<14} {'sort':<9} {'all ms':>9} {'first ms':>9} {'middle ms':>10} {'matches':>8}")
+        for label, filters in cases():
+            for sort in FILTER_SORTS:
+                everything, all_ms = timed(lambda: fetch(filters, sort), args.repeat)
+                rows = everything['rows']
+                first, first_ms = timed(lambda: fetch(filters, sort, args.page_size), args.repeat)
+                # The cursor of the page that starts halfway through the matches
+                middle = rows[len(rows) // 2 - 1] if len(rows) > 1 else None
+                after = tuple(middle[column] for column in FILTER_SORTS[sort]) if middle else None
+                page, middle_ms = timed(lambda: fetch(filters, sort, args.page_size, after), args.repeat)
+
+                note = ""
+                if [row['OrderID'] for row in first['rows']] != [row['OrderID'] for row in rows[:args.page_size]]:
+                    note = "  (first page differs)"
+                elif after and page['rows'] and page['rows'][0]['OrderID'] != rows[len(rows) // 2]['OrderID']:
+                    note = "  (middle page differs)"
+                count, capped = first['total']
+                print(f"{label:<14} {sort:<9} {all_ms:>9.1f} {first_ms:>9.2f} {middle_ms:>10.2f} "
+                      f"{count:>7}{'+' if capped else ' '}{note}")
+        check_pages(args.check_page_size)
+    finally:
+        if not args.keep:
+            synthetic.cleanup()
+
+
+if __name__ == "__main__":
+    main()
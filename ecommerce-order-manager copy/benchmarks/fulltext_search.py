@@ -0,0 +1,92 @@
+# fulltext_search.py
+"""Global search modes on a large catalog: exact substring versus fulltext.
+
+Loads synthetic customers and products (1M each by default) and times
+SearchService.global_search for a few terms in every mode: substring through
+LIKE '%term%' scans, substring through the trigram search index, and the
+natural language and boolean prefix MATCH ... AGAINST modes. The fulltext
+modes need migration 0004:
+    python -m benchmarks.fulltext_search --customers 1000000 --products 1000000
+"""
+import argparse
+import statistics
+import time
+from app.db.connection import get_connection
+from app.services.dashboard_service import SearchService, SEARCH_TABLES
+from app.services.search_index import SearchIndex
+from benchmarks import synthetic
+from mysql.connector import Error
+
+TERMS = ("anya", "calliope lamy", "keyboard", "key", "mic")
+
+
+def timed(fetch, repeat):
+    timings = []
+    for _ in range(repeat):
+        SearchService.cache.invalidate()  # Time the queries, not the result cache
+        started = time.perf_counter()
+        result = fetch()
+        timings.append((time.perf_counter() - started) * 1000)
+    return result, statistics.median(timings)
+
+
+def indexed_search(index, term, limit):
+    """SearchService.global_search(term) answered from ``index``"""
+    offsets = dict.fromkeys(SEARCH_TABLES, 0)
+    results = {table: [] for table in offsets}
+    results['totals'] = {}
+    conn = get_connection()
+    try:
+        with conn.cursor(dictionary=True) as cursor:
+            SearchService._indexed_search(index, cursor, term, limit, 'substring', offsets, results)
+            return results
+    finally:
+        conn.close()
+
+
+def matches(results, table):
+    total, capped = results['totals'][table]
+    return f"{total}+" if capped else str(total)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=100000)
+    parser.add_argument("--customers", type=int, default=1000000)
+    parser.add_argument("--products", type=int, default=1000000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="leave the synthetic rows in place")
+    args = parser.parse_args()
+
+    synthetic.cleanup()
+    try:
+        synthetic.populate(args.orders, args.customers, args.products)
+        index = SearchIndex()
+        index.build()
+
+        modes = (("LIKE substring", lambda term: SearchService.global_search(term, args.limit)),
+                 ("index substring", lambda term: indexed_search(index, term, args.limit)),
+                 ("fulltext", lambda term: SearchService.global_search(term, args.limit, 'fulltext')),
+                 ("boolean prefix", lambda term: SearchService.global_search(term, args.limit, 'prefix')))
+        SearchService.use_index = False
+
+        print(f"{'term':<16} {'mode':<16} {'first page ms':>13} {'customers':>10} {'products':>9} {'orders':>7}")
+        for term in TERMS:
+            for label, search in modes:
+                try:
+                    results, ms = timed(lambda: search(term), args.repeat)
+                except Error as err:
+                    print(f"{term:<16} {label:<16} (not available: {err.msg})")
+                    continue
+                customers, products, orders = (matches(results, table) for table in SEARCH_TABLES)
+                print(f"{term:<16} {label:<16} {ms:>13.1f} {customers:>10} {products:>9} {orders:>7}")
+            print()
+    finally:
+        SearchService.use_index = True
+        if not args.keep:
+            synthetic.cleanup()
+
+
+if __name__ == "__main__":
+    main()
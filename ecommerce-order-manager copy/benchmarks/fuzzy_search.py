@@ -0,0 +1,83 @@
+# fuzzy_search.py
+"""Typo-tolerant name search on the trigram index, without a database.
+
+Builds a TrigramIndex over synthetic customer names (1M by default) and
+reports the build time and size, then the median latency of fuzzy searches
+for misspelled names, with and without NumPy counting the shared trigrams.
+On a smaller sample it checks the top results against scoring every name by
+edit distance:
+    python -m benchmarks.fuzzy_search --names 1000000 --check-size 20000
+"""
+import argparse
+import heapq
+import statistics
+import time
+from app.services import search_index
+from app.services.cache import deep_sizeof
+from app.services.search_index import TrigramIndex, substring_distance
+from benchmarks import synthetic
+
+TERMS = ("airani iofiften", "shigre ui", "yukihan lammy", "momosuzu nen 4242", "hoshimati suisei", "nekomta okayu")
+
+
+def build(names):
+    index = TrigramIndex()
+    for key, name in names:
+        index.add(key, name)
+    return index
+
+
+def timed(fetch, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fetch()
+        timings.append((time.perf_counter() - started) * 1000)
+    return result, statistics.median(timings)
+
+
+def brute_force(names, term, limit):
+    term = term.lower()
+    scored = ((1 - substring_distance(term, name.lower()) / len(term), key) for key, name in names)
+    return heapq.nlargest(limit, scored)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--names", type=int, default=1000000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--check-size", type=int, default=20000)
+    args = parser.parse_args()
+
+    names = synthetic.customer_rows(args.names)
+    started = time.perf_counter()
+    index = build(names)
+    print(f"Build: {time.perf_counter() - started:.1f} s for {args.names} names, "
+          f"{deep_sizeof(index.postings) / 2**20:.0f} MiB of postings\n")
+
+    numpy = search_index.np
+    print(f"{'term':<20} {'numpy ms':>9} {'python ms':>10} {'candidates':>11}  best match")
+    for term in TERMS:
+        search_index.np = numpy
+        (matches, candidates), numpy_ms = timed(lambda: index.fuzzy_search(term, args.limit), args.repeat)
+        search_index.np = None
+        _, python_ms = timed(lambda: index.fuzzy_search(term, args.limit), args.repeat)
+        best = f"{index.texts[index.codes[matches[0][0]]]} ({matches[0][1]})" if matches else "-"
+        numpy_col = f"{numpy_ms:>9.1f}" if numpy is not None else f"{'n/a':>9}"
+        print(f"{term:<20} {numpy_col} {python_ms:>10.1f} {candidates:>11}  {best}")
+    search_index.np = numpy
+
+    # Scores of the index's top results versus scoring every name of a sample
+    sample = names[:args.check_size]
+    sample_index = build(sample)
+    print(f"\nAgainst scoring all {len(sample)} names:")
+    for term in TERMS:
+        expected = [score for score, _ in brute_force(sample, term, args.limit)]
+        got = [score for _, score in sample_index.fuzzy_search(term, args.limit)[0]]
+        found = sum(1 for score in got if expected and score >= round(expected[-1], 3))
+        print(f"{term:<20} {found}/{len(expected)} of the top scores found")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# id_lookup.py
+"""Global search for pasted IDs: primary-key lookups versus LIKE scans.
+
+Loads synthetic data and times SearchService.global_search for full
+customer, product and order IDs and for ID prefixes, once through the ID
+fast path and once through the LIKE '%term%' queries it replaces (the
+result cache is cleared before every call):
+    python -m benchmarks.id_lookup --orders 1000000
+"""
+import argparse
+import statistics
+import time
+from app.db.connection import get_connection
+from app.services.dashboard_service import SearchService, SEARCH_TABLES
+from benchmarks import synthetic
+
+
+def like_search(term, limit):
+    """global_search(term) as it ran before the ID fast path"""
+    offsets = dict.fromkeys(SEARCH_TABLES, 0)
+    results = {table: [] for table in offsets}
+    results['totals'] = {}
+    conn = get_connection()
+    try:
+        with conn.cursor(dictionary=True) as cursor:
+            SearchService._like_search(cursor, term, limit, 'substring', offsets, results)
+            return results
+    finally:
+        conn.close()
+
+
+def timed(fetch, repeat):
+    timings = []
+    for _ in range(repeat):
+        SearchService.cache.invalidate()
+        started = time.perf_counter()
+        result = fetch()
+        timings.append((time.perf_counter() - started) * 1000)
+    return result, statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=1000000)
+    parser.add_argument("--customers", type=int, default=100000)
+    parser.add_argument("--products", type=int, default=10000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="leave the synthetic rows in place")
+    args = parser.parse_args()
+
+    synthetic.cleanup()
+    try:
+        synthetic.populate(args.orders, args.customers, args.products)
+        terms = [synthetic.make_id('O', args.orders // 2), synthetic.make_id('C', args.customers // 2),
+                 synthetic.make_id('P', args.products // 2), synthetic.make_id('O', args.orders // 2)[:7]]
+
+        print(f"{'term':<12} {'LIKE ms':>10} {'by key ms':>10} {'speed-up':>9} {'rows':>6}")
+        for term in terms:
+            _, like_ms = timed(lambda: like_search(term, args.limit), args.repeat)
+            got, key_ms = timed(lambda: SearchService.global_search(term, args.limit), args.repeat)
+            rows = sum(len(got[table]) for table in SEARCH_TABLES) + len(got.get('lines', []))
+            print(f"{term:<12} {like_ms:>10.1f} {key_ms:>10.2f} {like_ms / key_ms:>8.0f}x {rows:>6}")
+    finally:
+        if not args.keep:
+            synthetic.cleanup()
+
+
+if __name__ == "__main__":
+    main()
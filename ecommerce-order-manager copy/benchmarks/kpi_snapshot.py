@@ -0,0 +1,67 @@
+# kpi_snapshot.py
+"""Dashboard KPIs as four queries versus the single-statement snapshot.
+
+Loads synthetic customers, products, orders and lines, then times both KPI
+paths (bypassing the dashboard cache) against the live tables and, when
+migration 0002 is applied, the daily_revenue rollup:
+    python -m benchmarks.kpi_snapshot --orders 1000000 --repeat 5
+"""
+import argparse
+import statistics
+import time
+from app.services.dashboard_service import DashboardService, KPI_NAMES
+from benchmarks import synthetic
+from mysql.connector import Error
+
+
+def per_query(source):
+    return {name: DashboardService._get_kpi(name, source) for name in KPI_NAMES}
+
+
+def snapshot(source):
+    return DashboardService._get_kpi_snapshot(source)
+
+
+def timed(fetch, source, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fetch(source)
+        timings.append((time.perf_counter() - started) * 1000)
+    return result, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=1000000)
+    parser.add_argument("--customers", type=int, default=100000)
+    parser.add_argument("--products", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="leave the synthetic rows in place")
+    args = parser.parse_args()
+
+    synthetic.cleanup()
+    try:
+        synthetic.populate(args.orders, args.customers, args.products)
+        print(f"{'path':<24} {'round trips':>11} {'median ms':>10} {'min ms':>10}")
+        for source in ('live', 'rollup'):
+            results = []
+            for label, fetch, trips in (("per-query", per_query, len(KPI_NAMES)),
+                                        ("snapshot", snapshot, 1)):
+                try:
+                    result, timings = timed(fetch, source, args.repeat)
+                except Error as err:
+                    print(f"{source + ' ' + label:<24} (not available: {err.msg})")
+                    break
+                results.append(result)
+                print(f"{source + ' ' + label:<24} {trips:>11} "
+                      f"{statistics.median(timings):>10.1f} {min(timings):>10.1f}")
+            if len(results) == 2 and results[0]['revenue_to_date'] != results[1]['revenue_to_date']:
+                print(f"  revenue differs: {results[0]['revenue_to_date']} vs {results[1]['revenue_to_date']}")
+    finally:
+        if not args.keep:
+            synthetic.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# order_totals.py
+"""Order filters grouped from the order lines versus the stored OrderTotal.
+
+Loads synthetic orders (the triggers of migration 0005 fill in their totals
+as the lines are inserted) and times SearchService.filter_orders both ways
+for a few status, date and price combinations, checking they return the
+same orders:
+    python -m benchmarks.order_totals --orders 1000000
+"""
+import argparse
+import statistics
+import time
+from datetime import date, timedelta
+from app.services.dashboard_service import SearchService
+from benchmarks import synthetic
+
+
+def cases():
+    recent = (date.today() - timedelta(days=30)).isoformat()
+    return [
+        ("price 500-1000", {'min_price': 500, 'max_price': 1000}),
+        ("price over 4000", {'min_price': 4000}),
+        ("pending, over 2000", {'status': 'Pending', 'min_price': 2000}),
+        ("last 30 days, 100-300", {'start_date': recent, 'min_price': 100, 'max_price': 300}),
+        ("shipped, last 30 days", {'status': 'Shipped', 'start_date': recent}),
+    ]
+
+
+def timed(fetch, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fetch()
+        timings.append((time.perf_counter() - started) * 1000)
+    return result, statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=1000000)
+    parser.add_argument("--customers", type=int, default=100000)
+    parser.add_argument("--products", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--keep", action="store_true", help="leave the synthetic rows in place")
+    args = parser.parse_args()
+
+    synthetic.cleanup()
+    try:
+        synthetic.populate(args.orders, args.customers, args.products)
+        print(f"{'filter':<24} {'grouped ms':>11} {'stored ms':>10} {'speed-up':>9} {'orders':>8}")
+        for label, filters in cases():
+            expected, lines_ms = timed(lambda: SearchService._filter_orders_by_lines(
+                filters.get('status'), filters.get('start_date'), None,
+                filters.get('min_price'), filters.get('max_price')), args.repeat)
+            got, total_ms = timed(lambda: SearchService._filter_orders_by_total(
+                filters.get('status'), filters.get('start_date'), None,
+                filters.get('min_price'), filters.get('max_price')), args.repeat)
+            note = ""
+            if sorted(row['OrderID'] for row in got['rows']) != sorted(row['OrderID'] for row in expected['rows']):
+                note = "  (results differ: run python -m app.db.backfill_order_totals)"
+            print(f"{label:<24} {lines_ms:>11.1f} {total_ms:>10.1f} {lines_ms / total_ms:>8.0f}x {len(got['rows']):>8}{note}")
+    finally:
+        if not args.keep:
+            synthetic.cleanup()
+
+
+if __name__ == "__main__":
+    main()
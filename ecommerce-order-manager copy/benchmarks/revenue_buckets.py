@@ -0,0 +1,89 @@
+# revenue_buckets.py
+"""Revenue by day/week/month grouped on expressions versus the indexed buckets.
+
+Loads synthetic orders, then EXPLAINs and times the original queries
+(DATE()/YEARWEEK()/DATE_FORMAT() per row) against GET_REVENUE_BY_* from
+app/queries/dashboard_queries.py, which group on OrderDate and the
+generated OrderWeek/OrderMonth columns. Apply migration 0003 first:
+    python -m app.db.migrate
+    python -m benchmarks.revenue_buckets --orders 1000000
+"""
+import argparse
+import statistics
+import time
+from app.db.connection import get_connection
+from app.queries.dashboard_queries import (GET_REVENUE_BY_DAY, GET_REVENUE_BY_WEEK, GET_REVENUE_BY_MONTH,
+                                          GET_REVENUE_BY_WEEK_COMPUTED, GET_REVENUE_BY_MONTH_COMPUTED)
+from benchmarks import synthetic
+from benchmarks.explain_dashboard import format_table
+
+EXPRESSION_QUERIES = {
+    'day': """
+        SELECT DATE(o.OrderDate) as date, SUM(q.Quantity * p.Price) as revenue
+        FROM quantities q
+        JOIN products p ON q.ProductID = p.ProductID
+        JOIN orders o ON q.OrderID = o.OrderID
+        WHERE o.OrderStatus = 'Delivered'
+        GROUP BY DATE(o.OrderDate)
+        ORDER BY date DESC
+        LIMIT 30
+    """,
+    'week': GET_REVENUE_BY_WEEK_COMPUTED,
+    'month': GET_REVENUE_BY_MONTH_COMPUTED,
+}
+BUCKET_QUERIES = {'day': GET_REVENUE_BY_DAY, 'week': GET_REVENUE_BY_WEEK, 'month': GET_REVENUE_BY_MONTH}
+
+
+def explain(cursor, query):
+    cursor.execute("EXPLAIN " + query)
+    return format_table(cursor.column_names, cursor.fetchall())
+
+
+def timed(cursor, query, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        cursor.execute(query)
+        rows = cursor.fetchall()
+        timings.append((time.perf_counter() - started) * 1000)
+    return rows, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=1000000)
+    parser.add_argument("--customers", type=int, default=100000)
+    parser.add_argument("--products", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="leave the synthetic rows in place")
+    args = parser.parse_args()
+
+    synthetic.cleanup()
+    try:
+        synthetic.populate(args.orders, args.customers, args.products)
+        conn = get_connection()
+        cursor = conn.cursor()
+        try:
+            summary = []
+            for period in ('day', 'week', 'month'):
+                results = []
+                for label, query in (("expression", EXPRESSION_QUERIES[period]),
+                                     ("bucket", BUCKET_QUERIES[period])):
+                    print(f"== {period} / {label} ==\n{explain(cursor, query)}\n")
+                    rows, timings = timed(cursor, query, args.repeat)
+                    results.append(rows)
+                    summary.append(f"{period:<6} {label:<11} {statistics.median(timings):>10.1f} {min(timings):>10.1f}")
+                if [tuple(map(str, row)) for row in results[0]] != [tuple(map(str, row)) for row in results[1]]:
+                    summary.append(f"  {period}: results differ")
+            print(f"{'period':<6} {'grouping':<11} {'median ms':>10} {'min ms':>10}")
+            print("\n".join(summary))
+        finally:
+            cursor.close()
+            conn.close()
+    finally:
+        if not args.keep:
+            synthetic.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# search_cache.py
+"""Cold versus cached order filters and global searches.
+
+Loads synthetic data and replays a workload of order filters and searches
+in which a few favourites ("Pending, this month") recur, the way staff use
+the search screen. Reports the median latency of cache misses and hits, the
+hit rate, and the memory the cached results take:
+    python -m benchmarks.search_cache --orders 1000000 --requests 500
+"""
+import argparse
+import random
+import statistics
+import time
+from datetime import date, timedelta
+from app.services.dashboard_service import SearchService
+from benchmarks import synthetic
+
+STATUSES = (None, 'Pending', 'Shipped', 'Delivered', 'Cancelled')
+TERMS = ("anya", "mori", "keyboard", "lamy", "dock", "O9000001")
+
+
+def workload(count, seed=0):
+    """Filters and searches, the first few of each far more frequent than the rest"""
+    rng = random.Random(seed)
+    today = date.today()
+    filters = [{'status': status, 'start_date': (today - timedelta(days=days)).isoformat(),
+                'min_price': price}
+               for status in STATUSES for days in (7, 30, 90) for price in (None, 100, 1000)]
+    requests = []
+    for _ in range(count):
+        # Zipf-like: index i is picked with weight 1 / (i + 1)
+        if rng.random() < 0.5:
+            filters_kwargs = rng.choices(filters, weights=[1 / (i + 1) for i in range(len(filters))])[0]
+            requests.append(('filter', filters_kwargs))
+        else:
+            term = rng.choices(TERMS, weights=[1 / (i + 1) for i in range(len(TERMS))])[0]
+            requests.append(('search', term))
+    return requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=1000000)
+    parser.add_argument("--customers", type=int, default=100000)
+    parser.add_argument("--products", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--keep", action="store_true", help="leave the synthetic rows in place")
+    args = parser.parse_args()
+
+    synthetic.cleanup()
+    try:
+        synthetic.populate(args.orders, args.customers, args.products)
+        SearchService.cache.invalidate()
+        timings = {'miss': [], 'hit': []}
+        for kind, arg in workload(args.requests):
+            misses = SearchService.cache.misses
+            started = time.perf_counter()
+            if kind == 'filter':
+                SearchService.filter_orders(**arg)
+            else:
+                SearchService.global_search(arg)
+            elapsed = (time.perf_counter() - started) * 1000
+            timings['miss' if SearchService.cache.misses > misses else 'hit'].append(elapsed)
+
+        stats = SearchService.cache_stats()
+        for outcome in ('miss', 'hit'):
+            if timings[outcome]:
+                print(f"{outcome:<5} {len(timings[outcome]):>6} requests, "
+                      f"median {statistics.median(timings[outcome]):10.3f} ms")
+        print(f"\nHit rate {stats['hit_rate']:.1%}, {stats['entries']} entries, "
+              f"{stats['bytes'] / 2**20:.1f} MiB cached")
+    finally:
+        if not args.keep:
+            synthetic.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# search_index.py
+"""Global search with LIKE '%term%' scans versus the trigram search index.
+
+Loads synthetic data, times building, saving and reloading the index, then
+times SearchService.global_search both ways for a few terms of different
+selectivity and checks that both report the same match counts:
+    python -m benchmarks.search_index --customers 1000000 --products 100000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from app.db.connection import get_connection
+from app.services.dashboard_service import SearchService, SEARCH_TABLES
+from app.services.search_index import SearchIndex
+from benchmarks import synthetic
+
+TERMS = ("anya", "calliope 12", "keyboard", "mic", "O90000042", "zzz")
+
+
+def timed(fetch, repeat):
+    timings = []
+    for _ in range(repeat):
+        SearchService.cache.invalidate()  # Time the queries, not the result cache
+        started = time.perf_counter()
+        result = fetch()
+        timings.append((time.perf_counter() - started) * 1000)
+    return result, statistics.median(timings)
+
+
+def indexed_search(index, term, limit):
+    """SearchService.global_search(term) answered from ``index``"""
+    offsets = dict.fromkeys(SEARCH_TABLES, 0)
+    results = {table: [] for table in offsets}
+    results['totals'] = {}
+    conn = get_connection()
+    try:
+        with conn.cursor(dictionary=True) as cursor:
+            SearchService._indexed_search(index, cursor, term, limit, 'substring', offsets, results)
+            return results
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=1000000)
+    parser.add_argument("--customers", type=int, default=1000000)
+    parser.add_argument("--products", type=int, default=100000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="leave the synthetic rows in place")
+    args = parser.parse_args()
+
+    synthetic.cleanup()
+    try:
+        synthetic.populate(args.orders, args.customers, args.products)
+
+        index = SearchIndex()
+        started = time.perf_counter()
+        index.build()
+        print(f"Build: {time.perf_counter() - started:.1f} s")
+
+        path = os.path.join(tempfile.mkdtemp(), "search_index.pickle")
+        started = time.perf_counter()
+        index.save(path)
+        print(f"Save:  {time.perf_counter() - started:.1f} s ({os.path.getsize(path) / 2**20:.0f} MiB)")
+        started = time.perf_counter()
+        loaded = SearchIndex.load(path)
+        print(f"Load:  {time.perf_counter() - started:.1f} s (fingerprint {'matches' if loaded else 'differs'})\n")
+        os.remove(path)
+
+        print(f"{'term':<14} {'LIKE ms':>10} {'index ms':>10} {'speed-up':>9} {'matches':>9}")
+        for term in TERMS:
+            SearchService.use_index = False
+            expected, like_ms = timed(lambda: SearchService.global_search(term, args.limit), args.repeat)
+            got, index_ms = timed(lambda: indexed_search(index, term, args.limit), args.repeat)
+            note = ""
+            for table in ('customers', 'products'):
+                like_total, capped = expected['totals'][table]
+                index_total = got['totals'][table][0]
+                if index_total != like_total and not (capped and index_total > like_total):
+                    note = "  (counts differ)"
+            matches = sum(total for total, _ in got['totals'].values())
+            print(f"{term:<14} {like_ms:>10.1f} {index_ms:>10.1f} {like_ms / index_ms:>8.0f}x {matches:>9}{note}")
+    finally:
+        SearchService.use_index = True
+        if not args.keep:
+            synthetic.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# synthetic.py
+"""Synthetic rows for benchmarks.
+
+IDs start at SYNTHETIC_START so they never collide with the seed data and
+can be removed again with cleanup().
+"""
+import random
+import time
+from datetime import date, timedelta
+from app.db.connection import get_connection
+from app.models.customer_model import create_customers_bulk
+from app.models.product_model import create_products_bulk
+from app.models.order_model import create_orders_bulk
+from app.models.quantity_model import create_quantities_bulk
+
+SYNTHETIC_START = 900000000
+STATUSES = ('Pending', 'Shipped', 'Delivered', 'Cancelled')
+FIRST = ("Shigure", "Anya", "Koganei", "Rindo", "Mori", "Airani", "Yukihana", "Momosuzu",
+         "Houshou", "Nekomata", "Pavolia", "Tsukumo", "Hoshimachi", "Ichijou", "Kikirara")
+LAST = ("Ui", "Melfissa", "Niko", "Chihaya", "Calliope", "Iofifteen", "Lamy", "Nene",
+        "Marine", "Okayu", "Reine", "Sana", "Suisei", "Ririka", "Vivi")
+ITEMS = ("Keyboard", "Mouse", "Monitor", "Headset", "Webcam", "Desk", "Chair", "Lamp",
+         "Cable", "Charger", "Speaker", "Microphone", "Tablet", "Stylus", "Dock")
+
+
+def make_id(prefix, n):
+    return f"{prefix}{SYNTHETIC_START + n:09d}"
+
+
+def customer_rows(count, seed=0):
+    rng = random.Random(seed)
+    return [(make_id('C', i), f"{rng.choice(FIRST)} {rng.choice(LAST)} {i}") for i in range(count)]
+
+
+def product_rows(count, seed=0):
+    rng = random.Random(seed)
+    return [(make_id('P', i), f"{rng.choice(ITEMS)} {rng.choice(LAST)} {i}",
+             round(rng.uniform(1, 500), 2)) for i in range(count)]
+
+
+def order_rows(count, customer_count, days=730, seed=0):
+    rng = random.Random(seed)
+    start = date.today() - timedelta(days=days)
+    return [(make_id('O', i), make_id('C', rng.randrange(customer_count)),
+             start + timedelta(days=rng.randrange(days)), rng.choice(STATUSES))
+            for i in range(count)]
+
+
+def quantity_rows(order_count, product_count, lines_per_order=3, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(order_count):
+        for p in rng.sample(range(product_count), min(lines_per_order, product_count)):
+            rows.append((make_id('O', i), make_id('P', p), rng.randint(1, 10)))
+    return rows
+
+
+def populate(orders, customers, products):
+    """Bulk-load a synthetic dataset of the given size (three lines per order)"""
+    print(f"Loading {customers} customers, {products} products, {orders} orders...")
+    started = time.perf_counter()
+    for rows, create in ((customer_rows(customers), create_customers_bulk),
+                         (product_rows(products), create_products_bulk),
+                         (order_rows(orders, customers), create_orders_bulk),
+                         (quantity_rows(orders, products), create_quantities_bulk)):
+        report = create(rows)
+        if report['errors']:
+            raise SystemExit(f"Load failed: {report['errors'][0]}")
+    print(f"Loaded in {time.perf_counter() - started:.1f} s\n")
+
+
+def cleanup():
+    """Delete every synthetic row"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        for table, column, prefix in (("quantities", "OrderID", "O"), ("orders", "OrderID", "O"),
+                                      ("products", "ProductID", "P"), ("customers", "CustomerID", "C")):
+            cursor.execute(f"DELETE FROM {table} WHERE {column} >= %s", (make_id(prefix, 0),))
+        conn.commit()
+    finally:
+        cursor.close()
+        conn.close()